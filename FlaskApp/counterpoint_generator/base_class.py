@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from random import shuffle
+import math
+from bisect import bisect_right
+from random import Random
+from typing import Iterator
+from time import perf_counter
 
 import os,sys,inspect
 current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
@@ -9,10 +13,20 @@ sys.path.insert(0, current_dir)
 
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
+from notation_system.interval_tables import get_interval_tables, get_melodic_successor_graph
+
+from node_context import NodeContext
+from nogood_table import NogoodTable, get_canonical_form
+from restart_policies import RestartPolicy
+from parallel_attempts import run_attempts_in_parallel
+from check_ordering import CheckStatistics, get_learned_check_order, set_learned_check_order, sort_checks_by_learned_order
+
+from filter_functions.beat_positions import build_dispatch_table
+from filter_functions.batch_score_functions import pack_solution
+from filter_functions.dependencies import build_dependency_table, build_remaining_dependency_table, get_line_lookback
 
 from filter_functions.index_checks import ensure_lowest_and_highest_have_been_placed
 
-from filter_functions.melodic_insertion_checks import valid_melodic_interval
 from filter_functions.melodic_insertion_checks import prevent_highest_duplicates
 from filter_functions.melodic_insertion_checks import ascending_minor_sixths_are_followed_by_descending_half_step
 from filter_functions.melodic_insertion_checks import prevent_two_notes_from_immediately_repeating
@@ -67,13 +81,11 @@ class CounterpointGenerator (ABC):
     #requirements for each line, that are generated arbitrarily during each attempt
     _attempt_parameters = []
 
-    #the following items store a snapshot of the indices and attempt parameters prior to a note being inserted onto the stack.
-    #when a note is inserted onto the stack, the conditions prior to its insertion are placed on these stacks as well so that they 
-    #can be restored when a note is removed from the stack
-    _store_all_indices_stacks = []
-    _store_remaining_indices_stacks = []
+    #the following items store a trail of the changes made to the indices and attempt parameters when a note is inserted onto the stack.
+    #rather than a snapshot of the full conditions, only the indices the note removes and the (key, previous value) pairs of 
+    #the attempt parameters it changes are placed on these stacks, so that they can be undone when a note is removed from the stack
     _store_deleted_indices_stacks = []
-    _store_attempt_parameters_stacks = []
+    _store_changed_parameters_stacks = []
 
     #keeps track of the number of attempts an instance of a CounterpointGenerator has made
     _number_of_attempts = None
@@ -82,6 +94,80 @@ class CounterpointGenerator (ABC):
     #will form the basis for the exit conditions by which the backtrack algorithm is ended 
     _number_of_backtracks = 0
 
+    #the number of nodes visited by the backtracking algorithm since the generator was constructed, which unlike the above
+    #isn't reset when an attempt begins or the search restarts (see use_restart_policy)
+    _number_of_nodes_visited = 0
+
+    #the backtracking algorithm is run on an explicit stack of frames rather than on Python's call stack, so that it can be paused 
+    #and resumed and so that it isn't limited by the recursion limit.  There is one frame for each index currently being filled,
+    #each a list of the form [line, bar, beat, candidates, has_entity_on_stack, conflict_set, nogood_record], where candidates is an 
+    #iterator over the notes and rests that have not yet been tried at that index, has_entity_on_stack records whether one of them is 
+    #currently on the stack, conflict_set is used for backjumping (see use_backjumping) and nogood_record is used by the nogood table
+    #(see use_nogood_table)
+    _backtrack_frames = None
+
+    #whether there is a node (corresponding to a single call of the backtracking function) waiting to be visited
+    _node_pending = False
+
+    #whether a pausable run of the attempt loop (see generate_counterpoint_incrementally) has been started and not yet finished,
+    #and whether an attempt within that run is currently paused 
+    _generation_in_progress = False
+    _attempt_in_progress = False
+
+    #optional adaptive ordering of the insertion checks (see use_adaptive_check_ordering).  While the check statistics exist,
+    #the warm-up window is in progress and the checks are measured
+    _adaptive_check_ordering = False
+    _check_statistics = None
+
+    #optional forward checking (see use_forward_checking).  The notes and rests found for the next index while checking
+    #ahead are kept, in the form (line, bar, beat, candidates), so that the node for that index doesn't compute them again
+    _forward_checking = False
+    _forward_checked_node = None
+
+    #optional conflict-directed backjumping (see use_backjumping).  The dependency table maps each index onto the bars of the
+    #other lines that the checks and filters consulted there read (or None if they may read all of them).  It is built along 
+    #with the dispatch tables
+    _backjumping = False
+    _other_line_bars_by_position = None
+
+    #the bars of the other lines read at each index or any later one (see build_remaining_dependency_table)
+    _remaining_other_line_bars_by_position = None
+
+    #optional table of search states known to lead to no solutions (see use_nogood_table), how far back the checks and filters 
+    #read the line being filled and how far back the final checks read every line (see get_line_lookback in dependencies.py, 
+    #None if they may read the whole line), which are found along with the dispatch tables, and a hash of the parts of the 
+    #state that are fixed for the duration of an attempt, recorded when the backtracking algorithm begins
+    _nogood_table = None
+    _line_lookback = None
+    _final_line_lookback = None
+    _attempt_state = None
+
+    #time budgets, in seconds, for each call that generates counterpoint and for each attempt (see use_time_budget), the 
+    #deadlines derived from them (as given by perf_counter) and whether the last call was cut short by its deadline.  
+    #The clock is only read every _nodes_between_clock_checks nodes
+    _time_limit = None
+    _attempt_time_limit = None
+    _deadline = None
+    _attempt_deadline = None
+    _ran_out_of_time = False
+    _nodes_between_clock_checks = 50
+
+    #the temperature of score-guided ordering of the notes and rests (see use_score_guided_ordering), or None if they are 
+    #tried in random order
+    _ordering_temperature = None
+
+    #optional branch and bound (see use_branch_and_bound), and the score of the best solution found so far
+    _branch_and_bound = False
+    _best_score = None
+
+    #the restart policy in use, if any (see use_restart_policy), whether it has asked for a restart, the number of times the 
+    #current attempt has restarted and the node at which the search last reached an index further along than any it had 
+    #reached before
+    _restart_policy = None
+    _restart_requested = False
+    _number_of_restarts = 0
+    _node_of_last_progress = 0
+
     #the list of functions that pitches will be passed through to deterine if they are eligible to be placed on
     #the stack at a given location in a line of counterpoint 
     _melodic_insertion_checks = None
@@ -90,6 +176,11 @@ class CounterpointGenerator (ABC):
     #to determine which pitch/rhythm combinations may be legally placed on the counterpoint stack
     _rhythmic_insertion_filters = None
 
+    #the two lists above, broken down by index: each maps (bar, beat) onto the checks or filters that can have an
+    #effect at that index (see beat_positions.py).  These are built when an attempt is initialized
+    _melodic_insertion_checks_by_position = None
+    _rhythmic_insertion_filters_by_position = None
+
     #every time a note or rest is added onto the counterpoint stack, these checks determine if adding the 
     #note changes any of the attempt parameters (for example, "highest_has_been_placed")
     _change_parameters_checks = None
@@ -106,6 +197,22 @@ class CounterpointGenerator (ABC):
     #each of which is a list of successive RhythmicValue objects (that is, Notes and Rests)
     _solutions = None
 
+    #the number of solutions found since the generator was constructed, including any that are no longer kept, and the
+    #solution found most recently
+    _number_of_solutions = 0
+    _last_solution = None
+
+    #the number of solutions kept, if it is bounded (see use_top_solutions), in which case _solutions is kept sorted by 
+    #score and _solution_scores holds the score of each one
+    _top_solutions_limit = None
+    _solution_scores = None
+
+    #whether solutions identical to one already found are dropped (see use_solution_deduplication), the hashes of the 
+    #solutions found so far and the number of duplicates that have been dropped
+    _deduplicate_solutions = True
+    _solution_hashes = None
+    _number_of_duplicate_solutions = 0
+
     #a list of scoring functions that add to the score of a solution -- used when selecting the optimal
     #solution from the ones added
     _score_functions = None
@@ -120,9 +227,41 @@ class CounterpointGenerator (ABC):
         "forbidden_combinations": { (1, 1), (2, 3), (3, 2), (4, 4), (4, 6), (5, 6), (5, 8), (6, 10) }
     }
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    #lookup tables indexed by pairs of pitch IDs derived from the legal intervals above and the mode (see interval_tables.py).
+    #These are fetched in the initialize function, since subclasses may alter the legal intervals after the constructor runs
+    _interval_tables = None
+
+    #pitch-independent facts about the index currently being filled, shared by the insertion checks (see node_context.py)
+    _node_context = None
+
+    #the generator's own random number generator, used for every arbitrary choice it makes (see get_random_number_generator)
+    _random = None
+
+    #the positional and keyword arguments the generator was constructed with, recorded before the constructor runs, and the 
+    #state of its random number generator once it had been seeded, so that an equivalent generator can be constructed in
+    #another process (see _get_constructor)
+    _constructor_arguments = None
+    _initial_random_state = None
+
+    #the settings made by the use_ functions that the generators running attempts in worker processes take on (see 
+    #_get_search_settings)
+    _search_settings = ["_forward_checking", "_backjumping", "_nogood_table", "_time_limit", 
+        "_attempt_time_limit", "_deadline", "_ordering_temperature", "_branch_and_bound", "_best_score", 
+        "_deduplicate_solutions", "_restart_policy"]
+
+    def __new__(cls, *args, **kwargs) -> "CounterpointGenerator":
+        instance = super().__new__(cls)
+        instance._constructor_arguments = (args, kwargs)
+        return instance
+
+    #seed: the seed of the generator's random number generator, so that generators with the same seed produce the same pieces.
+    #Generators that construct other generators pass their own random number generator in place of a seed, so that the 
+    #nested generators draw from the same sequence
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
 
         self._reset_class_variables() #ensures class variables aren't altered from other instances
+        self._random = seed if isinstance(seed, Random) else Random(seed)
+        self._initial_random_state = self._random.getstate()
 
         self._length = length 
         self._height = len(lines)
@@ -133,7 +272,6 @@ class CounterpointGenerator (ABC):
         #the following are the small number of default functions added to the checks
         self._index_checks.append(ensure_lowest_and_highest_have_been_placed)
 
-        self._melodic_insertion_checks.append(valid_melodic_interval)
         self._melodic_insertion_checks.append(ascending_minor_sixths_are_followed_by_descending_half_step)
         self._melodic_insertion_checks.append(prevent_highest_duplicates)
         self._melodic_insertion_checks.append(prevent_two_notes_from_immediately_repeating)
@@ -155,16 +293,239 @@ class CounterpointGenerator (ABC):
     #each attempt consists of an initialization, during which attempt parameters are arbitrarily generated
     #followed by the backtracking algorithm being run until the backtracking exit conditions are met
     def generate_counterpoint(self) -> None:
+        self._start_clock()
         self._number_of_attempts = 0
-        while not self._exit_attempt_loop():
+        while not self._exit_generation():
             self._number_of_attempts += 1
             self._initialize()
             self._backtrack()
         return 
 
-    #sorts the solutions by the scording system (note that lower scores are better)
+    #a pausable version of generate_counterpoint, used to time-slice long searches: runs the attempt loop until max_nodes 
+    #nodes of the backtracking algorithm have been visited and then pauses.  Calling it again resumes the search exactly where 
+    #it was paused, so the same solutions are found as with generate_counterpoint.  Returns True once the attempt loop has been exited
+    def generate_counterpoint_incrementally(self, max_nodes: int) -> bool:
+        if not self._generation_in_progress:
+            self._generation_in_progress = True
+            self._attempt_in_progress = False
+            self._start_clock()
+            self._number_of_attempts = 0
+        while True:
+            if not self._attempt_in_progress:
+                if self._exit_generation():
+                    self._generation_in_progress = False
+                    return True 
+                self._number_of_attempts += 1
+                self._initialize()
+                self._begin_backtrack()
+                self._attempt_in_progress = True
+            if max_nodes <= 0:
+                return False 
+            nodes_before = self._number_of_nodes_visited
+            if self._resume_backtrack(max_nodes):
+                self._attempt_in_progress = False
+            max_nodes -= self._number_of_nodes_visited - nodes_before
+
+    #an alternative to generate_counterpoint that runs a beam search in each attempt before the backtracking algorithm.
+    #Depth-first search with randomly ordered candidates can spend its whole budget deep inside a poor part of the search 
+    #space.  The beam search instead fills the piece one index at a time, keeping the width partial pieces with the lowest
+    #incremental cost (see incremental_costs.py) at each step, so the time it takes grows with the width and the length of 
+    #the piece.  Only partial pieces that pass the forward checks are kept, and no more than children_per_parent of them 
+    #(by default a third of the width) may extend the same partial piece, so that the beam doesn't collapse onto a single 
+    #dead end.  If the beam empties without finding a solution, it is run again twice as wide, up to max_widening times, and 
+    #if that fails too the attempt falls back to the backtracking algorithm, so the width trades against the quality of the
+    #pieces found rather than against finding any.  The exit conditions of the attempt loop and the time budgets apply, and
+    #the exit conditions of the backtracking algorithm apply to the fallback
+    def generate_counterpoint_with_beam_search(self, width: int = 10, children_per_parent: int = None, max_widening: int = 2) -> None:
+        self._start_clock()
+        self._number_of_attempts = 0
+        while not self._exit_generation():
+            self._number_of_attempts += 1
+            self._initialize()
+            for widening in range(max_widening + 1):
+                self._beam_search(width * 2 ** widening, children_per_parent or max(1, width * 2 ** widening // 3))
+                if self._number_of_solutions_found_this_attempt > 0 or self._deadline_has_passed(include_attempt=True):
+                    break 
+            if self._number_of_solutions_found_this_attempt == 0 and not self._deadline_has_passed(include_attempt=True):
+                self._number_of_backtracks = 0
+                self._backtrack()
+
+    #a lazy version of generate_counterpoint: runs the same attempt loop but yields each solution as soon as it passes the 
+    #final checks, so that callers can stop after the first few or stream them.  Solutions are still collected in the usual way,
+    #and if the caller stops early the counterpoint stack is restored to its state before backtracking began
+    def iter_solutions(self) -> Iterator[list[list[RhythmicValue]]]:
+        self._start_clock()
+        self._number_of_attempts = 0
+        try:
+            while not self._exit_generation():
+                self._number_of_attempts += 1
+                self._initialize()
+                self._begin_backtrack()
+                while not self._resume_backtrack(pause_on_solution=True):
+                    yield self._last_solution
+        finally:
+            if self._backtrack_frames:
+                self._unwind_backtrack()
+
+    #a parallel version of generate_counterpoint: since the attempts are independent, they are farmed out to a pool of max_workers 
+    #worker processes (by default one per core) and their solutions are merged in the order the attempts were started.  The exit 
+    #conditions of the attempt loop are checked as each attempt is merged, and once they are met the attempts still running are 
+    #cancelled.  Note that each attempt only sees the solutions of the attempts merged before it was started, so backtracking
+    #exit conditions that depend on the number of solutions may end an attempt at a different point than in a serial run
+    def generate_counterpoint_in_parallel(self, max_workers: int = None) -> None:
+        self._start_clock()
+        run_attempts_in_parallel(self, max_workers)
+        #the attempts have been run in the worker processes, so set up the stacks that the solutions are mapped onto for scoring
+        if len(self._counterpoint_stacks) < self._height:
+            self._counterpoint_stacks = [[] for line in range(self._height)]
+            self._counterpoint_objects = [{} for line in range(self._height)]
+            self._all_indices = [set() for line in range(self._height)]
+            self._remaining_indices = [[] for line in range(self._height)]
+
+    #turns on adaptive ordering of the insertion checks.  Registration order has no bearing on which checks do the most pruning,
+    #so for the first warm_up_calls calls of the insertion checks the generator measures how often each one rejects a pitch 
+    #and how long it takes, and then reorders the checks so that cheap checks that reject often are run first.  The learned 
+    #order is shared by all generators of the same class (and can be saved with save_learned_check_orders), so subsequent 
+    #generators of that class skip the warm-up window.  Note that the order of the checks doesn't change which solutions are found
+    def use_adaptive_check_ordering(self, warm_up_calls: int = 20000) -> None:
+        self._adaptive_check_ordering = True
+        learned_orders = { list_name: get_learned_check_order(type(self).__name__, list_name) for list_name in self._get_orderable_checks() }
+        if all([learned_order is not None for learned_order in learned_orders.values()]):
+            for list_name, checks in self._get_orderable_checks().items():
+                checks[:] = sort_checks_by_learned_order(checks, learned_orders[list_name])
+            self._check_statistics = None
+        else:
+            self._check_statistics = CheckStatistics(warm_up_calls)
+
+    #turns on forward checking.  Without it, the backtracking algorithm only discovers that a branch is doomed once it descends
+    #into the index where nothing can be placed.  With it, every time an entity is added to the stack the generator checks 
+    #that the highest and lowest notes of the line can still be placed in time and that the next index still has at least one 
+    #valid note or rest, and if not it moves straight on to the next candidate.  Note that since fewer nodes are visited, 
+    #the exit conditions (which count nodes) may be reached at a different point than without forward checking
+    def use_forward_checking(self) -> None:
+        self._forward_checking = True
+
+    #turns on conflict-directed backjumping.  Without it, when an index runs out of notes and rests to try, the backtracking
+    #algorithm returns to the previous placement, even if the conflict was caused by a placement made much earlier (for example
+    #a note in the other line that the current line can't be written against).  With it, every frame keeps a conflict set: the 
+    #earlier placements that the failures below it depend on, determined from the line being filled and the bars of the other 
+    #lines that the checks declare they read (see dependencies.py).  When the frame runs out of candidates the algorithm jumps 
+    #straight back to the most recent placement in the conflict set, skipping the placements in between, none of which could 
+    #have changed the outcome.  A frame below which a solution has been reached never jumps 
+    def use_backjumping(self) -> None:
+        self._backjumping = True
+
+    #turns on the nogood table.  Whenever the backtracking algorithm finishes exploring an index without finding a solution, 
+    #the state at that index is recorded as a nogood, and whenever it reaches a recorded state again it moves straight on.  
+    #The state holds everything that the rest of the search depends on (see _get_search_state), so no solution is skipped: the
+    #index, what the checks and filters declare they read of the line being filled (see reads_line_back in dependencies.py) --
+    #its last entities, the entities in its last bars and summaries of what the checks that scan further back read before
+    #them -- the entities of the other lines in the bars that the rest of the line is checked against, what the final checks
+    #read of the other lines, the counters kept in the attempt parameters and the parts of the state that are fixed for the
+    #attempt.  If any check or filter may read the whole line, the state holds the whole line, and if lines remain to be written
+    #after the line being filled, it holds every line, so the table only hits when a state is reached again in a later attempt.
+    #No nogoods are recorded under branch and bound, since a branch pruned there may still hold solutions.  The table holds
+    #at most capacity hashes of states, discarding the least recently used ones, and counts its hits and misses (see
+    #get_nogood_table)
+    def use_nogood_table(self, capacity: int = 100000) -> None:
+        self._nogood_table = NogoodTable(capacity)
+
+    #returns the nogood table, or None if it isn't in use
+    def get_nogood_table(self) -> NogoodTable:
+        return self._nogood_table
+
+    #sets time budgets, in seconds, so that generation meets a latency target.  The exit conditions of the backtracking algorithm 
+    #and of the attempt loop count nodes and attempts, which take very different amounts of time depending on the species and 
+    #the length.  With a time_limit, each call that generates counterpoint stops once that much time has passed, keeping the 
+    #solutions found so far (the best of which can then be retrieved as usual).  With an attempt_time_limit, each attempt is 
+    #ended once that much time has passed and the next one begins.  The exit conditions still apply, so whichever comes first
+    #ends the search.  Pass None to remove a budget.  Note that nested generators (such as the Cantus Firmus generator) 
+    #aren't given budgets, and that they run when the generator is constructed
+    def use_time_budget(self, time_limit: float = None, attempt_time_limit: float = None) -> None:
+        self._time_limit = time_limit
+        self._attempt_time_limit = attempt_time_limit
+
+    #turns on score-guided ordering of the notes and rests.  Without it, the notes and rests that can be placed at an index are 
+    #tried in random order, and the score functions only come into play once the solutions have been found.  With it, the 
+    #score functions that declare an incremental cost (see incremental_costs.py) are used to try the notes and rests that 
+    #add the least to the score first, so good solutions turn up sooner.  The temperature controls how much randomness is 
+    #kept: at 0 the cheapest are always tried first, and the higher it is, the closer the order is to random
+    def use_score_guided_ordering(self, temperature: float = 1) -> None:
+        self._ordering_temperature = temperature
+
+    #turns on branch and bound, which turns the search into an optimization.  Without it, the generator collects solutions 
+    #and only ranks them afterwards (see score_solutions).  With it, each solution that is found is scored at once and only 
+    #kept if it's better than the best so far, and every branch is checked against a lower bound on the scores it can lead 
+    #to (declared alongside each score function, see score_bounds.py).  Once a branch's bound is no better than the best 
+    #score so far, the branch is pruned.  Each solution kept is better than the last, so the last solution is the best.  
+    #Solutions that aren't kept still count towards the exit conditions.  The best score carries over between attempts and
+    #calls (see get_best_score).  Branch and bound is off by default since the bounds are computed at every node, which makes
+    #each node about a quarter slower (e.g. two-part fifth species on 9 bars takes 0.85s rather than 0.69s), and with the
+    #fixed node budgets of the exit conditions it rarely prunes enough to make up for it
+    def use_branch_and_bound(self) -> None:
+        self._branch_and_bound = True
+        self._best_score = None
+
+    #returns the score of the best solution found with branch and bound, or None if there isn't one
+    def get_best_score(self) -> int:
+        return self._best_score
+
+    #keeps only the k best scored solutions.  Without a limit, every solution found is copied into _solutions and they are 
+    #all scored and sorted at the end (see score_solutions).  With one, each solution is scored as soon as it is found and 
+    #inserted in order among the ones kept, and once there are more than k the worst is discarded, so memory stays flat
+    #however many solutions the attempt loop collects and the best solution is always first.  Ties keep the solution found
+    #first, as score_solutions would.  The exit conditions of the attempt loop still count every solution found
+    def use_top_solutions(self, k: int) -> None:
+        self._top_solutions_limit = k
+        self._solutions = []
+        self._solution_scores = []
+
+    #determines whether solutions identical to one already found (with the same pitches and durations in every line) are 
+    #dropped, which is the default.  Attempts that share a Cantus Firmus often find the same solutions, and without 
+    #deduplication each copy is scored, stored and counted towards the exit conditions of the attempt loop.  Duplicates are
+    #detected by a hash of the solution, before any scoring work is done
+    def use_solution_deduplication(self, deduplicate: bool = True) -> None:
+        self._deduplicate_solutions = deduplicate
+
+    #returns the number of duplicate solutions that have been dropped
+    def get_number_of_duplicate_solutions(self) -> int:
+        return self._number_of_duplicate_solutions
+
+    #returns the fraction of the solutions found that were duplicates of ones found before (0 if none have been found)
+    def get_duplicate_rate(self) -> float:
+        number_found = self._number_of_solutions + self._number_of_duplicate_solutions
+        return self._number_of_duplicate_solutions / number_found if number_found > 0 else 0
+
+    #returns the number of solutions found, including any that weren't kept
+    def get_number_of_solutions_found(self) -> int:
+        return self._number_of_solutions
+
+    #sets the policy that decides when to give up on the attempt parameters of an attempt (see restart_policies.py).  Without 
+    #one, attempts are abandoned after fixed numbers of nodes, which vary by species and are too many for hopeless attempts 
+    #and too few for promising ones.  With one, until the attempt has found a solution, the policy alone decides when to give
+    #up, and the attempt then restarts with new attempt parameters rather than ending, so that generators that make only 
+    #one attempt benefit too.  Once the attempt has found a solution or the policy has used up its restarts, the usual exit 
+    #conditions apply.  Pass None to go back to the fixed numbers
+    def use_restart_policy(self, restart_policy: RestartPolicy) -> None:
+        self._restart_policy = restart_policy
+
+    #returns whether the last call that generated counterpoint was cut short by its time limit
+    def ran_out_of_time(self) -> bool:
+        return self._ran_out_of_time
+
+    #returns the generator's random number generator, e.g. to pass it on to generators constructed elsewhere
+    def get_random_number_generator(self) -> Random:
+        return self._random
+
+    #sorts the solutions by the scording system (note that lower scores are better).  Score functions written against the
+    #packed form of a solution score each solution from it, and the solutions are only mapped onto the stack for the rest
+    #(see batch_score_functions.py)
     def score_solutions(self) -> None:
-        self._solutions.sort(key=lambda sol: self._score_solution(sol))
+        if self._top_solutions_limit is not None:
+            return 
+        scores = self._score_solutions_in_batch(self._solutions)
+        order = sorted(range(len(self._solutions)), key=lambda i: scores[i])
+        self._solutions[:] = [self._solutions[i] for i in order]
 
 
     #retrieves the first solution.  If the solutions have been sorted, this will be the optimal solution 
@@ -179,6 +540,12 @@ class CounterpointGenerator (ABC):
     def get_all_solutions(self) -> list[list[list[RhythmicValue]]]:
         return self._solutions
 
+    #returns the scores of the solutions (lower is better), in the same order as get_all_solutions
+    def get_solution_scores(self) -> list[int]:
+        if self._top_solutions_limit is not None:
+            return self._solution_scores[:]
+        return self._score_solutions_in_batch(self._solutions)
+
     #prints the current stack
     #note that entities print out with 33 characters
     def print_counterpoint(self) -> None:
@@ -201,17 +568,51 @@ class CounterpointGenerator (ABC):
     #the function that determines when to stop running the attempts loop.  Default is given below, but will be 
     #overridden in all subclasses
     def _exit_attempt_loop(self) -> bool:
-        if len(self._solutions) > 0 or self._number_of_attempts > 0: 
+        if self._number_of_solutions > 0 or self._number_of_attempts > 0: 
             return True 
         return False 
 
     def _score_solution(self, sol: list[list[RhythmicValue]]) -> int:
         self._map_solution_onto_stack(sol)
-        score = 0
+        return self._get_score()
+
+    #returns the scores of the specified solutions, in order.  Each solution is packed once for the score functions written
+    #against its packed form, and only mapped onto the stack if there are others
+    def _score_solutions_in_batch(self, solutions: list[list[list[RhythmicValue]]]) -> list[int]:
+        packed_functions = [check.packed_function for check in self._score_functions if hasattr(check, "packed_function")]
+        other_functions = [check for check in self._score_functions if not hasattr(check, "packed_function")]
+        scores = []
+        for sol in solutions:
+            score = self._get_packed_score(pack_solution(sol), packed_functions) if len(packed_functions) > 0 else 0
+            if len(other_functions) > 0:
+                self._map_solution_onto_stack(sol)
+                for check in other_functions:
+                    score += check(self)
+            scores.append(score)
+        return scores
+
+    #scores the piece currently on the stack, packing it once for the score functions written against the packed form
+    def _get_score(self) -> int:
+        packed_functions = [check.packed_function for check in self._score_functions if hasattr(check, "packed_function")]
+        score = self._get_packed_score(pack_solution(self._counterpoint_stacks), packed_functions) if len(packed_functions) > 0 else 0
         for check in self._score_functions:
-            score += check(self)
+            if not hasattr(check, "packed_function"):
+                score += check(self)
         return score 
 
+    def _get_packed_score(self, packed_solution: list[dict], packed_functions: list[callable]) -> int:
+        score = 0
+        for packed_function in packed_functions:
+            score += packed_function(self, packed_solution)
+        return score
+
+    #a lower bound on the score of any solution the piece currently on the stack can be completed to (see score_bounds.py)
+    def _get_score_lower_bound(self) -> int:
+        bound = 0
+        for check in self._score_functions:
+            bound += check.lower_bound(self)
+        return bound 
+
     #takes a solution and maps it onto the counterpoint stack so that it can be more easily
     #examined by the scoring functions (which otherwise would not be able to look up notes and rests
     # by bar and beat)
@@ -240,19 +641,22 @@ class CounterpointGenerator (ABC):
         self._number_of_solutions_found_this_attempt = 0
 
         self._highest_index_reached = (0, 0, 0)
+        self._node_of_last_progress = 0
+        self._number_of_restarts = 0
         self._has_printed = False
         self._log = []
 
+        self._interval_tables = get_interval_tables(self._mode, self._legal_intervals)
+        self._build_dispatch_tables()
+
         #reset all of the stacks
         self._counterpoint_stacks = []
         self._counterpoint_objects = []
         self._all_indices = []
         self._remaining_indices = []
         self._attempt_parameters = []
-        self._store_all_indices_stacks = []
-        self._store_remaining_indices_stacks = []
         self._store_deleted_indices_stacks = []
-        self._store_attempt_parameters_stacks = []
+        self._store_changed_parameters_stacks = []
 
         for line in range(self._height):
             self._number_of_rests.append(0)
@@ -268,12 +672,11 @@ class CounterpointGenerator (ABC):
                 "lowest_has_been_placed": None,
                 "highest_has_been_placed": None,
                 "available_pitches": [],
+                "melodic_successors": None,
                 "number_of_rests": 0
                 })
-            self._store_all_indices_stacks.append([])
-            self._store_remaining_indices_stacks.append([])
             self._store_deleted_indices_stacks.append([])
-            self._store_attempt_parameters_stacks.append([])
+            self._store_changed_parameters_stacks.append([])
 
         #for each line, set up all of the indices and remaining indices 
         for line in range(self._height):
@@ -293,6 +696,12 @@ class CounterpointGenerator (ABC):
         self._delineate_vocal_ranges()
         self._highest_bar_reached = 0
 
+        #the valid melodic intervals are not enforced by an insertion check but by the successor graph of each line, 
+        #which lists the available pitches that can follow each pitch
+        for line in range(self._height):
+            self._attempt_parameters[line]["melodic_successors"] = get_melodic_successor_graph(
+                self._mode, self._attempt_parameters[line]["available_pitches"], self._legal_intervals)
+
     def _delineate_vocal_ranges(self) -> None:
 
         self._assign_highest_and_lowest()
@@ -320,22 +729,167 @@ class CounterpointGenerator (ABC):
 
     ############ backtrack and helper functions ###############
 
-    #recursive function that adds successive notes onto the counterpoint stack until solutions are reached
+    #runs a beam search in place of the backtracking algorithm (see generate_counterpoint_with_beam_search).  Each state in 
+    #the beam is the sequence of placements, in the form (line, bar, beat, entity), made since the attempt began, together 
+    #with the sum of their incremental costs.  Every state is extended by each note and rest that can be placed at its next
+    #index and passes the forward checks.  The children_per_parent cheapest extensions of each state are kept, and the width 
+    #cheapest of those form the next beam.  States that reach the end of the piece are recorded as solutions if they pass 
+    #the final checks
+    def _beam_search(self, width: int, children_per_parent: int) -> None:
+        self._begin_backtrack()
+        if not self._node_pending:
+            return 
+        self._node_pending = False
+        cost_functions = [score_function.incremental_cost for score_function in self._score_functions if hasattr(score_function, "incremental_cost")]
+        placements_on_stack = []
+        #each partial piece is kept with its cost and the notes and rests found for its next index by the forward checks
+        beam = [([], 0, None)]
+        while len(beam) > 0 and not self._deadline_has_passed(include_attempt=True):
+            extensions = []
+            for placements, cost, valid_notes_and_rests in beam:
+                self._move_to_placements(placements_on_stack, placements)
+                placements_on_stack = placements
+                self._number_of_backtracks += 1
+                self._number_of_nodes_visited += 1
+                if self._reached_possible_solution():
+                    if self._passes_final_checks():
+                        self._record_solution()
+                    continue 
+                line = 0
+                while line < self._height and len(self._remaining_indices[line]) == 0:
+                    line += 1
+                (bar, beat) = self._remaining_indices[line][-1]
+                if valid_notes_and_rests is None:
+                    if not self._passes_index_checks(line, bar, beat):
+                        continue 
+                    valid_notes_and_rests = self._get_valid_notes_and_rests(line, bar, beat)
+                children = []
+                for entity in valid_notes_and_rests:
+                    entity_cost = sum([cost_function(self, entity, line, bar, beat) for cost_function in cost_functions])
+                    #only admit the extension if the forward checks show it can still lead to a solution
+                    self._remaining_indices[line].pop()
+                    self._add_entity_to_stack(entity, line, bar, beat)
+                    if self._passes_forward_checks(line):
+                        next_notes_and_rests = self._forward_checked_node[3] if self._forward_checked_node is not None else None
+                        children.append((placements + [(line, bar, beat, entity)], cost + entity_cost, next_notes_and_rests))
+                    self._remove_entity_from_stack(line, bar, beat)
+                    self._remaining_indices[line].append((bar, beat))
+                #keep only the cheapest children of each partial piece (ties keep the shuffled order)
+                extensions += sorted(children, key=lambda child: child[1])[:children_per_parent]
+            self._forward_checked_node = None
+            #keep the cheapest extensions, in the order they were found so that successive states mostly share their 
+            #placements and few need to be undone when moving between them 
+            kept = sorted(range(len(extensions)), key=lambda i: extensions[i][1])[:width]
+            beam = [extensions[i] for i in sorted(kept)]
+        self._move_to_placements(placements_on_stack, [])
+
+    #changes the stack from one sequence of placements to another made since the attempt began, removing the placements 
+    #that differ and then making the new ones
+    def _move_to_placements(self, current_placements: list[tuple], new_placements: list[tuple]) -> None:
+        shared = 0
+        while ( shared < len(current_placements) and shared < len(new_placements) 
+            and current_placements[shared] is new_placements[shared] ):
+            shared += 1
+        for (line, bar, beat, entity) in reversed(current_placements[shared:]):
+            self._remove_entity_from_stack(line, bar, beat)
+            self._remaining_indices[line].append((bar, beat))
+        for (line, bar, beat, entity) in new_placements[shared:]:
+            self._remaining_indices[line].pop()
+            self._add_entity_to_stack(entity, line, bar, beat)
+
+    #runs the backtracking algorithm, which adds successive notes onto the counterpoint stack until solutions are reached,
+    #from start to finish
     def _backtrack(self) -> None:
+        self._begin_backtrack()
+        self._resume_backtrack()
+
+    #sets up the backtracking algorithm with an empty stack of frames and a single node waiting to be visited
+    def _begin_backtrack(self) -> None:
+        self._backtrack_frames = []
+        self._attempt_deadline = perf_counter() + self._attempt_time_limit if self._attempt_time_limit is not None else None
+        self._forward_checked_node = None
+        if self._nogood_table is not None:
+            self._attempt_state = hash(self._get_attempt_state())
+        self._node_pending = True
+
+    #runs the backtracking algorithm until it has finished or until max_nodes nodes have been visited (or, if pause_on_solution
+    #is set, until a solution has been found).  Returns True if the algorithm has finished and False if it has been paused
+    def _resume_backtrack(self, max_nodes: int = None, pause_on_solution: bool = False) -> bool:
+        nodes_visited = 0
+        while True:
+            if self._node_pending:
+                if max_nodes is not None and nodes_visited >= max_nodes:
+                    return False 
+                nodes_visited += 1
+                self._number_of_nodes_visited += 1
+                self._node_pending = False
+                solutions_before = self._number_of_solutions_found_this_attempt
+                if not self._visit_node():
+                    #once the exit conditions have been met they remain met (no more solutions can be found), so rather than 
+                    #visiting every remaining candidate only to return immediately, we unwind the stack all at once
+                    self._unwind_backtrack()
+                    if self._restart_requested:
+                        self._restart()
+                        continue 
+                    return True 
+                if pause_on_solution and self._number_of_solutions_found_this_attempt > solutions_before:
+                    return False 
+            else:
+                if len(self._backtrack_frames) == 0:
+                    return True 
+                frame = self._backtrack_frames[-1]
+                line, bar, beat = frame[0], frame[1], frame[2]
+                #the backtracking algorithm has completed its course beyond the entity this frame placed, so remove it from the stack
+                if frame[4]:
+                    self._remove_entity_from_stack(line, bar, beat)
+                    frame[4] = False
+                entity = next(frame[3], None)
+                #if we've run out of candidates, restore the index and return to the previous frame 
+                if entity is None:
+                    #if no solution has been found since the frame was pushed, its state is a nogood
+                    if frame[6] is not None and frame[6][1] == self._number_of_solutions_found_this_attempt:
+                        self._nogood_table.add(frame[6][0])
+                    if self._backjumping:
+                        self._backjump()
+                    else:
+                        self._remaining_indices[line].append((bar, beat))
+                        self._backtrack_frames.pop()
+                else:
+                    self._add_entity_to_stack(entity, line, bar, beat)
+                    frame[4] = True
+                    #if the branch is doomed, leave the entity to be removed on the next pass and try the next candidate 
+                    if self._forward_checking and not self._passes_forward_checks(line):
+                        continue 
+                    self._node_pending = True
+
+    #visits a single node of the backtracking algorithm: either records a solution, or determines the next index to fill and 
+    #pushes a frame with the valid notes and rests for that index.  Returns False if the exit conditions have been met 
+    def _visit_node(self) -> bool:
         self._number_of_backtracks += 1
 
         #first determine whether the loop should be exited
-        if self._exit_backtrack_loop(): return 
+        if self._restart_policy_applies():
+            if self._restart_policy.should_restart(self):
+                self._restart_requested = True
+                return False 
+        elif self._exit_backtrack_loop(): return False 
+        if self._number_of_backtracks % self._nodes_between_clock_checks == 0 and self._deadline_has_passed(include_attempt=True): 
+            return False 
 
         #see if we've reached the end of the stack.
         #if so, see if the current stack passes the final checks, and if it does, add it to the solutions
         if self._reached_possible_solution():
+            #the final checks may depend on any placement, and the frames above a solution mustn't be skipped in any case
+            self._add_to_conflict_set(None)
             if self._passes_final_checks():
-                if len(self._solutions) == 0 and self._height > 1:
-                    print("found first solution at backtrack number", self._number_of_backtracks, "attempt number", self._number_of_attempts)
-                self._solutions.append([self._counterpoint_stacks[line][:] for line in range(self._height)])
-                self._number_of_solutions_found_this_attempt += 1
-            return 
+                self._record_solution()
+            return True 
+
+        #prune the branch if none of the solutions it can lead to could be better than the best so far.  The bound depends 
+        #on every placement, so with backjumping the conflict covers the whole stack
+        if self._best_score is not None and self._branch_and_bound and self._get_score_lower_bound() >= self._best_score:
+            self._add_to_conflict_set(None)
+            return True 
 
         #determine which line we're in.  Lines are written one at a time from bottom to top, but in some 
         #subclasses, certain lines will be generated and added beforehand, so we can't be sure that the top line
@@ -350,20 +904,261 @@ class CounterpointGenerator (ABC):
         (bar, beat) = self._remaining_indices[line].pop()
         if (line, bar, beat) > self._highest_index_reached:
             self._highest_index_reached = (line, bar, beat)
+            self._node_of_last_progress = self._number_of_backtracks
             self._most_advanced_progress = [self._counterpoint_stacks[line][:] for line in range(self._height)]
             self._log = []
 
-        # if (line, bar, beat) == (1, self._length - 1, 0) and not self._has_printed:
-        #     self._has_printed = True
-        #     self.print_counterpoint()
-
         #make sure that the index checks are all true before preceding further
         if not self._passes_index_checks(line, bar, beat):
             self._remaining_indices[line].append((bar, beat))
-            return
+            self._add_to_conflict_set(self._get_line_dependencies(line))
+            return True 
+
+        #skip the index if its state is a known nogood.  Under branch and bound, a branch that was pruned may still hold 
+        #solutions, so no new nogoods are recorded
+        nogood_record = None
+        if self._nogood_table is not None:
+            state = self._get_search_state(line, bar, beat)
+            if self._nogood_table.contains(state):
+                self._remaining_indices[line].append((bar, beat))
+                self._add_to_conflict_set(None)
+                return True 
+            if not self._branch_and_bound:
+                nogood_record = (state, self._number_of_solutions_found_this_attempt)
+
+        #use the notes and rests found while checking ahead, if they were found for this index
+        if self._forward_checked_node is not None and self._forward_checked_node[:3] == (line, bar, beat):
+            valid_notes_and_rests = self._forward_checked_node[3]
+        else:
+            valid_notes_and_rests = self._get_valid_notes_and_rests(line, bar, beat)
+        self._forward_checked_node = None
+        self._backtrack_frames.append([line, bar, beat, iter(valid_notes_and_rests), False, set(), nogood_record])
+        return True 
+
+    #adds the piece on the stack, which has passed the final checks, to the solutions
+    def _record_solution(self) -> None:
+        if self._is_duplicate_solution(self._counterpoint_stacks):
+            return 
+        score = None
+        #when optimizing, only keep solutions that improve on the best so far.  The others still count as found, so that 
+        #the exit conditions are met as they would be without branch and bound
+        if self._branch_and_bound:
+            score = self._get_score()
+            if self._best_score is not None and score >= self._best_score:
+                self._number_of_solutions += 1
+                return 
+            self._best_score = score
+        if score is None and self._top_solutions_limit is not None:
+            score = self._get_score()
+        self._last_solution = [self._counterpoint_stacks[line][:] for line in range(self._height)]
+        self._add_solution(self._last_solution, score)
+        self._number_of_solutions_found_this_attempt += 1
+
+    #returns whether the specified solution (or the piece on the stack) has been found before, if solutions are being
+    #deduplicated, and remembers it otherwise.  Solutions are identified by a hash of the pitch id (None for rests) and
+    #duration of every entity in every line, which only two different solutions would share by an astronomically unlikely
+    #collision
+    def _is_duplicate_solution(self, sol: list[list[RhythmicValue]]) -> bool:
+        if not self._deduplicate_solutions:
+            return False 
+        solution_hash = hash(tuple([tuple([(entity.get_pitch_id() if isinstance(entity, Pitch) else None, entity.get_duration()) 
+            for entity in line]) for line in sol]))
+        if solution_hash in self._solution_hashes:
+            self._number_of_duplicate_solutions += 1
+            return True 
+        self._solution_hashes.add(solution_hash)
+        return False 
+
+    #adds a solution to the solutions kept.  If their number is bounded, the solution is placed in order of its score (scoring 
+    #it if the score isn't given) and the worst solution is discarded if there are too many
+    def _add_solution(self, sol: list[list[RhythmicValue]], score: int = None) -> None:
+        self._number_of_solutions += 1
+        if self._top_solutions_limit is None:
+            self._solutions.append(sol)
+            return 
+        if score is None:
+            score = self._score_solution(sol)
+        position = bisect_right(self._solution_scores, score)
+        if position < self._top_solutions_limit:
+            self._solutions.insert(position, sol)
+            self._solution_scores.insert(position, score)
+            if len(self._solutions) > self._top_solutions_limit:
+                self._solutions.pop()
+                self._solution_scores.pop()
+
+    #checks ahead after an entity has been added to the specified line.  Returns False if the branch can't lead to a solution,
+    #either because the line can no longer place its highest and lowest notes in time or because the next index can't be 
+    #filled.  Only the next index is examined, since the indices that follow it depend on what is placed there 
+    def _passes_forward_checks(self, line: int) -> bool:
+        self._forward_checked_node = None
+        if ensure_lowest_and_highest_have_been_placed in self._index_checks:
+            for key in ["lowest", "highest"]:
+                if not self._can_still_place(line, key):
+                    self._add_to_conflict_set(self._get_line_dependencies(line))
+                    return False 
+        if self._reached_possible_solution():
+            return True 
+        next_line = 0
+        while next_line < self._height and len(self._remaining_indices[next_line]) == 0:
+            next_line += 1
+        (bar, beat) = self._remaining_indices[next_line][-1]
+        if not self._passes_index_checks(next_line, bar, beat):
+            self._add_to_conflict_set(self._get_line_dependencies(next_line))
+            return False 
+        valid_notes_and_rests = self._get_valid_notes_and_rests(next_line, bar, beat)
+        self._forward_checked_node = (next_line, bar, beat, valid_notes_and_rests)
+        if len(valid_notes_and_rests) == 0:
+            self._add_to_conflict_set(self._get_node_dependencies(next_line, bar, beat))
+            return False 
+        return True 
+
+    #determines whether the highest or lowest note (specified by key) can still be placed in the line before the index check
+    #that requires it.  It takes one more entity if the last entity is a Pitch that can't move directly to the required note
+    #(at the least a rest and then the note), so we count the indices left before the deadline
+    def _can_still_place(self, line: int, key: str) -> bool:
+        if self._attempt_parameters[line][key + "_has_been_placed"]:
+            return True 
+        must_appear_by = self._attempt_parameters[line][key + "_must_appear_by"]
+        needed = 1
+        if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
+            target_id = self._attempt_parameters[line][key].get_pitch_id()
+            successors = self._attempt_parameters[line]["melodic_successors"].get_successors(self._counterpoint_stacks[line][-1])
+            if not any([pitch.get_pitch_id() == target_id for pitch in successors]):
+                needed = 2
+        #the remaining indices are stored in reverse order
+        available = 0
+        for (bar, beat) in reversed(self._remaining_indices[line]):
+            if bar >= must_appear_by:
+                return available >= needed
+            available += 1
+            if available >= needed:
+                return True 
+        #the index check is never reached, so there is no deadline
+        return True 
+
+    #called when the frame on top of the stack has run out of candidates and backjumping is on.  Pops the frame and, unless
+    #a solution has been reached below it, every frame above the most recent placement in its conflict set, which is then
+    #passed on to that placement's frame.  If the conflict set is empty, no placement could have changed the outcome, 
+    #so every frame is popped
+    def _backjump(self) -> None:
+        frame = self._backtrack_frames[-1]
+        line, bar, beat, conflict_set = frame[0], frame[1], frame[2], frame[5]
+        self._remaining_indices[line].append((bar, beat))
+        self._backtrack_frames.pop()
+        if conflict_set is not None:
+            node_dependencies = self._get_node_dependencies(line, bar, beat)
+            conflict_set = None if node_dependencies is None else conflict_set | node_dependencies
+        if conflict_set is None:
+            if len(self._backtrack_frames) > 0:
+                self._backtrack_frames[-1][5] = None
+            return 
+        culprit = max(conflict_set, default=-1)
+        while len(self._backtrack_frames) - 1 > culprit:
+            line, bar, beat, candidates, has_entity_on_stack, skipped_conflict_set, nogood_record = self._backtrack_frames.pop()
+            if has_entity_on_stack:
+                self._remove_entity_from_stack(line, bar, beat)
+            self._remaining_indices[line].append((bar, beat))
+        if culprit >= 0:
+            self._add_to_conflict_set(conflict_set)
 
-        #get the valid pitches from available pitches by passing them through the insertion checks
-        valid_pitches = filter(lambda pitch: self._passes_insertion_checks(pitch, line, bar, beat), self._attempt_parameters[line]["available_pitches"])
+    #adds the specified placements (given as positions in the stack of frames) to the conflict set of the frame on top of the
+    #stack, whose current candidate has just failed.  None stands for every placement, and prevents the frame from jumping
+    def _add_to_conflict_set(self, dependencies: set[int]) -> None:
+        if not self._backjumping or len(self._backtrack_frames) == 0:
+            return 
+        frame = self._backtrack_frames[-1]
+        if frame[5] is None:
+            return 
+        if dependencies is None:
+            frame[5] = None
+        else:
+            frame[5] |= dependencies
+            frame[5].discard(len(self._backtrack_frames) - 1)
+
+    #the placements (as positions in the stack of frames) that the notes and rests available at the specified index depend on:
+    #those of the same line, and those of the other lines that sound in the bars that the checks and filters there read 
+    def _get_node_dependencies(self, line: int, bar: int, beat: float) -> set[int]:
+        other_line_bars = self._other_line_bars_by_position[(bar, beat)]
+        dependencies = set()
+        for depth, frame in enumerate(self._backtrack_frames):
+            if frame[0] == line:
+                dependencies.add(depth)
+            elif other_line_bars is None:
+                return None 
+            else:
+                entity = self._counterpoint_objects[frame[0]][(frame[1], frame[2])]
+                onset = frame[1] * 8 + frame[2] * 2
+                if any([onset < (other_bar + 1) * 8 and onset + entity.get_duration() > other_bar * 8 for other_bar in other_line_bars]):
+                    dependencies.add(depth)
+        return dependencies
+
+    #the placements (as positions in the stack of frames) in the specified line
+    def _get_line_dependencies(self, line: int) -> set[int]:
+        return set([depth for depth, frame in enumerate(self._backtrack_frames) if frame[0] == line])
+
+    #a hash of the state at the specified index, as recorded in the nogood table (see use_nogood_table).  The counters in the
+    #attempt parameters are the values that are booleans or integers
+    def _get_search_state(self, line: int, bar: int, beat: float) -> int:
+        #the lines that remain to be written after this one will be checked against every line
+        if any([len(self._remaining_indices[later_line]) > 0 for later_line in range(line + 1, self._height)]):
+            lines = tuple([tuple(self._counterpoint_stacks[other_line]) for other_line in range(self._height)])
+        else:
+            other_line_bars = self._remaining_other_line_bars_by_position[(bar, beat)]
+            lines = tuple([self._get_line_state(line, bar, self._line_lookback) if other_line == line else 
+                (self._get_entities_in_bars(other_line, other_line_bars), self._get_line_state(other_line, bar, self._final_line_lookback)) 
+                for other_line in range(self._height)])
+        counters = tuple([tuple([value for value in parameters.values() if isinstance(value, (bool, int))]) for parameters in self._attempt_parameters])
+        return hash((line, bar, beat, lines, counters, self._attempt_state))
+
+    #what checks and filters with the specified lookback (see get_line_lookback in dependencies.py) read of the specified line 
+    #when the specified bar is being filled or any later one.  The notes available at an index always depend on the last entity
+    def _get_line_state(self, line: int, bar: int, lookback: tuple[int, int, list[callable]]) -> tuple:
+        if lookback is None:
+            return tuple(self._counterpoint_stacks[line])
+        (entities, bars, summaries) = lookback
+        end = max(len(self._counterpoint_stacks[line]) - max(entities, 1), 0)
+        entities_in_bars = None if bars is None else self._get_entities_in_bars(line, frozenset(range(bar - bars, bar + 1)))
+        return (tuple(self._counterpoint_stacks[line][end:]), entities_in_bars, tuple([summary(self, line, end) for summary in summaries]))
+
+    #the entities of the specified line that sound in any of the specified bars, with their onsets (every entity if bars is None)
+    def _get_entities_in_bars(self, line: int, bars: frozenset[int]) -> tuple:
+        if bars is None:
+            return tuple(self._counterpoint_stacks[line])
+        entities, onset = [], 0
+        for entity in self._counterpoint_stacks[line]:
+            next_onset = onset + entity.get_duration()
+            if any([bar in bars for bar in range(onset // 8, (next_onset - 1) // 8 + 1)]):
+                entities.append((onset, entity))
+            onset = next_onset
+        return tuple(entities)
+
+    #the parts of the state that are fixed for the duration of an attempt.  Extended in subclasses whose checks depend on 
+    #other values chosen when an attempt is initialized
+    def _get_attempt_state(self) -> tuple:
+        return get_canonical_form(self._attempt_parameters)
+
+    #removes every frame from the stack, restoring the counterpoint stacks and indices to their state before backtracking began
+    def _unwind_backtrack(self) -> None:
+        while len(self._backtrack_frames) > 0:
+            line, bar, beat, candidates, has_entity_on_stack, conflict_set, nogood_record = self._backtrack_frames.pop()
+            if has_entity_on_stack:
+                self._remove_entity_from_stack(line, bar, beat)
+            self._remaining_indices[line].append((bar, beat))
+        self._forward_checked_node = None
+        self._node_pending = False
+
+    #collects, in random order, every note and rest that may be legally placed at the specified location
+    def _get_valid_notes_and_rests(self, line: int, bar: int, beat: float) -> list[RhythmicValue]:
+        if self._check_statistics is not None and self._check_statistics.is_complete():
+            self._finish_check_ordering_warm_up()
+        self._node_context = self._get_node_context(line, bar, beat)
+        #get the valid pitches by passing the candidates through the insertion checks.  If the previous entity is a pitch,
+        #the candidates are only the pitches that can legally follow it, otherwise they are all of the available pitches
+        if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
+            candidate_pitches = self._attempt_parameters[line]["melodic_successors"].get_successors(self._counterpoint_stacks[line][-1])
+        else:
+            candidate_pitches = self._attempt_parameters[line]["available_pitches"]
+        valid_pitches = filter(lambda pitch: self._passes_insertion_checks(pitch, line, bar, beat), candidate_pitches)
         valid_notes_and_rests = []
         for pitch in valid_pitches:
             #for each valid, pitch, get the valid rhythmic values and create a note for each valid combination
@@ -372,21 +1167,132 @@ class CounterpointGenerator (ABC):
         #add valid rests as well
         for dur in self._get_valid_rest_durations(line, bar, beat):
             valid_notes_and_rests.append(Rest(dur))
-        #use the random module to shuffle the results
-        shuffle(valid_notes_and_rests)
-
-        for entity in valid_notes_and_rests:
-            self._add_entity_to_stack(entity, line, bar, beat)
-            #now that the entity is added to the stack, we can call the recursive backtracking function again
-            self._backtrack()
-            #now that the backtracking function has completed its course up to this point, remove the entity from the stack
-            self._remove_entity_from_stack(line, bar, beat)
+        #use the generator's random number generator to shuffle the results
+        self._random.shuffle(valid_notes_and_rests)
+        if self._ordering_temperature is not None:
+            self._order_by_incremental_cost(valid_notes_and_rests, line, bar, beat)
+        return valid_notes_and_rests
+
+    #sorts the notes and rests so that the ones that add the least to the score are tried first.  Each cost is offset by 
+    #Gumbel noise scaled by the temperature, which amounts to drawing the entities one at a time, each with a chance of coming 
+    #next proportional to exp(-cost / temperature).  Since the sort is stable, ties keep their shuffled order
+    def _order_by_incremental_cost(self, notes_and_rests: list[RhythmicValue], line: int, bar: int, beat: float) -> None:
+        cost_functions = [score_function.incremental_cost for score_function in self._score_functions if hasattr(score_function, "incremental_cost")]
+        keys = {}
+        for entity in notes_and_rests:
+            keys[entity] = sum([cost_function(self, entity, line, bar, beat) for cost_function in cost_functions])
+            if self._ordering_temperature > 0:
+                keys[entity] += self._ordering_temperature * math.log(self._random.expovariate(1) or sys.float_info.min)
+        notes_and_rests.sort(key=lambda entity: keys[entity])
+
+    #computes the facts about the current index that the insertion checks share.  Extended in subclasses with multiple lines
+    def _get_node_context(self, line: int, bar: int, beat: float) -> NodeContext:
+        return NodeContext(line, bar, beat, self._counterpoint_stacks[line])
+
+    #builds the lists of checks and filters for each index.  This can't be done in the constructor, since subclasses
+    #add and remove checks after calling it.  Extended in subclasses with multiple lines
+    def _build_dispatch_tables(self) -> None:
+        self._melodic_insertion_checks_by_position = build_dispatch_table(self._get_checks_to_dispatch(self._melodic_insertion_checks), self._length)
+        self._rhythmic_insertion_filters_by_position = build_dispatch_table(self._rhythmic_insertion_filters, self._length)
+        (own_line_checks, other_line_checks) = self._get_checks_by_dependency()
+        self._other_line_bars_by_position = build_dependency_table(own_line_checks, other_line_checks, self._length)
+        self._remaining_other_line_bars_by_position = build_remaining_dependency_table(self._other_line_bars_by_position)
+        self._line_lookback = get_line_lookback(self._get_checks_reading_line())
+        self._final_line_lookback = get_line_lookback(self._final_checks)
+
+    #the checks and filters consulted when an index is filled, split into those that are assumed to read only the line being 
+    #filled unless they declare otherwise and those that are assumed to read the other lines (see dependencies.py).  
+    #Extended in subclasses with multiple lines
+    def _get_checks_by_dependency(self) -> tuple[list[callable], list[callable]]:
+        return (self._melodic_insertion_checks + self._rhythmic_insertion_filters + self._index_checks, [])
+
+    #the checks and filters that read the line being filled, whose lookbacks determine what a search state holds of it (see 
+    #use_nogood_table).  Extended in subclasses with multiple lines
+    def _get_checks_reading_line(self) -> list[callable]:
+        return self._melodic_insertion_checks + self._rhythmic_insertion_filters + self._index_checks + self._change_parameters_checks + self._final_checks
+
+    #during the warm-up window of adaptive check ordering, the dispatch tables hold measured stand-ins for the checks
+    def _get_checks_to_dispatch(self, checks: list[callable]) -> list[callable]:
+        if self._check_statistics is not None:
+            return self._check_statistics.measure(checks)
+        return checks
+
+    #the lists of insertion checks that adaptive check ordering may reorder, by name.  Extended in subclasses with multiple lines
+    def _get_orderable_checks(self) -> dict[str, list[callable]]:
+        return { "melodic": self._melodic_insertion_checks }
+
+    #returns the class of the generator and the positional and keyword arguments that construct an equivalent generator, 
+    #with the seed replaced by a random number generator in the state this generator's was in when it was constructed, so 
+    #that the new generator makes the same arbitrary choices in its constructor (such as the Cantus Firmus it writes)
+    def _get_constructor(self) -> tuple[type, tuple, dict]:
+        args, kwargs = self._constructor_arguments
+        arguments = inspect.signature(type(self)).bind(*args, **kwargs)
+        random_number_generator = Random()
+        random_number_generator.setstate(self._initial_random_state)
+        arguments.arguments["seed"] = random_number_generator
+        return type(self), arguments.args, arguments.kwargs
+
+    #returns the settings made by the use_ functions, by attribute name, together with the order of the orderable checks
+    #(see use_adaptive_check_ordering), so that they can be passed on to an equivalent generator
+    def _get_search_settings(self) -> dict:
+        settings = { name: getattr(self, name) for name in self._search_settings }
+        settings["check_orders"] = { list_name: [check.__name__ for check in checks] for list_name, checks in self._get_orderable_checks().items() }
+        return settings
+
+    #takes on settings returned by another generator's _get_search_settings.  The checks are put in the same order, but
+    #aren't measured 
+    def _apply_search_settings(self, settings: dict) -> None:
+        for name in self._search_settings:
+            setattr(self, name, settings[name])
+        for list_name, checks in self._get_orderable_checks().items():
+            checks[:] = sort_checks_by_learned_order(checks, settings["check_orders"][list_name])
+
+    #ends the warm-up window: sorts the checks according to their measurements, records the learned order for 
+    #this generator class and rebuilds the dispatch tables with the checks themselves
+    def _finish_check_ordering_warm_up(self) -> None:
+        for list_name, checks in self._get_orderable_checks().items():
+            checks[:] = self._check_statistics.sort_checks(checks)
+            set_learned_check_order(type(self).__name__, list_name, [check.__name__ for check in checks])
+        self._check_statistics = None
+        self._build_dispatch_tables()
+
+    #the restart policy decides when to give up on the current attempt parameters until a solution has been found with them
+    #or the policy has used up its restarts
+    def _restart_policy_applies(self) -> bool:
+        if self._restart_policy is None or self._number_of_solutions_found_this_attempt > 0:
+            return False 
+        return self._number_of_restarts < self._restart_policy.get_max_restarts()
+
+    #starts the current attempt again with new attempt parameters
+    def _restart(self) -> None:
+        self._restart_requested = False
+        number_of_restarts = self._number_of_restarts + 1
+        self._initialize()
+        self._number_of_restarts = number_of_restarts
+        self._begin_backtrack()
+
+    #starts the clock for a call that generates counterpoint, if it has a time limit
+    def _start_clock(self) -> None:
+        self._ran_out_of_time = False
+        self._deadline = perf_counter() + self._time_limit if self._time_limit is not None else None
+
+    #determines whether the deadline of the current call (or, if include_attempt is set, of the current attempt) has passed
+    def _deadline_has_passed(self, include_attempt: bool = False) -> bool:
+        if self._deadline is None and (self._attempt_deadline is None or not include_attempt):
+            return False 
+        now = perf_counter()
+        if self._deadline is not None and now >= self._deadline:
+            self._ran_out_of_time = True
+            return True 
+        return include_attempt and self._attempt_deadline is not None and now >= self._attempt_deadline
 
-        self._remaining_indices[line].append((bar, beat))
+    #the attempt loop is exited once its exit conditions have been met or the time limit has been reached
+    def _exit_generation(self) -> bool:
+        return self._deadline_has_passed() or self._exit_attempt_loop()
 
     #the default is given below, but this should be overriden in every subclass
     def _exit_backtrack_loop(self) -> bool:
-        if self._number_of_backtracks > 10000 or len(self._solutions) > 0:
+        if self._number_of_backtracks > 10000 or self._number_of_solutions > 0:
             return True 
         return False 
 
@@ -404,7 +1310,7 @@ class CounterpointGenerator (ABC):
     #runs each pitch through a list of insertion checks to determine whether the pitch may be legally 
     #added to the stack at the specified location
     def _passes_insertion_checks(self, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-        for check in self._melodic_insertion_checks:
+        for check in self._melodic_insertion_checks_by_position[(bar, beat)]:
             if not check(self, pitch, line, bar, beat): 
                 #print("failed at check", check.__name__)
                 return False 
@@ -414,7 +1320,7 @@ class CounterpointGenerator (ABC):
     #can be legally placed on the stack at the specified location
     def _get_valid_durations(self, pitch: Pitch, line: int, bar: int, beat: float) -> set[int]:
         durations = self._get_available_durations(line, bar, beat)
-        for check in self._rhythmic_insertion_filters:
+        for check in self._rhythmic_insertion_filters_by_position[(bar, beat)]:
             durations = check(self, pitch, line, bar, beat, durations)
             if len(durations) == 0: 
                 # print("failed at check", check.__name__)
@@ -437,8 +1343,8 @@ class CounterpointGenerator (ABC):
             if bar == 0: return { 2, 4, 6, 8, 12, 16 }
             else: return { 2, 4, 6, 8, 12 }
 
-    #adds the note or rest to the stack, removes the indices that it nullifies, adds the current snapshot
-    #of the attempt parameters to the stack of stored conditions and checks to see if any conditions have changed
+    #adds the note or rest to the stack, removes the indices that it nullifies, records the removed indices on the stack
+    #of stored changes and checks to see if any conditions have changed (the change checks record their own changes)
     def _add_entity_to_stack(self, entity: RhythmicValue, line: int, bar: int, beat: float) -> None:
 
         #add the note or rest to the stack
@@ -456,13 +1362,12 @@ class CounterpointGenerator (ABC):
             if (new_bar, new_beat) in self._all_indices[line]:
                 indices_to_remove.append((new_bar, new_beat))
 
-        #store copies of the current indices and the current attempt parameters in the appropriate stacks
+        #record the indices we're about to remove, and open a new (empty) record of changed attempt parameters
         self._store_deleted_indices_stacks[line].append(indices_to_remove)
-        self._store_all_indices_stacks[line].append(self._all_indices[line].copy())
-        self._store_remaining_indices_stacks[line].append(self._remaining_indices[line][:])
-        self._store_attempt_parameters_stacks[line].append(self._attempt_parameters[line].copy())
+        self._store_changed_parameters_stacks[line].append([])
         
         #for each of the indices to remove, remove them from the _all_indices, _remaining_indices and _counterpoint_objects objects
+        #note that the indices to remove are always the next ones on the _remaining_indices stack
         for index in indices_to_remove:
             del self._counterpoint_objects[line][index]
             self._all_indices[line].remove(index)
@@ -478,14 +1383,22 @@ class CounterpointGenerator (ABC):
         self._counterpoint_objects[line][(bar, beat)] = None 
         self._counterpoint_stacks[line].pop()
 
-        #restore previous conditions
-        self._attempt_parameters[line] = self._store_attempt_parameters_stacks[line].pop()
-        self._all_indices[line] = self._store_all_indices_stacks[line].pop()
-        self._remaining_indices[line] = self._store_remaining_indices_stacks[line].pop()
+        #undo the changes to the attempt parameters in the reverse order in which they were made
+        for key, value in reversed(self._store_changed_parameters_stacks[line].pop()):
+            self._attempt_parameters[line][key] = value
 
-        #add each deleted index back to the counterpoint object 
-        for index in self._store_deleted_indices_stacks[line].pop():
+        #add each deleted index back to the indices and the counterpoint object, pushing them back onto the 
+        #remaining indices in reverse order so that the stack is restored to its previous order
+        for index in reversed(self._store_deleted_indices_stacks[line].pop()):
             self._counterpoint_objects[line][index] = None 
+            self._all_indices[line].add(index)
+            self._remaining_indices[line].append(index)
+
+    #changes the value of an attempt parameter while a note or rest is being added to the stack, recording the 
+    #previous value so that it can be restored when the note or rest is removed.  Change checks should always use this
+    def _update_attempt_parameter(self, line: int, key: str, value: object) -> None:
+        self._store_changed_parameters_stacks[line][-1].append((key, self._attempt_parameters[line][key]))
+        self._attempt_parameters[line][key] = value
 
     #runs a list of functions that examine the current stack to determine if it's valid
     def _passes_final_checks(self) -> bool:
@@ -506,10 +1419,8 @@ class CounterpointGenerator (ABC):
 
         self._attempt_parameters = []
 
-        self._store_all_indices_stacks = []
-        self._store_remaining_indices_stacks = []
         self._store_deleted_indices_stacks = []
-        self._store_attempt_parameters_stacks = []
+        self._store_changed_parameters_stacks = []
 
         self._number_of_rests = []
 
@@ -524,9 +1435,51 @@ class CounterpointGenerator (ABC):
         self._final_checks = []
 
         self._solutions = []
+        self._number_of_solutions = 0
+        self._last_solution = None
+        self._top_solutions_limit = None
+        self._solution_scores = None
+        self._deduplicate_solutions = True
+        self._solution_hashes = set()
+        self._number_of_duplicate_solutions = 0
 
         self._score_functions = []
 
+        self._backtrack_frames = []
+        self._node_pending = False
+        self._generation_in_progress = False
+        self._attempt_in_progress = False
+
+        self._adaptive_check_ordering = False
+        self._check_statistics = None
+
+        self._forward_checking = False
+        self._forward_checked_node = None
+
+        self._backjumping = False
+        self._other_line_bars_by_position = None
+        self._remaining_other_line_bars_by_position = None
+
+        self._nogood_table = None
+        self._line_lookback = None
+        self._final_line_lookback = None
+        self._attempt_state = None
+
+        self._time_limit = None
+        self._attempt_time_limit = None
+        self._deadline = None
+        self._attempt_deadline = None
+        self._ran_out_of_time = False
+
+        self._ordering_temperature = None
+
+        self._branch_and_bound = False
+        self._best_score = None
+
+        self._restart_policy = None
+        self._restart_requested = False
+        self._number_of_nodes_visited = 0
+
         self._legal_intervals = {
             "tonal_adjacent_melodic": { -8, -5, -4, -3, -2, 2, 3, 4, 5, 6, 8 },
             "chromatic_adjacent_melodic": { -12, -7, -5, -4, -3, -2, -1, 1, 2, 3, 4, 5, 7, 8, 12 },
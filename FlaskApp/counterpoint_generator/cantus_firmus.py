@@ -1,6 +1,6 @@
 from abc import ABC
 
-from random import randint, random, shuffle
+from typing import Iterator
 import math
 
 import os,sys,inspect
@@ -21,11 +21,12 @@ from filter_functions.melodic_insertion_checks import last_interval_is_descendin
 
 class CantusFirmusGenerator (FirstSpeciesCounterpointGenerator, OneLine):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         #Add the end by descending step optional function
         self._melodic_insertion_checks.append(last_interval_is_descending_step)
+        self._must_end_by_descending_step = False
     
     #override:
     #override the generate counterpoint function to provide the option of ending by descending step
@@ -35,6 +36,23 @@ class CantusFirmusGenerator (FirstSpeciesCounterpointGenerator, OneLine):
         self._must_end_by_descending_step = must_end_by_descending_step
         super().generate_counterpoint()
 
+    #override:
+    #likewise provide the option of ending by descending step when solutions are generated lazily
+    def iter_solutions(self, must_end_by_descending_step: bool = False) -> Iterator[list[list[RhythmicValue]]]:
+        self._must_end_by_descending_step = must_end_by_descending_step
+        return super().iter_solutions()
+
+    #override:
+    #likewise provide the option of ending by descending step when the attempts are run in parallel
+    def generate_counterpoint_in_parallel(self, max_workers: int = None, must_end_by_descending_step: bool = False) -> None:
+        self._must_end_by_descending_step = must_end_by_descending_step
+        super().generate_counterpoint_in_parallel(max_workers)
+
+    #override:
+    #the last_interval_is_descending_step check depends on whether the option was chosen
+    def _get_attempt_state(self) -> tuple:
+        return (super()._get_attempt_state(), self._must_end_by_descending_step)
+
     #override:
     #collect unlimited Cantus Firmus examples within 3500 backtracks
     def _exit_backtrack_loop(self) -> bool:
@@ -0,0 +1,90 @@
+import json
+from time import perf_counter
+
+
+#learned orders of the insertion checks, by generator class name and then by the name of the list of checks
+#(e.g. "melodic" or "harmonic").  Each order is a list of check names, and is shared by all generators of that class
+_learned_check_orders = {}
+
+def get_learned_check_order(generator_class_name: str, list_name: str) -> list[str]:
+    return _learned_check_orders.get(generator_class_name, {}).get(list_name)
+
+def set_learned_check_order(generator_class_name: str, list_name: str, check_names: list[str]) -> None:
+    _learned_check_orders.setdefault(generator_class_name, {})[list_name] = check_names[:]
+
+#public functions: write the learned orders to a JSON file and read them back (merging them into the ones learned so far)
+def save_learned_check_orders(file_name: str) -> None:
+    with open(file_name, "w") as file:
+        json.dump(_learned_check_orders, file, indent=2)
+
+def load_learned_check_orders(file_name: str) -> None:
+    with open(file_name) as file:
+        for generator_class_name, orders in json.load(file).items():
+            for list_name, check_names in orders.items():
+                set_learned_check_order(generator_class_name, list_name, check_names)
+
+#returns the checks sorted according to a learned order.  Checks that don't appear in the order keep their relative
+#positions after the ones that do
+def sort_checks_by_learned_order(checks: list[callable], check_names: list[str]) -> list[callable]:
+    positions = { name: i for i, name in enumerate(check_names) }
+    return sorted(checks, key=lambda check: positions.get(check.__name__, len(check_names)))
+
+
+#stands in for an insertion check during the warm-up window, recording how many times it's called, how many
+#pitches it rejects and how much time it takes.  The positions declared by the check are passed on so that the
+#dispatch tables are unchanged
+class MeasuredCheck:
+
+    def __init__(self, check: callable):
+        self._check = check
+        self.__name__ = check.__name__
+        self.beats = getattr(check, "beats", None)
+        self.bars = getattr(check, "bars", None)
+        self._calls = 0
+        self._rejections = 0
+        self._time = 0.0
+
+    def __call__(self, *args) -> bool:
+        start = perf_counter()
+        result = self._check(*args)
+        self._time += perf_counter() - start
+        self._calls += 1
+        if not result:
+            self._rejections += 1
+        return result
+
+    def get_check(self) -> callable: return self._check
+
+    def get_calls(self) -> int: return self._calls
+
+    #the expected time spent in the check for each pitch it rejects.  Running the checks in increasing order of this
+    #value minimizes the time spent rejecting a pitch.  Checks that never rejected anything go last
+    def get_cost_per_rejection(self) -> float:
+        if self._rejections == 0:
+            return float("inf")
+        return self._time / self._rejections
+
+
+#collects the measurements of the insertion checks during the warm-up window of an adaptive generator
+class CheckStatistics:
+
+    def __init__(self, warm_up_calls: int):
+        self._warm_up_calls = warm_up_calls
+        #the measured stand-ins, by check, so that the measurements carry over when the dispatch tables are rebuilt
+        self._measured_checks = {}
+
+    #returns the measured stand-ins for a list of checks, in the same order
+    def measure(self, checks: list[callable]) -> list[MeasuredCheck]:
+        for check in checks:
+            if check not in self._measured_checks:
+                self._measured_checks[check] = MeasuredCheck(check)
+        return [self._measured_checks[check] for check in checks]
+
+    #the warm-up window is over once the checks have been called the specified number of times in total
+    def is_complete(self) -> bool:
+        return sum([measured_check.get_calls() for measured_check in self._measured_checks.values()]) >= self._warm_up_calls
+
+    #returns the checks sorted so that cheap checks that frequently reject pitches come first.  Ties keep their original order
+    def sort_checks(self, checks: list[callable]) -> list[callable]:
+        measured_checks = self.measure(checks)
+        return [measured_check.get_check() for measured_check in sorted(measured_checks, key=lambda measured_check: measured_check.get_cost_per_rejection())]
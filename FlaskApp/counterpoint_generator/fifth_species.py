@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -58,14 +57,14 @@ from filter_functions.score_functions import select_ideal_ties
 
 class FifthSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
 
         #melody rules for the Fifth Species are in some ways laxer but also more complex than earlier Species
 
             #inherited from base class:
-            #valid_melodic_interval
+            #(valid melodic intervals, enforced by the melodic successor graph)
             #ascending_minor_sixths_are_followed_by_descending_half_step
             #prevent_highest_duplicates
             #prevent_two_notes_from_immediately_repeating
@@ -141,7 +140,7 @@ class FifthSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
 
     def _assign_max_pairs_of_eighths(self) -> None:
         for line in range(self._height):
-            chance = random()
+            chance = self._random.random()
             if chance < .05:
                 self._attempt_parameters[line]["max_pairs_of_eighths"] = 2
             elif chance < .3:
@@ -153,7 +152,7 @@ class FifthSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
     #limit prevents melody from becoming too choppy
     def _assign_max_melodic_octaves(self) -> None:
         for line in range(self._height):
-            self._attempt_parameters[line]["max_melodic_octaves"] = 1 if random() < .6 else 2
+            self._attempt_parameters[line]["max_melodic_octaves"] = 1 if self._random.random() < .6 else 2
             self._attempt_parameters[line]["melodic_octaves_placed"] = 0
 
 
@@ -166,15 +165,15 @@ class FifthSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
         for line in range(self._height):
             vocal_range = self._lines[line]
             #choose a range interval between an octave and tenth that is within each voice range
-            range_size = randint(8, 10)
+            range_size = self._random.randint(8, 10)
             leeway = 13 - range_size #this is the interval that we can add to the range_size interval to get the interval from the lowest to highest note available in the vocal range
-            from_bottom = randint(1, leeway)
+            from_bottom = self._random.randint(1, leeway)
 
             self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(self._mode_resolver.get_lowest_of_range(vocal_range), from_bottom)
             self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["lowest"], range_size)
 
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
     
 
@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -28,8 +27,8 @@ from filter_functions.final_checks import ascending_intervals_are_filled_in
 
 class FirstSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         #First Species has fairly strict melodic requirements in addition to the default ones
         self._melodic_insertion_checks.append(prevent_cross_relations_on_notes_separated_by_one_other_note)
@@ -77,8 +76,8 @@ class FirstSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
             final = self._mode_resolver.get_default_mode_final(vocal_range)
             #choose a range interval between a fifth and an octave and choose a highest and lowest note such that the 
             #default mode final is within the range and not the top note
-            range_size = randint(5, 8)
-            highest = self._mode_resolver.get_default_pitch_from_interval(final, randint(2, range_size))
+            range_size = self._random.randint(5, 8)
+            highest = self._mode_resolver.get_default_pitch_from_interval(final, self._random.randint(2, range_size))
             lowest = self._mode_resolver.get_default_pitch_from_interval(highest, range_size * -1)
             top_leeway = highest.get_tonal_interval(self._mode_resolver.get_highest_of_range(vocal_range))
             bottom_leeway = self._mode_resolver.get_lowest_of_range(vocal_range).get_tonal_interval(lowest)
@@ -93,7 +92,7 @@ class FirstSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
             #check to see if the top and bottom notes create a tritone, in which case we extend the top or bottom
             #note by one (which will stay within each designated vocal range, since a tritone will only form between B and F)
             if lowest.get_chromatic_interval(highest) == 6:
-                if random() < .5:
+                if self._random.random() < .5:
                     highest = self._mode_resolver.get_default_pitch_from_interval(highest, 2)
                 else:
                     lowest = self._mode_resolver.get_default_pitch_from_interval(lowest, -2)
@@ -101,6 +100,6 @@ class FirstSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
             self._attempt_parameters[line]["lowest"] = lowest
             self._attempt_parameters[line]["highest"] = highest
 
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
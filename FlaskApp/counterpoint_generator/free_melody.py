@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -22,8 +21,8 @@ from filter_functions.rhythmic_insertion_filters import enforce_max_long_notes_o
 from filter_functions.change_parameter_checks import check_for_added_downbeat_long_note
 
 class FreeMelodyGenerator (FifthSpeciesCounterpointGenerator, OneLine):
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         self._melodic_insertion_checks.append(end_stepwise)
 
@@ -38,12 +37,12 @@ class FreeMelodyGenerator (FifthSpeciesCounterpointGenerator, OneLine):
         self._assign_max_downbeat_whole_notes()
 
     def _assign_max_downbeat_whole_notes(self) -> None:
-        self._attempt_parameters[0]["max_downbeat_long_notes"] = 0 if random() < .5 else 1
+        self._attempt_parameters[0]["max_downbeat_long_notes"] = 0 if self._random.random() < .5 else 1
         self._attempt_parameters[0]["downbeat_long_notes_placed"] = 0
 
     #override:
     #collect unlimited Cantus Firmus examples within 3500 backtracks
     def _exit_backtrack_loop(self) -> bool:
-        if self._number_of_backtracks > 3500 or (self._number_of_backtracks > 300 and len(self._solutions) == 0):
+        if self._number_of_backtracks > 3500 or (self._number_of_backtracks > 300 and self._number_of_solutions == 0):
             return True 
         return False 
\ No newline at end of file
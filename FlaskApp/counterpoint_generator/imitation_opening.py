@@ -1,4 +1,3 @@
-from random import random, randint, shuffle
 import math
 
 import os,sys,inspect
@@ -23,11 +22,11 @@ from filter_functions.rhythmic_insertion_filters import follow_imitation_pattern
 from filter_functions.score_functions import penalize_rests
 
 class ImitationOpeningGenerator (TwoPartFreeCounterpointGenerator):
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, lowest_pitches: list[Pitch], highest_pitches: list[Pitch]):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, lowest_pitches: list[Pitch], highest_pitches: list[Pitch], seed: int = None):
+        super().__init__(length, lines, mode, seed)
         self._lowest_pitches = lowest_pitches
         self._highest_pitches = highest_pitches
-        self._imitation_bars = randint(3, 6) if length > 14 else randint(3, 5)
+        self._imitation_bars = self._random.randint(3, 6) if length > 14 else self._random.randint(3, 5)
 
         self._melodic_insertion_checks.remove(begin_and_end_two_part_counterpoint)
 
@@ -54,8 +53,8 @@ class ImitationOpeningGenerator (TwoPartFreeCounterpointGenerator):
     #after initialization, choose one line to have an imitative theme and calculate the interval difference 
     def _initialize(self) -> None:
         super()._initialize()
-        self._starting_line = 0 if random() < .5 else 1
-        self._starting_hexachord = Hexachord.DURUM if random() < .5 else Hexachord.MOLLE
+        self._starting_line = 0 if self._random.random() < .5 else 1
+        self._starting_hexachord = Hexachord.DURUM if self._random.random() < .5 else Hexachord.MOLLE
         if self._starting_line == 0 and self._starting_hexachord == Hexachord.DURUM:
             self._translation_interval = 4
         if self._starting_line == 0 and self._starting_hexachord == Hexachord.MOLLE:
@@ -75,7 +74,7 @@ class ImitationOpeningGenerator (TwoPartFreeCounterpointGenerator):
         count = 0
         while optimal is None and count < 20:
             count += 1
-            theme_generator = ImitationThemeGenerator(self._imitation_bars, lines, self._mode, lowest, highest, hexachord)
+            theme_generator = ImitationThemeGenerator(self._imitation_bars, lines, self._mode, lowest, highest, hexachord, self._random)
             theme_generator.generate_counterpoint()
             theme_generator.score_solutions()
             optimal = theme_generator.get_one_solution()
@@ -89,11 +88,16 @@ class ImitationOpeningGenerator (TwoPartFreeCounterpointGenerator):
             self._attempt_parameters[line]["suspension_bars"] = []
 
     #override:
-    #if there is no imitative theme, exit the loop
-    def _backtrack(self) -> None:
+    #the checks also depend on the line and hexachord chosen for the imitative theme
+    def _get_attempt_state(self) -> tuple:
+        return (super()._get_attempt_state(), self._starting_line, self._starting_hexachord, self._translation_interval, self._imitation_bars)
+
+    #override:
+    #if there is no imitative theme, leave no node to visit so that the backtracking algorithm exits immediately
+    def _begin_backtrack(self) -> None:
+        super()._begin_backtrack()
         if len(self._remaining_indices[self._starting_line]) > 0:
-            return
-        super()._backtrack()
+            self._node_pending = False
 
     #override:
     #change the conditions of the reached possible solution function to return true if we've finished the imitation
@@ -122,4 +126,4 @@ class ImitationOpeningGenerator (TwoPartFreeCounterpointGenerator):
     #override:
     #exit the attempt loop once a solution is found
     def _exit_attempt_loop(self) -> bool:
-        return len(self._solutions) >= 100 or self._number_of_attempts >= 5
\ No newline at end of file
+        return self._number_of_solutions >= 100 or self._number_of_attempts >= 5
\ No newline at end of file
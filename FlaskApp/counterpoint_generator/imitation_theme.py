@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -28,8 +27,8 @@ from filter_functions.change_parameter_checks import check_for_added_downbeat_lo
 from filter_functions.final_checks import check_for_second_outline_pitch
 
 class ImitationThemeGenerator (FifthSpeciesCounterpointGenerator, OneLine):
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, lowest: Note, highest: Note, hexachord: Hexachord):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, lowest: Note, highest: Note, hexachord: Hexachord, seed: int = None):
+        super().__init__(length, lines, mode, seed)
         self._lowest = lowest
         self._highest = highest
         self._hexachord = hexachord
@@ -71,7 +70,7 @@ class ImitationThemeGenerator (FifthSpeciesCounterpointGenerator, OneLine):
         self._attempt_parameters[0]["highest_must_appear_by"] = self._length
 
         outline_pitches = self._mode_resolver.get_outline_pitches(self._hexachord)
-        shuffle(outline_pitches)
+        self._random.shuffle(outline_pitches)
 
         self._attempt_parameters[0]["first_outline_pitch"] = outline_pitches[0]
         self._attempt_parameters[0]["second_outline_pitch"] = outline_pitches[1]
@@ -80,6 +79,6 @@ class ImitationThemeGenerator (FifthSpeciesCounterpointGenerator, OneLine):
     #override:
     #collect unlimited Cantus Firmus examples within 3500 backtracks
     def _exit_backtrack_loop(self) -> bool:
-        if self._number_of_backtracks > 3500 or (self._number_of_backtracks > 300 and len(self._solutions) == 0):
+        if self._number_of_backtracks > 3500 or (self._number_of_backtracks > 300 and self._number_of_solutions == 0):
             return True 
         return False 
\ No newline at end of file
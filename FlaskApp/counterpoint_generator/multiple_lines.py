@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -13,6 +12,9 @@ from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note
 from notation_system.mode_resolver import ModeResolver
 
 from base_class import CounterpointGenerator
+from node_context import NodeContext
+
+from filter_functions.beat_positions import build_dispatch_table
 
 from filter_functions.melodic_insertion_checks import begin_and_end_on_mode_final
 
@@ -29,13 +31,17 @@ class MultipleLines (CounterpointGenerator, ABC):
     #similarly, rhythmic filters must take into consideration the harmonic context
     _harmonic_rhythmic_filters = []
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    #the harmonic checks and filters for each index (see the base class)
+    _harmonic_insertion_checks_by_position = None
+    _harmonic_rhythmic_filters_by_position = None
+
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
         if len(lines) < 2:
             raise Exception("Multi-part Counterpoint must have at least two lines")
 
         if not self._lines_are_valid(lines):
             raise Exception("Invalid vocal ranges entered.  Either ranges were not in order or Soprano and Bass were adjacent")
-        super().__init__(length, lines, mode)
+        super().__init__(length, lines, mode, seed)
 
         self._legal_intervals["tonal_harmonic_consonant"] = { 1, 3, 5, 6 } #note that these are all mod 7 and absolute values 
         self._legal_intervals["chromatic_harmonic_consonant"] = { 0, 3, 4, 7, 8, 9 } #mod 12, absolute value
@@ -52,7 +58,7 @@ class MultipleLines (CounterpointGenerator, ABC):
     #override:
     #to pass the insertion checks, pitches must pass the melodic and harmonic insertion checks
     def _passes_insertion_checks(self, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-        for check in self._melodic_insertion_checks:
+        for check in self._melodic_insertion_checks_by_position[(bar, beat)]:
             if not check(self, pitch, line, bar, beat): 
                 if self._highest_index_reached == (line, bar, beat):
                     self._log.append(str(pitch) + " " + str((line, bar, beat)))
@@ -60,7 +66,7 @@ class MultipleLines (CounterpointGenerator, ABC):
                     # print(pitch)
                     # print("failed at check", check.__name__)
                 return False 
-        for check in self._harmonic_insertion_checks:
+        for check in self._harmonic_insertion_checks_by_position[(bar, beat)]:
             if not check(self, pitch, line, bar, beat): 
                 if self._highest_index_reached == (line, bar, beat):
                     self._log.append(str(pitch) + " " + str((line, bar, beat)))
@@ -70,11 +76,45 @@ class MultipleLines (CounterpointGenerator, ABC):
                 return False
         return True 
 
+    #override:
+    #builds the lists for the harmonic checks and filters as well
+    def _build_dispatch_tables(self) -> None:
+        super()._build_dispatch_tables()
+        self._harmonic_insertion_checks_by_position = build_dispatch_table(self._get_checks_to_dispatch(self._harmonic_insertion_checks), self._length)
+        self._harmonic_rhythmic_filters_by_position = build_dispatch_table(self._harmonic_rhythmic_filters, self._length)
+
+    #override:
+    #the harmonic checks and filters read the other lines
+    def _get_checks_by_dependency(self) -> tuple[list[callable], list[callable]]:
+        (own_line_checks, other_line_checks) = super()._get_checks_by_dependency()
+        return (own_line_checks, other_line_checks + self._harmonic_insertion_checks + self._harmonic_rhythmic_filters)
+
+    #override:
+    #the harmonic checks and filters read the line being filled as well
+    def _get_checks_reading_line(self) -> list[callable]:
+        return super()._get_checks_reading_line() + self._harmonic_insertion_checks + self._harmonic_rhythmic_filters
+
+    #override:
+    #the harmonic insertion checks may be reordered as well
+    def _get_orderable_checks(self) -> dict[str, list[callable]]:
+        orderable_checks = super()._get_orderable_checks()
+        orderable_checks["harmonic"] = self._harmonic_insertion_checks
+        return orderable_checks
+
+    #override:
+    #adds the harmonic context: the other line (in two-part examples) and the notes sounding in the other lines
+    def _get_node_context(self, line: int, bar: int, beat: float) -> NodeContext:
+        context = super()._get_node_context(line, bar, beat)
+        context.other_line = (line + 1) % 2
+        context.simultaneous_c_note = self._counterpoint_objects[context.other_line].get((bar, beat))
+        context.sounding_c_notes = [None if other_line == line else self._get_counterpoint_pitch(other_line, bar, beat) for other_line in range(self._height)]
+        return context
+
     #override:
     #likewise, durations must be filtered through harmonic checks as well
     def _get_valid_durations(self, pitch: Pitch, line: int, bar: int, beat: float) -> set[int]:
         durations = self._get_available_durations(line, bar, beat)
-        for check in self._rhythmic_insertion_filters:
+        for check in self._rhythmic_insertion_filters_by_position[(bar, beat)]:
             prev_len = len(durations)
             durations = check(self, pitch, line, bar, beat, durations)
             # if len(durations) != prev_len:
@@ -85,7 +125,7 @@ class MultipleLines (CounterpointGenerator, ABC):
                     self._log.append(str(pitch) + " " + str((line, bar, beat)))
                     self._log.append(check.__name__)
                 return durations
-        for check in self._harmonic_rhythmic_filters:
+        for check in self._harmonic_rhythmic_filters_by_position[(bar, beat)]:
             prev_len = len(durations)
             durations = check(self, pitch, line, bar, beat, durations)
             # if len(durations) != prev_len:
@@ -127,12 +167,13 @@ class MultipleLines (CounterpointGenerator, ABC):
 
     #follows same procedure but adds existing Cantus Firmus to lines
     def gnerate_counterpoint_from_cantus_firmus(self, cantus_firmus: list[RhythmicValue], line: int) -> None:
+        self._start_clock()
         self._number_of_attempts = 0
-        while not self._exit_attempt_loop():
+        while not self._exit_generation():
             self._number_of_attempts += 1
             self._initialize(cantus_firmus, line)
             self._backtrack()
-            print("number of solutions:", len(self._solutions), "number of backtracks:", self._number_of_backtracks)
+            print("number of solutions:", self._number_of_solutions, "number of backtracks:", self._number_of_backtracks)
         return 
             
     #override:
@@ -154,12 +195,4 @@ class MultipleLines (CounterpointGenerator, ABC):
 
     #helper function used in many of the filter functions
     def _is_consonant(self, pitch1: Pitch, pitch2: Pitch) -> bool:
-        (t_interval, c_interval) = pitch1.get_intervals(pitch2)
-        if ( abs(t_interval) % 7 not in self._legal_intervals["tonal_harmonic_consonant"] 
-            or abs(c_interval) % 12 not in self._legal_intervals["chromatic_harmonic_consonant"] 
-            or (abs(t_interval) % 7, abs(c_interval) % 12) in self._legal_intervals["forbidden_combinations"] ):
-            return False 
-        if ( (self._mode_resolver.is_sharp(pitch1) or self._mode_resolver.is_leading_tone(pitch1)) 
-            and (self._mode_resolver.is_sharp(pitch2) or self._mode_resolver.is_leading_tone(pitch2)) ):
-            return False
-        return True
\ No newline at end of file
+        return self._interval_tables["consonant"][pitch1.get_pitch_id()][pitch2.get_pitch_id()]
\ No newline at end of file
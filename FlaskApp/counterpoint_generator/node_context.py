@@ -0,0 +1,37 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.notational_entities import Pitch, RhythmicValue
+
+
+#facts about the current position in the backtracking algorithm that don't depend on the pitch being considered.
+#A NodeContext is computed once per node, before the candidate pitches are run through the insertion checks,
+#and is available to the checks as self._node_context
+class NodeContext:
+    __slots__ = ("line", "bar", "beat", "previous_entity", "previous_pitch", "second_previous_pitch", "previous_interval",
+        "other_line", "simultaneous_c_note", "sounding_c_notes")
+
+    def __init__(self, line: int, bar: int, beat: float, counterpoint_stack: list[RhythmicValue]):
+        self.line = line
+        self.bar = bar
+        self.beat = beat
+
+        #the last entity on the line's stack, and the last two entities if they are Pitches (otherwise None)
+        self.previous_entity = counterpoint_stack[-1] if len(counterpoint_stack) > 0 else None
+        self.previous_pitch = self.previous_entity if isinstance(self.previous_entity, Pitch) else None
+        self.second_previous_pitch = counterpoint_stack[-2] if len(counterpoint_stack) > 1 and isinstance(counterpoint_stack[-2], Pitch) else None
+
+        #the tonal interval between the last two entities, if they are both Pitches
+        self.previous_interval = None
+        if self.previous_pitch is not None and self.second_previous_pitch is not None:
+            self.previous_interval = self.second_previous_pitch.get_tonal_interval(self.previous_pitch)
+
+        #the following are only assigned in generators with multiple lines:
+        #the other line in two-part examples
+        self.other_line = None
+        #the entity in the other line with an onset at the current index (None if there is none)
+        self.simultaneous_c_note = None
+        #for each line, the Pitch sounding at the current index (None for the current line and for lines sounding a Rest)
+        self.sounding_c_notes = None
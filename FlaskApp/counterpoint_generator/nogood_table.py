@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+
+#a bounded table of (hashes of) search states that are known to lead to no solutions (nogoods), used by the backtracking algorithm
+#to skip subtrees it has already explored (see use_nogood_table).  When the table is full, the least recently used
+#state is discarded.  The hits and misses are counted so that the table's effect on the search can be measured
+class NogoodTable:
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._states = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    #determines whether a state is a known nogood, counting the lookup as a hit or a miss
+    def contains(self, state: int) -> bool:
+        if state in self._states:
+            self._states.move_to_end(state)
+            self._hits += 1
+            return True
+        self._misses += 1
+        return False
+
+    def add(self, state: int) -> None:
+        self._states[state] = True
+        self._states.move_to_end(state)
+        if len(self._states) > self._capacity:
+            self._states.popitem(last=False)
+
+    def get_hits(self) -> int: return self._hits
+
+    def get_misses(self) -> int: return self._misses
+
+    def get_size(self) -> int: return len(self._states)
+
+    def get_capacity(self) -> int: return self._capacity
+
+    def reset_counters(self) -> None:
+        self._hits = 0
+        self._misses = 0
+
+
+#converts a value built from lists, sets and dictionaries into an equivalent hashable value, so that it can form part of a state
+def get_canonical_form(value: object) -> object:
+    if isinstance(value, (list, tuple)):
+        return tuple([get_canonical_form(item) for item in value])
+    if isinstance(value, (set, frozenset)):
+        return frozenset([get_canonical_form(item) for item in value])
+    if isinstance(value, dict):
+        return tuple([(key, get_canonical_form(value[key])) for key in sorted(value)])
+    return value
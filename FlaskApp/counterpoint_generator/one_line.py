@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -32,10 +31,10 @@ from filter_functions.score_functions import penalize_perfect_intervals_on_downb
 
 class OneLine (CounterpointGenerator, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
         if len(lines) != 1:
             raise Exception("Solo Melody must only have one line")
-        super().__init__(length, lines, mode)
+        super().__init__(length, lines, mode, seed)
         self._melodic_insertion_checks.append(begin_and_end_on_mode_final)
 
         self._rhythmic_insertion_filters.append(end_on_breve)
@@ -55,13 +54,13 @@ class MultiPartCounterpoint (CounterpointGenerator, ABC):
     #similarly, rhythmic filters must take into consideration the harmonic context
     _harmonic_rhythmic_filters = []
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
         if len(lines) < 2:
             raise Exception("Multi-part Counterpoint must have at least two lines")
 
         if not self._lines_are_valid(lines):
             raise Exception("Invalid vocal ranges entered.  Either ranges were not in order or Soprano and Bass were adjacent")
-        super().__init__(length, lines, mode)
+        super().__init__(length, lines, mode, seed)
 
         self._legal_intervals["tonal_harmonic_consonant"] = { 1, 3, 5, 6 } #note that these are all mod 7 and absolute values 
         self._legal_intervals["chromatic_harmonic_consonant"] = { 0, 3, 4, 7, 8, 9 } #mod 12, absolute value
@@ -158,7 +157,7 @@ class MultiPartCounterpoint (CounterpointGenerator, ABC):
             self._number_of_attempts += 1
             self._initialize(cantus_firmus, line)
             self._backtrack()
-            print("number of solutions:", len(self._solutions), "number of backtracks:", self._number_of_backtracks)
+            print("number of solutions:", self._number_of_solutions, "number of backtracks:", self._number_of_backtracks)
         return 
             
     #override:
@@ -180,24 +179,16 @@ class MultiPartCounterpoint (CounterpointGenerator, ABC):
 
     #helper function used in many of the filter functions
     def _is_consonant(self, pitch1: Pitch, pitch2: Pitch) -> bool:
-        (t_interval, c_interval) = pitch1.get_intervals(pitch2)
-        if ( abs(t_interval) % 7 not in self._legal_intervals["tonal_harmonic_consonant"] 
-            or abs(c_interval) % 12 not in self._legal_intervals["chromatic_harmonic_consonant"] 
-            or (abs(t_interval) % 7, abs(c_interval) % 12) in self._legal_intervals["forbidden_combinations"] ):
-            return False 
-        if ( (self._mode_resolver.is_sharp(pitch1) or self._mode_resolver.is_leading_tone(pitch1)) 
-            and (self._mode_resolver.is_sharp(pitch2) or self._mode_resolver.is_leading_tone(pitch2)) ):
-            return False
-        return True
+        return self._interval_tables["consonant"][pitch1.get_pitch_id()][pitch2.get_pitch_id()]
             
 
 
 class TwoPartCounterpoint (MultiPartCounterpoint, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
         if len(lines) != 2:
             raise Exception("Two-part Counterpoint must have two lines")
-        super().__init__(length, lines, mode)
+        super().__init__(length, lines, mode, seed)
 
         self._rhythmic_insertion_filters.append(end_on_breve)
 
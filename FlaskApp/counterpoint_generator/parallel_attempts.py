@@ -0,0 +1,89 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.solution_encoding import dumps, loads
+
+
+#each worker process constructs its own generator when the process starts, from the class and arguments of the generator 
+#running the attempt loop, and takes on its settings (see _get_constructor and _get_search_settings), so that nothing but
+#plain data has to be sent to the workers however they are started.  The cancel event is shared by all of the workers and
+#tells them to abandon the attempts they are running
+_worker_generator = None
+_cancel_event = None
+
+def _initialize_worker(generator_class: type, args: tuple, kwargs: dict, settings: dict, cancel_event: object) -> None:
+    global _worker_generator, _cancel_event
+    _worker_generator = generator_class(*args, **kwargs)
+    _worker_generator._apply_search_settings(settings)
+    _cancel_event = cancel_event
+
+#runs a single attempt in a worker process and returns all of the solutions it finds, in their binary form (see 
+#solution_encoding.py), each paired with its score if score_solutions is set (and None otherwise).  The number of solutions 
+#found so far is passed in since the exit conditions of the backtracking algorithm may depend on it.  If the number of 
+#solutions kept is bounded, they are only bounded once they are merged.  Duplicate solutions are only dropped within the 
+#attempt, since the main process drops those of earlier attempts.  The cancel event is checked every nodes_between_checks 
+#nodes, and if it has been set the attempt is abandoned
+def _run_attempt(seed: int, attempt_number: int, number_of_solutions: int, score_solutions: bool, nodes_between_checks: int) -> list:
+    generator = _worker_generator
+    generator._random.seed(seed)
+    generator._solutions = []
+    generator._number_of_solutions = number_of_solutions
+    generator._top_solutions_limit = None
+    generator._solution_hashes = set()
+    generator._number_of_attempts = attempt_number
+    generator._initialize()
+    generator._begin_backtrack()
+    while not generator._resume_backtrack(nodes_between_checks):
+        if _cancel_event.is_set():
+            generator._unwind_backtrack()
+            return []
+    return [(dumps(sol), generator._score_solution(sol) if score_solutions else None) for sol in generator._solutions]
+
+#runs the attempt loop of a generator in a pool of worker processes (see generate_counterpoint_in_parallel).  Each attempt
+#is given its own seed, drawn from the generator's random number generator in the order the attempts are submitted, and
+#the results are merged in the same order, so the exit conditions of the attempt loop see the attempts exactly as they
+#would in a serial run
+def run_attempts_in_parallel(generator: object, max_workers: int = None, nodes_between_checks: int = 1000) -> None:
+    max_workers = max_workers or multiprocessing.cpu_count()
+    cancel_event = multiprocessing.Event()
+    generator._number_of_attempts = 0
+    #attempts are numbered from 1.  Finished attempts are held until all of the attempts before them have been merged
+    submitted, merged = 0, 0
+    pending, finished = {}, {}
+    generator_class, args, kwargs = generator._get_constructor()
+    initargs = (generator_class, args, kwargs, generator._get_search_settings(), cancel_event)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker, initargs=initargs) as executor:
+        while True:
+            #keep every worker busy while the attempt loop would continue
+            while len(pending) < max_workers:
+                generator._number_of_attempts = submitted
+                if generator._exit_generation():
+                    break
+                submitted += 1
+                future = executor.submit(_run_attempt, generator._random.randrange(2 ** 32), submitted, generator._number_of_solutions,
+                    generator._top_solutions_limit is not None, nodes_between_checks)
+                pending[future] = submitted
+            if len(pending) == 0:
+                break
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+            while merged + 1 in finished:
+                merged += 1
+                for encoded_solution, score in finished.pop(merged):
+                    sol = loads(encoded_solution)
+                    if not generator._is_duplicate_solution(sol):
+                        generator._add_solution(sol, score)
+            #once the attempt loop would have been exited after the attempts merged so far, the remaining attempts are cancelled
+            generator._number_of_attempts = merged
+            if generator._exit_generation():
+                cancel_event.set()
+                for future in pending:
+                    future.cancel()
+                break
+    generator._number_of_attempts = merged
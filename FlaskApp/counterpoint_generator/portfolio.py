@@ -0,0 +1,107 @@
+import random
+import multiprocessing
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.solution_encoding import dumps, loads
+
+#the attempt parameters that are left out of the race report, since they are derived from the others
+_UNREPORTED_ATTEMPT_PARAMETERS = { "available_pitches", "melodic_successors" }
+
+#the event that tells the racers in a worker process to give up, shared by all of the workers
+_cancel_event = None
+
+def _initialize_racer(cancel_event: object) -> None:
+    global _cancel_event
+    _cancel_event = cancel_event
+
+#runs a single racer: constructs a generator with the given seed and runs its attempt loop until it finds a solution, runs out
+#of attempts or is cancelled.  The cancel event is checked every nodes_between_checks nodes, and the solution is returned in
+#its binary form (see solution_encoding.py)
+def _race(generator_class: type, arguments: tuple, seed: int, nodes_between_checks: int) -> dict:
+    start = perf_counter()
+    generator = generator_class(*arguments, seed=seed)
+    cancelled = False
+    while len(generator._solutions) == 0:
+        if _cancel_event.is_set():
+            cancelled = True
+            break
+        if generator.generate_counterpoint_incrementally(nodes_between_checks):
+            break
+    attempt_parameters = [{ key: value for key, value in line_parameters.items() if key not in _UNREPORTED_ATTEMPT_PARAMETERS }
+        for line_parameters in generator._attempt_parameters]
+    return {
+        "seed": seed,
+        "solution": dumps(generator._solutions[0]) if len(generator._solutions) > 0 else None,
+        "cancelled": cancelled,
+        "attempts": generator._number_of_attempts or 0,
+        "time": perf_counter() - start,
+        "attempt_parameters": attempt_parameters
+    }
+
+#races independently seeded instances of a generator against each other in worker processes, and returns the first valid
+#solution found.  Once a racer has found one, the others are cancelled.  Time to the first solution varies a great deal
+#between seeds (some seeds spin through all of their attempts without finding anything), so racing several seeds makes it
+#much more predictable.  Unless the racers' seeds are given, they are drawn from a random number generator seeded with seed,
+#so that a race can be repeated.  Returns a dictionary with the solution (None if no racer found one), the winner and the
+#racers in the order of their seeds.  Each racer is reported with its seed, its status ("won", "cancelled", "exhausted" if it
+#ran out of attempts, "too late" if it found a solution after the winner or "not started" if it was still waiting for a
+#worker when the winner finished), its number of attempts, its running time and the attempt parameters of its last attempt
+#(see print_race_report)
+def race_generators(generator_class: type, arguments: tuple, number_of_racers: int = None, seeds: list[int] = None,
+    max_workers: int = None, nodes_between_checks: int = 1000, seed: int = None) -> dict:
+    if seeds is None:
+        seed_generator = random.Random(seed)
+        seeds = [seed_generator.randrange(2 ** 32) for racer in range(number_of_racers or multiprocessing.cpu_count())]
+    cancel_event = multiprocessing.Event()
+    racers, winner = [], None
+    with ProcessPoolExecutor(max_workers=max_workers or len(seeds), initializer=_initialize_racer, initargs=(cancel_event,)) as executor:
+        futures = { executor.submit(_race, generator_class, arguments, racer_seed, nodes_between_checks): racer_seed
+            for racer_seed in seeds }
+        for future in as_completed(futures):
+            if future.cancelled():
+                racers.append({ "seed": futures[future], "solution": None, "status": "not started", "attempts": 0, "time": 0,
+                    "attempt_parameters": [] })
+                continue
+            racer = future.result()
+            if racer["solution"] is not None:
+                racer["solution"] = loads(racer["solution"])
+                if winner is None:
+                    racer["status"] = "won"
+                    winner = racer
+                    cancel_event.set()
+                    #racers that haven't started yet are dropped, rather than started only to be cancelled
+                    for other_future in futures:
+                        other_future.cancel()
+                else:
+                    racer["status"] = "too late"
+            else:
+                racer["status"] = "cancelled" if racer["cancelled"] else "exhausted"
+            racers.append(racer)
+    racers.sort(key=lambda racer: seeds.index(racer["seed"]))
+    return { "solution": winner["solution"] if winner is not None else None, "winner": winner, "racers": racers }
+
+#prints how the winner of a race compared with the other racers: the seed, status, attempts and running time of each racer,
+#followed by the attempt parameters of each racer's last attempt, line by line
+def print_race_report(race: dict) -> None:
+    for racer in race["racers"]:
+        print("seed", str(racer["seed"]).ljust(12), racer["status"].ljust(11), "attempts:", str(racer["attempts"]).ljust(4),
+            "time:", round(racer["time"], 2))
+    racers = race["racers"]
+    for line in range(max([len(racer["attempt_parameters"]) for racer in racers], default=0)):
+        print("line", line)
+        keys = []
+        for racer in racers:
+            if line < len(racer["attempt_parameters"]):
+                keys += [key for key in racer["attempt_parameters"][line] if key not in keys]
+        for key in keys:
+            values = []
+            for racer in racers:
+                value = racer["attempt_parameters"][line].get(key) if line < len(racer["attempt_parameters"]) else None
+                values.append(("*" if racer is race["winner"] else "") + str(value))
+            print("   ", key.ljust(28), " | ".join(values))
@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+
+
+#a restart policy decides when the backtracking algorithm should give up on the attempt parameters it was given and
+#start again with new ones, within the same attempt (see use_restart_policy).  After max_restarts restarts, the
+#generator's usual exit conditions decide when the attempt ends
+class RestartPolicy (ABC):
+
+    def __init__(self, max_restarts: int):
+        self._max_restarts = max_restarts
+
+    def get_max_restarts(self) -> int: return self._max_restarts
+
+    #determines whether the generator should restart, given that it hasn't found a solution since it last restarted
+    @abstractmethod
+    def should_restart(self, generator: object) -> bool:
+        pass
+
+
+#restarts after a number of nodes that depends on how many times the generator has already restarted
+class NodeLimitRestarts (RestartPolicy, ABC):
+
+    def should_restart(self, generator: object) -> bool:
+        return generator._number_of_backtracks > self.get_node_limit(generator._number_of_restarts + 1)
+
+    #returns the number of nodes the specified run (numbered from 1) may visit
+    @abstractmethod
+    def get_node_limit(self, run_number: int) -> int:
+        pass
+
+
+#node limits follow the Luby sequence (1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...) multiplied by unit.  Most runs are short, but
+#every so often one is given twice as long as any before it, so parameters that need a long search eventually get one
+class LubyRestarts (NodeLimitRestarts):
+
+    def __init__(self, unit: int = 100, max_restarts: int = 30):
+        super().__init__(max_restarts)
+        self._unit = unit
+
+    def get_node_limit(self, run_number: int) -> int:
+        return self._unit * get_luby_number(run_number)
+
+
+#node limits grow by factor with every run, starting from initial_limit
+class GeometricRestarts (NodeLimitRestarts):
+
+    def __init__(self, initial_limit: int = 100, factor: float = 1.5, max_restarts: int = 10):
+        super().__init__(max_restarts)
+        self._initial_limit = initial_limit
+        self._factor = factor
+
+    def get_node_limit(self, run_number: int) -> int:
+        return int(self._initial_limit * self._factor ** (run_number - 1))
+
+
+#restarts once patience nodes have gone by without the search reaching an index further along than any it had reached
+#before, so that runs that are still making progress can go on as long as they need to
+class ProgressRestarts (RestartPolicy):
+
+    def __init__(self, patience: int = 200, max_restarts: int = 20):
+        super().__init__(max_restarts)
+        self._patience = patience
+
+    def should_restart(self, generator: object) -> bool:
+        return generator._number_of_backtracks - generator._node_of_last_progress > self._patience
+
+
+#returns the ith term (numbered from 1) of the Luby sequence
+def get_luby_number(i: int) -> int:
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return get_luby_number(i - (1 << (k - 1)) + 1)
@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -33,8 +32,8 @@ from filter_functions.final_checks import ascending_intervals_are_filled_in
 
 class SecondSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         self._melodic_insertion_checks.append(prevent_cross_relations_on_notes_separated_by_one_other_note)
         self._melodic_insertion_checks.append(enforce_interval_order_strict)
@@ -71,12 +70,12 @@ class SecondSpeciesCounterpointGenerator (CounterpointGenerator, ABC):
         for line in range(self._height):
             vocal_range = self._lines[line]
             #choose a range interval between a seventh and tenth and choose a highest and lowest note
-            range_size = randint(7, 10)
+            range_size = self._random.randint(7, 10)
             range_bottom = self._mode_resolver.get_lowest_of_range(vocal_range)
 
-            self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(range_bottom, randint(1, 13 - range_size))
+            self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(range_bottom, self._random.randint(1, 13 - range_size))
             self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["lowest"], range_size)
 
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
@@ -0,0 +1,204 @@
+import sqlite3
+import threading
+import uuid
+from time import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from contextlib import closing
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.notational_entities import RhythmicValue
+from notation_system.solution_encoding import dumps, loads
+
+#returns the key under which solutions are stored for a generator class constructed with the given arguments (e.g.
+#(11, [VocalRange.ALTO, VocalRange.SOPRANO], Mode.DORIAN)), such as "TwoPartFifthSpeciesGenerator|11|ALTO,SOPRANO|DORIAN"
+def get_configuration_key(generator_class: type, arguments: tuple) -> str:
+    return "|".join([generator_class.__name__] + [_describe_argument(argument) for argument in arguments])
+
+def _describe_argument(argument: object) -> str:
+    if isinstance(argument, (list, tuple)):
+        return ",".join([_describe_argument(item) for item in argument])
+    if isinstance(argument, Enum):
+        return argument.name
+    return str(argument)
+
+
+#a persistent corpus of generated solutions, stored in an SQLite file and keyed by generator configuration (the generator
+#class and the arguments it is constructed with), so that configurations that are requested over and over don't have to be
+#generated from scratch each time.  Each solution is stored once, in its binary form (see solution_encoding.py), with its
+#score, and is served at most once, best scores first.  When the supply of unserved solutions for a configuration falls
+#below low_water_mark, the corpus tops it up in a worker process (at most max_top_up_workers of them, so that the generator
+#doesn't compete with the calling process for the GIL) until there are at least target_supply, running the generator at most
+#max_top_up_runs times.  The solutions of each run are stored as soon as it finishes, and the workers are waited for when
+#the calling process exits, so finished runs are never lost.  The file may be shared by any number of processes, and only
+#one of them tops up a configuration at a time: the top-up is claimed with a lease, stored in the file, that is renewed
+#before each run of the generator and expires after lease_duration seconds if the process holding it dies (so it should be
+#longer than a run of the generator takes)
+class SolutionCorpus:
+
+    def __init__(self, path: str, low_water_mark: int = 10, target_supply: int = 50, max_top_up_runs: int = 10,
+        lease_duration: float = 600, max_top_up_workers: int = None):
+        self._path = path
+        self._low_water_mark = low_water_mark
+        self._target_supply = target_supply
+        self._max_top_up_runs = max_top_up_runs
+        self._lease_duration = lease_duration
+        self._max_top_up_workers = max_top_up_workers
+
+        #the worker processes that run the top-ups, started when the first one is needed, and the top-ups running in them,
+        #by configuration key
+        self._executor = None
+        self._top_up_futures = {}
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS solutions (
+                id INTEGER PRIMARY KEY,
+                configuration TEXT NOT NULL,
+                solution BLOB NOT NULL,
+                score INTEGER NOT NULL,
+                served INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (configuration, solution)
+            )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS unserved_solutions ON solutions (configuration, served, score)")
+            connection.execute("""CREATE TABLE IF NOT EXISTS top_ups (
+                configuration TEXT PRIMARY KEY,
+                claimed_by TEXT NOT NULL,
+                claimed_until REAL NOT NULL
+            )""")
+
+    #returns the best scored solution that hasn't been served yet.  Only waits for the generator if there isn't one (on a
+    #cold start, or when requests outpace the top-ups): then it is run here, up to max_top_up_runs times, until it has found
+    #a solution that can be served.  Returns None only if none of those runs found anything new, so callers must be ready
+    #for that.  Starts a top-up if the supply has run low, so that later calls can be served without waiting
+    def get_solution(self, generator_class: type, arguments: tuple) -> list[list[RhythmicValue]]:
+        configuration = get_configuration_key(generator_class, arguments)
+        solution = self._take_solution(configuration)
+        for run in range(self._max_top_up_runs):
+            if solution is not None:
+                break
+            self.fill(generator_class, arguments)
+            solution = self._take_solution(configuration)
+        self._top_up_if_low(generator_class, arguments)
+        return solution
+
+    #returns the number of solutions stored for the configuration that haven't been served yet
+    def count_unserved_solutions(self, generator_class: type, arguments: tuple) -> int:
+        configuration = get_configuration_key(generator_class, arguments)
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM solutions WHERE configuration = ? AND served = 0",
+                (configuration,)).fetchone()[0]
+
+    #runs the generator once and stores the solutions it finds, with their scores.  Returns the number of solutions that
+    #weren't already stored
+    def fill(self, generator_class: type, arguments: tuple, seed: int = None) -> int:
+        generator = generator_class(*arguments, seed=seed)
+        generator.generate_counterpoint()
+        return self.add_solutions(generator_class, arguments, generator.get_all_solutions(), generator.get_solution_scores())
+
+    #stores solutions for the configuration, with their scores, skipping any that are already stored.  Returns the number
+    #of solutions added
+    def add_solutions(self, generator_class: type, arguments: tuple, solutions: list[list[list[RhythmicValue]]],
+        scores: list[int]) -> int:
+        configuration = get_configuration_key(generator_class, arguments)
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            changes_before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO solutions (configuration, solution, score) VALUES (?, ?, ?)",
+                [(configuration, dumps(solution), score) for solution, score in zip(solutions, scores)])
+            added = connection.total_changes - changes_before
+            connection.execute("COMMIT")
+        return added
+
+    #starts topping up the supply of the configuration in a worker process, unless a top-up of it is already running, in
+    #this process or another one.  Returns whether one was started.  The generator class must be picklable
+    def top_up_in_background(self, generator_class: type, arguments: tuple) -> bool:
+        configuration = get_configuration_key(generator_class, arguments)
+        claim = self._claim_top_up(configuration)
+        if claim is None:
+            return False
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_top_up_workers)
+            future = self._executor.submit(_run_top_up, self._path, self._target_supply, self._max_top_up_runs,
+                self._lease_duration, generator_class, arguments, claim)
+            self._top_up_futures[configuration] = future
+        #the worker releases the claim itself, but if it dies the claim would otherwise be held until its lease expires
+        future.add_done_callback(lambda future: self._release_top_up(configuration, claim))
+        return True
+
+    #waits for all of the top-ups started by this corpus to finish, raising the error of any that failed
+    def wait_for_top_ups(self) -> None:
+        with self._lock:
+            futures = list(self._top_up_futures.values())
+        for future in futures:
+            future.result()
+
+    #marks the best scored solution of the configuration that hasn't been served yet as served and returns it, or returns None
+    #if there isn't one
+    def _take_solution(self, configuration: str) -> list[list[RhythmicValue]]:
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("""SELECT id, solution FROM solutions WHERE configuration = ? AND served = 0
+                ORDER BY score, id LIMIT 1""", (configuration,)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE solutions SET served = 1 WHERE id = ?", (row[0],))
+            connection.execute("COMMIT")
+        return loads(row[1]) if row is not None else None
+
+    def _top_up_if_low(self, generator_class: type, arguments: tuple) -> None:
+        if self.count_unserved_solutions(generator_class, arguments) < self._low_water_mark:
+            self.top_up_in_background(generator_class, arguments)
+
+    def _top_up(self, generator_class: type, arguments: tuple, claim: str) -> None:
+        configuration = get_configuration_key(generator_class, arguments)
+        try:
+            for run in range(self._max_top_up_runs):
+                if self.count_unserved_solutions(generator_class, arguments) >= self._target_supply:
+                    return
+                if not self._renew_top_up(configuration, claim):
+                    return
+                self.fill(generator_class, arguments)
+        finally:
+            self._release_top_up(configuration, claim)
+
+    #claims the top-up of the configuration, unless another claim on it hasn't expired.  Returns the new claim, or None
+    def _claim_top_up(self, configuration: str) -> str:
+        claim = uuid.uuid4().hex
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT claimed_until FROM top_ups WHERE configuration = ?", (configuration,)).fetchone()
+            if row is not None and row[0] > time():
+                connection.execute("COMMIT")
+                return None
+            connection.execute("INSERT OR REPLACE INTO top_ups (configuration, claimed_by, claimed_until) VALUES (?, ?, ?)",
+                (configuration, claim, time() + self._lease_duration))
+            connection.execute("COMMIT")
+        return claim
+
+    #extends the lease of a claim.  Returns False if the claim has been lost (it expired and another process claimed the
+    #top-up in the meantime)
+    def _renew_top_up(self, configuration: str, claim: str) -> bool:
+        with closing(self._connect()) as connection:
+            cursor = connection.execute("UPDATE top_ups SET claimed_until = ? WHERE configuration = ? AND claimed_by = ?",
+                (time() + self._lease_duration, configuration, claim))
+            return cursor.rowcount == 1
+
+    def _release_top_up(self, configuration: str, claim: str) -> None:
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM top_ups WHERE configuration = ? AND claimed_by = ?", (configuration, claim))
+
+    #connections are opened for each operation, so that the corpus can be shared between threads and processes.
+    #Transactions are begun explicitly
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30, isolation_level=None)
+
+#runs a top-up in a worker process, with a corpus of its own on the same file
+def _run_top_up(path: str, target_supply: int, max_top_up_runs: int, lease_duration: float, generator_class: type,
+    arguments: tuple, claim: str) -> None:
+    corpus = SolutionCorpus(path, target_supply=target_supply, max_top_up_runs=max_top_up_runs, lease_duration=lease_duration)
+    corpus._top_up(generator_class, arguments, claim)
@@ -0,0 +1,64 @@
+import io
+import contextlib
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Note, Rest, Mode, VocalRange
+from cantus_firmus import CantusFirmusGenerator
+
+ARGUMENTS = (10, [VocalRange.ALTO], Mode.DORIAN)
+
+def generate(generator: CantusFirmusGenerator) -> CantusFirmusGenerator:
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_counterpoint()
+    return generator
+
+def test_top_solutions_are_kept_in_order():
+    generator = CantusFirmusGenerator(*ARGUMENTS, seed=1)
+    generator.use_top_solutions(3)
+    for name, score in [("a", 30), ("b", 10), ("c", 20), ("d", 10), ("e", 40), ("f", 5)]:
+        generator._add_solution(name, score)
+    #ties keep the solution added first, and the worst are evicted once there are more than k
+    assert generator.get_all_solutions() == ["f", "b", "d"]
+    assert generator.get_solution_scores() == [5, 10, 10]
+    assert generator.get_number_of_solutions_found() == 6
+
+def test_top_solutions_match_scoring_all_solutions():
+    generator = generate(CantusFirmusGenerator(*ARGUMENTS, seed=1))
+    generator.score_solutions()
+    bounded_generator = CantusFirmusGenerator(*ARGUMENTS, seed=1)
+    bounded_generator.use_top_solutions(5)
+    generate(bounded_generator)
+    assert bounded_generator.get_number_of_solutions_found() == len(generator.get_all_solutions())
+    assert bounded_generator.get_solution_scores() == generator.get_solution_scores()[:5]
+    assert bounded_generator.get_all_solutions() == generator.get_all_solutions()[:5]
+
+SOLUTION = [[Note(8, 2, 4), Note(8, 4, 4), Note(16, 2, 4)]]
+
+def test_duplicate_solutions_are_detected():
+    generator = CantusFirmusGenerator(*ARGUMENTS, seed=1)
+    assert not generator._is_duplicate_solution(SOLUTION)
+    #a copy built from separate lists is still a duplicate
+    assert generator._is_duplicate_solution([SOLUTION[0][:]])
+    assert not generator._is_duplicate_solution([[Note(8, 2, 4), Note(8, 5, 4), Note(16, 2, 4)]])
+    assert not generator._is_duplicate_solution([[Rest(8), Note(8, 4, 4), Note(16, 2, 4)]])
+    assert not generator._is_duplicate_solution([[Note(4, 2, 4), Note(8, 4, 4), Note(16, 2, 4)]])
+    assert generator.get_number_of_duplicate_solutions() == 1
+
+def test_duplicates_are_kept_without_deduplication():
+    generator = CantusFirmusGenerator(*ARGUMENTS, seed=1)
+    generator.use_solution_deduplication(False)
+    assert not generator._is_duplicate_solution(SOLUTION)
+    assert not generator._is_duplicate_solution(SOLUTION)
+    assert generator.get_number_of_duplicate_solutions() == 0
+
+def test_generated_solutions_are_unique():
+    generator = generate(CantusFirmusGenerator(*ARGUMENTS, seed=1))
+    solutions = generator.get_all_solutions()
+    assert len(set([tuple([tuple(line) for line in solution]) for solution in solutions])) == len(solutions)
+    found = generator.get_number_of_solutions_found() + generator.get_number_of_duplicate_solutions()
+    assert generator.get_duplicate_rate() == generator.get_number_of_duplicate_solutions() / found
@@ -0,0 +1,45 @@
+import io
+import contextlib
+import pytest
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, Mode, VocalRange
+from filter_functions.batch_score_functions import pack_solution
+from cantus_firmus import CantusFirmusGenerator
+from two_part_fifth_species import TwoPartFifthSpeciesGenerator
+
+CONFIGURATIONS = [
+    (CantusFirmusGenerator, (11, [VocalRange.ALTO], Mode.DORIAN)),
+    (TwoPartFifthSpeciesGenerator, (9, [VocalRange.ALTO, VocalRange.SOPRANO], Mode.DORIAN))
+]
+
+@pytest.fixture(scope="module", params=CONFIGURATIONS, ids=lambda configuration: configuration[0].__name__)
+def generator(request):
+    generator_class, arguments = request.param
+    generator = generator_class(*arguments, seed=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_counterpoint()
+    assert len(generator.get_all_solutions()) > 0
+    return generator
+
+def test_batch_scores_match_scores_on_the_stack(generator):
+    solutions = generator.get_all_solutions()
+    assert generator._score_solutions_in_batch(solutions) == [generator._score_solution(sol) for sol in solutions]
+
+#the packed form is read in place of the stack, so it must agree with what the stack's own dictionaries hold
+def test_packed_solutions_match_the_stack(generator):
+    for sol in generator.get_all_solutions():
+        generator._map_solution_onto_stack(sol)
+        for line, packed_line in enumerate(pack_solution(sol)):
+            stack = generator._counterpoint_stacks[line]
+            assert packed_line["is_pitch"] == [isinstance(entity, Pitch) for entity in stack]
+            for i, interval in enumerate(packed_line["intervals"]):
+                if isinstance(stack[i], Pitch) and isinstance(stack[i + 1], Pitch):
+                    assert interval == stack[i].get_tonal_interval(stack[i + 1])
+            for bar in range(generator._length):
+                assert packed_line["downbeats"].get(bar) is generator._counterpoint_objects[line].get((bar, 0))
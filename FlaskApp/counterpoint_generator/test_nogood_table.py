@@ -0,0 +1,90 @@
+import io
+import contextlib
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, Mode, VocalRange
+from nogood_table import NogoodTable, get_canonical_form
+from two_part_second_species import TwoPartSecondSpeciesGenerator
+from cantus_firmus import CantusFirmusGenerator
+
+def test_hits_and_misses_are_counted():
+    table = NogoodTable(10)
+    table.add(1)
+    assert table.contains(1)
+    assert not table.contains(2)
+    assert table.contains(1)
+    assert (table.get_hits(), table.get_misses()) == (2, 1)
+    table.reset_counters()
+    assert (table.get_hits(), table.get_misses()) == (0, 0)
+    assert table.contains(1)
+
+def test_least_recently_used_state_is_evicted():
+    table = NogoodTable(3)
+    for state in [1, 2, 3]:
+        table.add(state)
+    #looking 1 up makes 2 the least recently used
+    assert table.contains(1)
+    table.add(4)
+    assert table.get_size() == 3
+    assert not table.contains(2)
+    assert all([table.contains(state) for state in [1, 3, 4]])
+
+def test_adding_a_state_again_refreshes_it():
+    table = NogoodTable(2)
+    table.add(1)
+    table.add(2)
+    table.add(1)
+    table.add(3)
+    assert table.contains(1)
+    assert not table.contains(2)
+    assert table.get_size() == table.get_capacity() == 2
+
+def test_canonical_form():
+    value = { "b": [1, { 2, 3 }], "a": { "c": (4, [5]) } }
+    same_value = { "a": { "c": [4, (5,)] }, "b": (1, frozenset([3, 2])) }
+    assert get_canonical_form(value) == get_canonical_form(same_value)
+    assert hash(get_canonical_form(value)) == hash(get_canonical_form(same_value))
+
+#the states are bounded, so the search comes back to states it has recorded
+def test_generator_hits_the_table():
+    generator = TwoPartSecondSpeciesGenerator(10, [VocalRange.TENOR, VocalRange.ALTO], Mode.AEOLIAN, seed=1)
+    generator.use_nogood_table()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_counterpoint()
+    assert generator.get_nogood_table().get_hits() > 0
+    assert generator.get_nogood_table().get_size() > 0
+
+#searches a single attempt exhaustively, so that the solutions found don't depend on the order of the search 
+class ExhaustiveCantusFirmusGenerator(CantusFirmusGenerator):
+    def _exit_backtrack_loop(self) -> bool:
+        return False 
+
+    def _exit_attempt_loop(self) -> bool:
+        return self._number_of_attempts >= 1
+
+def get_solution_set(generator: CantusFirmusGenerator) -> set:
+    return set([tuple([(entity.get_pitch_id() if isinstance(entity, Pitch) else None, entity.get_duration()) for entity in sol[0]]) 
+        for sol in generator.get_all_solutions()])
+
+#the checks that scan back through the whole line (such as goes_up_after_third_appearance_of_note and the final checks)
+#are summarized in the states, so skipping nogoods never loses a solution
+def test_nogood_table_finds_every_solution():
+    hits = 0
+    for seed in [2, 4, 7]:
+        solution_sets = []
+        for use_nogood_table in [False, True]:
+            generator = ExhaustiveCantusFirmusGenerator(11, [VocalRange.ALTO], Mode.DORIAN, seed=seed)
+            if use_nogood_table:
+                generator.use_nogood_table()
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.generate_counterpoint()
+            solution_sets.append(get_solution_set(generator))
+        assert len(solution_sets[0]) > 0
+        assert solution_sets[0] == solution_sets[1]
+        hits += generator.get_nogood_table().get_hits()
+    assert hits > 0
@@ -0,0 +1,25 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Mode, VocalRange
+from portfolio import race_generators
+from cantus_firmus import CantusFirmusGenerator
+
+ARGUMENTS = (11, [VocalRange.ALTO], Mode.DORIAN)
+
+def test_races_with_the_same_seed_use_the_same_racers():
+    race = race_generators(CantusFirmusGenerator, ARGUMENTS, number_of_racers=4, max_workers=2, seed=5)
+    other_race = race_generators(CantusFirmusGenerator, ARGUMENTS, number_of_racers=4, max_workers=2, seed=5)
+    assert [racer["seed"] for racer in race["racers"]] == [racer["seed"] for racer in other_race["racers"]]
+
+#racers still waiting for a worker when the winner finishes are reported as not started
+def test_race_has_one_winner():
+    race = race_generators(CantusFirmusGenerator, ARGUMENTS, number_of_racers=6, max_workers=2, seed=5)
+    assert len(race["racers"]) == 6
+    assert [racer["status"] for racer in race["racers"]].count("won") == 1
+    assert race["solution"] is race["winner"]["solution"]
+    assert len(race["solution"]) == 1 and len(race["solution"][0]) == ARGUMENTS[0]
+    assert all([racer["status"] in { "won", "cancelled", "too late", "not started" } for racer in race["racers"]])
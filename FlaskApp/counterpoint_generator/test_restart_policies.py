@@ -0,0 +1,37 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+sys.path.insert(0, current_dir)
+
+from restart_policies import LubyRestarts, GeometricRestarts, ProgressRestarts, get_luby_number
+
+#stands in for a generator, holding the counters the policies read
+class SearchCounters:
+    def __init__(self, number_of_backtracks: int, number_of_restarts: int = 0, node_of_last_progress: int = 0):
+        self._number_of_backtracks = number_of_backtracks
+        self._number_of_restarts = number_of_restarts
+        self._node_of_last_progress = node_of_last_progress
+
+def test_luby_sequence():
+    assert [get_luby_number(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+def test_luby_node_limits():
+    policy = LubyRestarts(unit=50, max_restarts=7)
+    assert [policy.get_node_limit(run) for run in range(1, 8)] == [50, 50, 100, 50, 50, 100, 200]
+    assert policy.get_max_restarts() == 7
+
+def test_geometric_node_limits():
+    policy = GeometricRestarts(initial_limit=100, factor=1.5)
+    assert [policy.get_node_limit(run) for run in range(1, 6)] == [100, 150, 225, 337, 506]
+
+#the limit of the run after the restarts made so far applies
+def test_node_limit_restarts():
+    policy = LubyRestarts(unit=100)
+    assert not policy.should_restart(SearchCounters(100, number_of_restarts=0))
+    assert policy.should_restart(SearchCounters(101, number_of_restarts=0))
+    assert not policy.should_restart(SearchCounters(200, number_of_restarts=2))
+    assert policy.should_restart(SearchCounters(201, number_of_restarts=2))
+
+def test_progress_restarts():
+    policy = ProgressRestarts(patience=200)
+    assert not policy.should_restart(SearchCounters(1000, node_of_last_progress=800))
+    assert policy.should_restart(SearchCounters(1001, node_of_last_progress=800))
@@ -0,0 +1,145 @@
+import io
+import contextlib
+from time import perf_counter
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, Mode, VocalRange
+from cantus_firmus import CantusFirmusGenerator
+
+ARGUMENTS = (10, [VocalRange.ALTO], Mode.DORIAN)
+
+#searches each attempt exhaustively, so that the solutions found don't depend on the order of the search, and makes
+#number_of_attempts attempts
+class ExhaustiveCantusFirmusGenerator(CantusFirmusGenerator):
+    number_of_attempts = 1
+
+    def _exit_backtrack_loop(self) -> bool:
+        return False
+
+    def _exit_attempt_loop(self) -> bool:
+        return self._number_of_attempts >= self.number_of_attempts
+
+def generate(generator: CantusFirmusGenerator, method: str = "generate_counterpoint", **kwargs) -> CantusFirmusGenerator:
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(generator, method)(**kwargs)
+    return generator
+
+def get_solution_key(sol: list) -> tuple:
+    return tuple([tuple([(entity.get_pitch_id() if isinstance(entity, Pitch) else None, entity.get_duration()) for entity in line])
+        for line in sol])
+
+def get_solution_set(generator: CantusFirmusGenerator) -> set:
+    return set([get_solution_key(sol) for sol in generator.get_all_solutions()])
+
+#forward checking only skips candidates that can't lead to a solution
+def test_forward_checking_finds_the_same_solutions():
+    for seed in [2, 3]:
+        generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed))
+        forward_checking_generator = ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed)
+        forward_checking_generator.use_forward_checking()
+        generate(forward_checking_generator)
+        assert len(generator.get_all_solutions()) > 0
+        assert get_solution_set(forward_checking_generator) == get_solution_set(generator)
+        assert forward_checking_generator._number_of_nodes_visited < generator._number_of_nodes_visited
+
+#backjumping only skips placements that couldn't have changed the outcome
+def test_backjumping_finds_the_same_solutions():
+    for seed in [2, 3]:
+        generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed))
+        backjumping_generator = ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed)
+        backjumping_generator.use_backjumping()
+        generate(backjumping_generator)
+        assert len(generator.get_all_solutions()) > 0
+        assert get_solution_set(backjumping_generator) == get_solution_set(generator)
+
+class TwoAttemptCantusFirmusGenerator(ExhaustiveCantusFirmusGenerator):
+    number_of_attempts = 2
+
+#each attempt run in parallel is seeded from the generator's random number generator, so the solutions must be those of
+#the same attempts run one at a time, each found once
+def test_parallel_attempts_find_the_solutions_of_their_serial_attempts():
+    for seed in [1, 2]:
+        generator = generate(TwoAttemptCantusFirmusGenerator(*ARGUMENTS, seed=seed), "generate_counterpoint_in_parallel", max_workers=2)
+        seed_generator = TwoAttemptCantusFirmusGenerator(*ARGUMENTS, seed=seed).get_random_number_generator()
+        expected_solutions = set()
+        for attempt_seed in [seed_generator.randrange(2 ** 32) for attempt in range(2)]:
+            serial_generator = ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed)
+            serial_generator.get_random_number_generator().seed(attempt_seed)
+            expected_solutions |= get_solution_set(generate(serial_generator))
+        keys = [get_solution_key(sol) for sol in generator.get_all_solutions()]
+        assert len(keys) > 0
+        assert len(set(keys)) == len(keys)
+        assert set(keys) == expected_solutions
+
+class EndlessCantusFirmusGenerator(ExhaustiveCantusFirmusGenerator):
+    def _exit_attempt_loop(self) -> bool:
+        return False
+
+#the clock is only checked every so many nodes, so the search may overrun its budget slightly
+def test_time_budgets_stop_the_search():
+    generator = EndlessCantusFirmusGenerator(14, [VocalRange.ALTO], Mode.DORIAN, seed=1)
+    generator.use_time_budget(0.25)
+    start = perf_counter()
+    generate(generator)
+    assert perf_counter() - start < 0.35
+    assert generator.ran_out_of_time()
+    generator = EndlessCantusFirmusGenerator(14, [VocalRange.ALTO], Mode.DORIAN, seed=1)
+    generator.use_time_budget(time_limit=0.5, attempt_time_limit=0.1)
+    start = perf_counter()
+    generate(generator)
+    assert perf_counter() - start < 0.6
+    assert generator._number_of_attempts >= 3
+
+#records the incremental costs of the notes and rests, in the order they are tried
+class CostRecordingCantusFirmusGenerator(ExhaustiveCantusFirmusGenerator):
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
+        self.recorded_costs = []
+
+    def _order_by_incremental_cost(self, notes_and_rests: list, line: int, bar: int, beat: float) -> None:
+        super()._order_by_incremental_cost(notes_and_rests, line, bar, beat)
+        cost_functions = [check.incremental_cost for check in self._score_functions if hasattr(check, "incremental_cost")]
+        self.recorded_costs.append([sum([cost_function(self, entity, line, bar, beat) for cost_function in cost_functions]) 
+            for entity in notes_and_rests])
+
+#ordering changes which solutions are found first, but not which solutions there are
+def test_score_guided_ordering_tries_the_cheapest_first():
+    generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=2))
+    for temperature in [0, 1]:
+        guided_generator = CostRecordingCantusFirmusGenerator(*ARGUMENTS, seed=2)
+        guided_generator.use_score_guided_ordering(temperature)
+        generate(guided_generator)
+        assert get_solution_set(guided_generator) == get_solution_set(generator)
+        if temperature == 0:
+            assert len(guided_generator.recorded_costs) > 0
+            assert all([costs == sorted(costs) for costs in guided_generator.recorded_costs])
+
+#branch and bound only prunes branches whose scores can't beat the best so far, so it must find the best score there is
+def test_branch_and_bound_finds_the_best_score():
+    for seed in [2, 3]:
+        generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed))
+        optimizing_generator = ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed)
+        optimizing_generator.use_branch_and_bound()
+        generate(optimizing_generator)
+        best_score = min(generator.get_solution_scores())
+        assert optimizing_generator.get_best_score() == best_score
+        assert optimizing_generator._score_solution(optimizing_generator.get_all_solutions()[-1]) == best_score
+        assert optimizing_generator._number_of_nodes_visited < generator._number_of_nodes_visited
+
+#the beam search runs in the same attempt as the backtracking algorithm would, so every solution it finds must be one
+#that the exhaustive search finds too
+def test_beam_search_finds_valid_unique_solutions():
+    for seed in [2, 3]:
+        generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed))
+        beam_generator = generate(ExhaustiveCantusFirmusGenerator(*ARGUMENTS, seed=seed), "generate_counterpoint_with_beam_search", width=5)
+        keys = [get_solution_key(sol) for sol in beam_generator.get_all_solutions()]
+        assert len(keys) > 0
+        assert len(set(keys)) == len(keys)
+        assert set(keys) <= get_solution_set(generator)
+        #the solutions were found by the beam rather than by falling back to backtracking
+        assert beam_generator._number_of_nodes_visited < generator._number_of_nodes_visited
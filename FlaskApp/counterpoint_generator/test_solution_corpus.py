@@ -0,0 +1,122 @@
+import io
+import sqlite3
+import contextlib
+from contextlib import closing
+import pytest
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Note, Rest, Mode, VocalRange
+from solution_corpus import SolutionCorpus, get_configuration_key
+from cantus_firmus import CantusFirmusGenerator
+
+ARGUMENTS = (10, [VocalRange.ALTO], Mode.DORIAN)
+
+#a generator that finds the same three solutions every time it runs
+class FixedGenerator:
+    SOLUTIONS = [[[Note(8, 2, 4), Note(16, 2, 4)]], [[Rest(8), Note(16, 2, 4)]], [[Note(8, 3, 4), Note(16, 2, 4)]]]
+    SCORES = [20, 10, 30]
+
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        pass
+
+    def generate_counterpoint(self) -> None:
+        pass
+
+    def get_all_solutions(self) -> list:
+        return self.SOLUTIONS
+
+    def get_solution_scores(self) -> list[int]:
+        return self.SCORES
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "corpus.sqlite")
+
+def test_configuration_key():
+    assert get_configuration_key(CantusFirmusGenerator, ARGUMENTS) == "CantusFirmusGenerator|10|ALTO|DORIAN"
+
+def test_solutions_are_stored_once(path):
+    corpus = SolutionCorpus(path)
+    assert corpus.add_solutions(FixedGenerator, ARGUMENTS, FixedGenerator.SOLUTIONS, FixedGenerator.SCORES) == 3
+    assert corpus.add_solutions(FixedGenerator, ARGUMENTS, FixedGenerator.SOLUTIONS, FixedGenerator.SCORES) == 0
+    assert corpus.count_unserved_solutions(FixedGenerator, ARGUMENTS) == 3
+
+def test_configurations_are_kept_apart(path):
+    corpus = SolutionCorpus(path)
+    corpus.add_solutions(FixedGenerator, ARGUMENTS, FixedGenerator.SOLUTIONS, FixedGenerator.SCORES)
+    assert corpus.count_unserved_solutions(FixedGenerator, (10, [VocalRange.ALTO], Mode.AEOLIAN)) == 0
+
+#a low water mark of zero means no top-ups are started
+def test_solutions_are_served_once_best_first(path):
+    corpus = SolutionCorpus(path, low_water_mark=0)
+    corpus.add_solutions(FixedGenerator, ARGUMENTS, FixedGenerator.SOLUTIONS, FixedGenerator.SCORES)
+    served = [corpus.get_solution(FixedGenerator, ARGUMENTS) for i in range(4)]
+    assert served == [FixedGenerator.SOLUTIONS[1], FixedGenerator.SOLUTIONS[0], FixedGenerator.SOLUTIONS[2], None]
+    assert corpus.count_unserved_solutions(FixedGenerator, ARGUMENTS) == 0
+    #served solutions aren't added again 
+    assert corpus.add_solutions(FixedGenerator, ARGUMENTS, FixedGenerator.SOLUTIONS, FixedGenerator.SCORES) == 0
+
+#a generator that never finds anything
+class EmptyGenerator (FixedGenerator):
+    SOLUTIONS, SCORES = [], []
+
+#a generator that finds one solution, scored with the id of the process that ran it
+class ProcessIdGenerator (FixedGenerator):
+
+    def get_all_solutions(self) -> list:
+        return self.SOLUTIONS[:1]
+
+    def get_solution_scores(self) -> list[int]:
+        return [os.getpid()]
+
+def test_empty_corpus_generates_before_serving(path):
+    corpus = SolutionCorpus(path, low_water_mark=0)
+    assert corpus.get_solution(FixedGenerator, ARGUMENTS) == FixedGenerator.SOLUTIONS[1]
+    assert corpus.count_unserved_solutions(FixedGenerator, ARGUMENTS) == 2
+
+def test_none_is_served_when_the_generator_finds_nothing(path):
+    corpus = SolutionCorpus(path, low_water_mark=0, max_top_up_runs=2)
+    assert corpus.get_solution(EmptyGenerator, ARGUMENTS) is None
+
+def test_top_ups_run_in_another_process(path):
+    corpus = SolutionCorpus(path, low_water_mark=1, target_supply=1)
+    assert corpus.top_up_in_background(ProcessIdGenerator, ARGUMENTS)
+    corpus.wait_for_top_ups()
+    with closing(sqlite3.connect(path)) as connection:
+        scores = [row[0] for row in connection.execute("SELECT score FROM solutions")]
+    assert len(scores) == 1 and scores[0] != os.getpid()
+    #the claim is released once the top-up is done
+    assert corpus._claim_top_up(get_configuration_key(ProcessIdGenerator, ARGUMENTS)) is not None
+
+def test_top_ups_are_claimed_once_across_corpora(path):
+    corpus, other_corpus = SolutionCorpus(path), SolutionCorpus(path)
+    configuration = get_configuration_key(FixedGenerator, ARGUMENTS)
+    claim = corpus._claim_top_up(configuration)
+    assert claim is not None
+    assert not other_corpus.top_up_in_background(FixedGenerator, ARGUMENTS)
+    corpus._release_top_up(configuration, claim)
+    assert other_corpus.top_up_in_background(FixedGenerator, ARGUMENTS)
+    other_corpus.wait_for_top_ups()
+    assert other_corpus.count_unserved_solutions(FixedGenerator, ARGUMENTS) == 3
+
+def test_expired_claims_can_be_taken_over(path):
+    corpus, other_corpus = SolutionCorpus(path, lease_duration=0), SolutionCorpus(path)
+    configuration = get_configuration_key(FixedGenerator, ARGUMENTS)
+    claim = corpus._claim_top_up(configuration)
+    other_claim = other_corpus._claim_top_up(configuration)
+    assert other_claim is not None
+    assert not corpus._renew_top_up(configuration, claim)
+    assert other_corpus._renew_top_up(configuration, other_claim)
+
+def test_fill_stores_scored_solutions(path):
+    corpus = SolutionCorpus(path, low_water_mark=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        added = corpus.fill(CantusFirmusGenerator, ARGUMENTS, seed=1)
+    assert added > 0
+    assert corpus.count_unserved_solutions(CantusFirmusGenerator, ARGUMENTS) == added
+    assert corpus.get_solution(CantusFirmusGenerator, ARGUMENTS) is not None
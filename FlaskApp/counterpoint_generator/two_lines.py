@@ -1,6 +1,5 @@
 from abc import ABC
 
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -27,10 +26,10 @@ from filter_functions.score_functions import penalize_perfect_intervals_on_downb
 
 class TwoLines (MultipleLines, ABC):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
         if len(lines) != 2:
             raise Exception("Two-part Counterpoint must have two lines")
-        super().__init__(length, lines, mode)
+        super().__init__(length, lines, mode, seed)
 
         self._rhythmic_insertion_filters.append(end_on_breve)
 
@@ -1,5 +1,3 @@
-from random import randint, random
-
 import os,sys,inspect
 current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parent_dir = os.path.dirname(current_dir)
@@ -37,8 +35,8 @@ from filter_functions.score_functions import find_as_many_suspensions_as_possibl
 
 class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0, seed: int = None):
+        super().__init__(length, lines, mode, seed)
         if cantus_firmus_index not in [0, 1]:
             raise Exception("invalid cantus firmus index")
 
@@ -67,7 +65,7 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
         last_leap = 5 if mode == Mode.PHRYGIAN else 4
         #in the Fifth Species, it will be necessary to find a Cantus Firmus that ends in a way that allows us to cadence
         while self._cantus_firmus is None or self._cantus_firmus[-2].get_tonal_interval(self._cantus_firmus[-1]) not in [-2, last_leap]:
-            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode)
+            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode, self._random)
             cantus_firmus_generator.generate_counterpoint(must_end_by_descending_step=True if self._cantus_firmus_index == 1 else False)
             cantus_firmus_generator.score_solutions()
             solution = cantus_firmus_generator.get_one_solution()
@@ -76,7 +74,7 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
     #override:
     #we should try ten attempts before we generate another Cantus Firmus
     def _exit_attempt_loop(self) -> bool:
-        return len(self._solutions) >= 40 or self._number_of_attempts >= 50 or (self._number_of_attempts >= 40 and len(self._solutions) == 0)
+        return self._number_of_solutions >= 40 or self._number_of_attempts >= 50 or (self._number_of_attempts >= 40 and self._number_of_solutions == 0)
 
     
     #override:
@@ -104,7 +102,7 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
 
                 vocal_range = self._lines[line]
                 #choose a range interval between an octave and tenth that is within each voice range
-                range_size = randint(8, 10)
+                range_size = self._random.randint(8, 10)
                 leeway = 13 - range_size #this is the interval that we can add to the range_size interval to get the interval from the lowest to highest note available in the vocal range
                 
                 #if the Cantus Firmus is on top, we want to calculate our highest note in relation to the Cantus Firmus lowest note
@@ -117,7 +115,7 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
                     if tighter_leeway < 0:
                         self._attempt_parameters[line]["highest"] = high_vocal_highest if low_vocal_highest.get_tonal_interval(c_lowest) > 0 else low_vocal_highest
                     else:
-                        self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_highest, randint(1, tighter_leeway))
+                        self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_highest, self._random.randint(1, tighter_leeway))
                     self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["highest"], range_size * -1)
                 else:
                     low_vocal_lowest = self._mode_resolver.get_lowest_of_range(vocal_range)
@@ -128,7 +126,7 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
                     if tighter_leeway < 0:
                         self._attempt_parameters[line]["lowest"] = low_vocal_lowest if high_vocal_lowest.get_tonal_interval(c_highest) < 0 else high_vocal_lowest
                     else:
-                        self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, randint(1, tighter_leeway))
+                        self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, self._random.randint(1, tighter_leeway))
                     self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["lowest"], range_size)
 
 
@@ -136,8 +134,8 @@ class TwoPartFifthSpeciesGenerator (FifthSpeciesCounterpointGenerator, TwoLines)
                 self._attempt_parameters[line]["lowest"] = c_lowest
                 self._attempt_parameters[line]["highest"] = c_highest
             
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
 
 
@@ -1,5 +1,3 @@
-from random import randint, random
-
 import os,sys,inspect
 current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parent_dir = os.path.dirname(current_dir)
@@ -22,8 +20,8 @@ from filter_functions.harmonic_insertion_checks import adjacent_voices_stay_with
 
 class TwoPartFirstSpeciesGenerator (FirstSpeciesCounterpointGenerator, TwoLines):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0, seed: int = None):
+        super().__init__(length, lines, mode, seed)
         if cantus_firmus_index not in [0, 1]:
             raise Exception("invalid cantus firmus index")
 
@@ -38,7 +36,7 @@ class TwoPartFirstSpeciesGenerator (FirstSpeciesCounterpointGenerator, TwoLines)
         self._cantus_firmus_index = cantus_firmus_index
         self._cantus_firmus = None
         while self._cantus_firmus is None:
-            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode)
+            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode, self._random)
             cantus_firmus_generator.generate_counterpoint(must_end_by_descending_step=True)
             cantus_firmus_generator.score_solutions()
             solution = cantus_firmus_generator.get_one_solution()
@@ -47,7 +45,7 @@ class TwoPartFirstSpeciesGenerator (FirstSpeciesCounterpointGenerator, TwoLines)
     #override:
     #we should try ten attempts before we generate another Cantus Firmus
     def _exit_attempt_loop(self) -> bool:
-        if len(self._solutions) >= 10 or self._number_of_attempts >= 50: 
+        if self._number_of_solutions >= 10 or self._number_of_attempts >= 50: 
             return True 
         return False 
 
@@ -64,6 +62,6 @@ class TwoPartFirstSpeciesGenerator (FirstSpeciesCounterpointGenerator, TwoLines)
     #override:
     #collect unlimited Cantus Firmus examples within 3500 backtracks
     def _exit_backtrack_loop(self) -> bool:
-        if self._number_of_backtracks > 3500 or (len(self._solutions) == 0 and self._number_of_backtracks > 100):
+        if self._number_of_backtracks > 3500 or (self._number_of_solutions == 0 and self._number_of_backtracks > 100):
             return True 
         return False 
\ No newline at end of file
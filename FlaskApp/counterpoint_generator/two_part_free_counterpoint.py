@@ -1,4 +1,3 @@
-from random import randint, random, shuffle
 import math
 
 import os,sys,inspect
@@ -49,8 +48,8 @@ from filter_functions.score_functions import penalize_rests
 
 class TwoPartFreeCounterpointGenerator (FifthSpeciesCounterpointGenerator, TwoLines):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         self._melodic_insertion_checks.append(begin_and_end_two_part_counterpoint)
         self._melodic_insertion_checks.append(penultimate_bar_two_part_counterpoint)
@@ -79,7 +78,7 @@ class TwoPartFreeCounterpointGenerator (FifthSpeciesCounterpointGenerator, TwoLi
     #override:
     #we should try ten attempts before we generate another Cantus Firmus
     def _exit_attempt_loop(self) -> bool:
-        return len(self._solutions) >= 1 or (self._number_of_attempts >= 200 and len(self._solutions) == 0)
+        return self._number_of_solutions >= 1 or (self._number_of_attempts >= 200 and self._number_of_solutions == 0)
 
     
     # #override:
@@ -93,16 +92,16 @@ class TwoPartFreeCounterpointGenerator (FifthSpeciesCounterpointGenerator, TwoLi
     def _assign_highest_and_lowest(self) -> None:
 
         #determine range for bottom line:
-        range_size = randint(8, 10)
+        range_size = self._random.randint(8, 10)
         leeway = 13 - range_size
         vocal_lowest = self._mode_resolver.get_lowest_of_range(self._lines[0])
-        self._attempt_parameters[0]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(vocal_lowest, randint(1, leeway))
+        self._attempt_parameters[0]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(vocal_lowest, self._random.randint(1, leeway))
         self._attempt_parameters[0]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[0]["lowest"], range_size)
         
        
         #use this to determine range for top line
         c_highest = self._attempt_parameters[0]["highest"]
-        range_size = randint(8, 10)
+        range_size = self._random.randint(8, 10)
         leeway = 13 - range_size #this is the interval that we can add to the range_size interval to get the interval from the lowest to highest note available in the vocal range
         low_vocal_lowest = self._mode_resolver.get_lowest_of_range(self._lines[1])
         high_vocal_lowest = self._mode_resolver.get_default_pitch_from_interval(low_vocal_lowest, leeway)
@@ -112,13 +111,13 @@ class TwoPartFreeCounterpointGenerator (FifthSpeciesCounterpointGenerator, TwoLi
         if tighter_leeway < 0:
             self._attempt_parameters[1]["lowest"] = low_vocal_lowest if high_vocal_lowest.get_tonal_interval(c_highest) < 0 else high_vocal_lowest
         else:
-            self._attempt_parameters[1]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, randint(1, tighter_leeway))
+            self._attempt_parameters[1]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, self._random.randint(1, tighter_leeway))
         self._attempt_parameters[1]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[1]["lowest"], range_size)
 
 
         for line in range(2):
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
     #override:
     #decide the number of Suspensions in advance
@@ -128,17 +127,17 @@ class TwoPartFreeCounterpointGenerator (FifthSpeciesCounterpointGenerator, TwoLi
 
     #determines which bars will have suspensions
     def _assign_suspension_bars(self) -> None:
-        min_num_suspensions = randint(1, 2) if self._length < 12 else randint(2, 3)
+        min_num_suspensions = self._random.randint(1, 2) if self._length < 12 else self._random.randint(2, 3)
         suspension_bars = [self._length - 2]
         for i in range(min_num_suspensions - 1):
-            suspension_bar = randint(3, self._length - 2)
+            suspension_bar = self._random.randint(3, self._length - 2)
             while suspension_bar in suspension_bars:
-                suspension_bar = randint(3, self._length - 2)
+                suspension_bar = self._random.randint(3, self._length - 2)
             suspension_bars.append(suspension_bar)
         for line in range(2):
             self._attempt_parameters[line]["suspension_bars"] = []
         for suspension_bar in suspension_bars:
-            if random() < .33:
+            if self._random.random() < .33:
                 self._attempt_parameters[0]["suspension_bars"].append(suspension_bar)
             else:
                 self._attempt_parameters[1]["suspension_bars"].append(suspension_bar)
@@ -1,4 +1,3 @@
-from random import random, randint, shuffle
 import math
 
 import os,sys,inspect
@@ -15,8 +14,8 @@ from imitation_opening import ImitationOpeningGenerator
 
 
 class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, seed: int = None):
+        super().__init__(length, lines, mode, seed)
 
         #decide the vocal ranges in advance using the super() version of assign highest and lowest
         self._attempt_parameters = [{}, {}]
@@ -29,7 +28,7 @@ class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
         count = 0
         while optimal is None and count < 1:
             count += 1
-            imitation_opening_generator = ImitationOpeningGenerator(length, lines, mode, self._lowest_pitches, self._highest_pitches)
+            imitation_opening_generator = ImitationOpeningGenerator(length, lines, mode, self._lowest_pitches, self._highest_pitches, self._random)
             imitation_opening_generator.generate_counterpoint()
             imitation_opening_generator.score_solutions()
             optimal = imitation_opening_generator.get_one_solution()
@@ -41,13 +40,14 @@ class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
     def generate_counterpoint(self) -> None:
         if self._opening is None:
             return 
+        self._start_clock()
         self._number_of_attempts = 0
-        while not self._exit_attempt_loop():
+        while not self._exit_generation():
             self._number_of_attempts += 1
             self._initialize()
             self._backtrack()
             print("highest index reached:", self._highest_index_reached)
-        print("number of solutions:", len(self._solutions),"number of attempts:", self._number_of_attempts, "number of backtracks:", self._number_of_backtracks)
+        print("number of solutions:", self._number_of_solutions,"number of attempts:", self._number_of_attempts, "number of backtracks:", self._number_of_backtracks)
         return 
 
     #override:
@@ -57,8 +57,8 @@ class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
             self._attempt_parameters[line]["lowest"] = self._lowest_pitches[line]
             self._attempt_parameters[line]["highest"] = self._highest_pitches[line]
             if self._length - 1 >= self._opening_bars + 2:
-                self._attempt_parameters[line]["lowest_must_appear_by"] = randint(self._opening_bars + 2, self._length - 1) 
-                self._attempt_parameters[line]["highest_must_appear_by"] = randint(self._opening_bars + 2, self._length - 1)
+                self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(self._opening_bars + 2, self._length - 1) 
+                self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(self._opening_bars + 2, self._length - 1)
             else:
                 self._attempt_parameters[line]["lowest_must_appear_by"] = self._length - 1
                 self._attempt_parameters[line]["highest_must_appear_by"] = self._length - 1
@@ -79,17 +79,17 @@ class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
     #override:
     #ensure that suspension bars don't overlap with opening
     def _assign_suspension_bars(self) -> None:
-        min_num_suspensions = randint(1, 2) if self._length - self._opening_bars > 5 else 1
+        min_num_suspensions = self._random.randint(1, 2) if self._length - self._opening_bars > 5 else 1
         suspension_bars = [self._length - 2]
         for i in range(min_num_suspensions - 1):
-            suspension_bar = randint(self._opening_bars + 1, self._length - 3)
+            suspension_bar = self._random.randint(self._opening_bars + 1, self._length - 3)
             while suspension_bar in suspension_bars:
-                suspension_bar = randint(self._opening_bars + 1, self._length - 3)
+                suspension_bar = self._random.randint(self._opening_bars + 1, self._length - 3)
             suspension_bars.append(suspension_bar)
         for line in range(2):
             self._attempt_parameters[line]["suspension_bars"] = []
         for suspension_bar in suspension_bars:
-            if random() < .33:
+            if self._random.random() < .33:
                 self._attempt_parameters[0]["suspension_bars"].append(suspension_bar)
             else:
                 self._attempt_parameters[1]["suspension_bars"].append(suspension_bar)
@@ -105,6 +105,6 @@ class TwoPartImitativeCounterpointGenerator (TwoPartFreeCounterpointGenerator):
                 return math.ceil(total_duration / 8)
 
     #override:
-    #exit the attempt loop after ten attempts
+    #exit the attempt loop after ten attempts (or immediately if we haven't generated an opening)
     def _exit_attempt_loop(self) -> bool:
-        return len(self._solutions) >= 100 or self._number_of_attempts >= 20 or (self._number_of_attempts >= 10 and len(self._solutions) > 0)
+        return self._opening is None or self._number_of_solutions >= 100 or self._number_of_attempts >= 20 or (self._number_of_attempts >= 10 and self._number_of_solutions > 0)
@@ -1,5 +1,3 @@
-from random import randint, random
-
 import os,sys,inspect
 current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parent_dir = os.path.dirname(current_dir)
@@ -24,8 +22,8 @@ from filter_functions.score_functions import find_longest_sequence_of_steps
 
 class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLines):
 
-    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0):
-        super().__init__(length, lines, mode)
+    def __init__(self, length: int, lines: list[VocalRange], mode: Mode, cantus_firmus_index: int = 0, seed: int = None):
+        super().__init__(length, lines, mode, seed)
         if cantus_firmus_index not in [0, 1]:
             raise Exception("invalid cantus firmus index")
 
@@ -43,7 +41,7 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
         self._cantus_firmus_index = cantus_firmus_index
         self._cantus_firmus = None
         while self._cantus_firmus is None:
-            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode)
+            cantus_firmus_generator = CantusFirmusGenerator(self._length, [self._lines[self._cantus_firmus_index]], self._mode, self._random)
             cantus_firmus_generator.generate_counterpoint(must_end_by_descending_step=True if self._cantus_firmus_index == 1 else False)
             cantus_firmus_generator.score_solutions()
             solution = cantus_firmus_generator.get_one_solution()
@@ -52,7 +50,7 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
     #override:
     #we should try ten attempts before we generate another Cantus Firmus
     def _exit_attempt_loop(self) -> bool:
-        return len(self._solutions) >= 10 or self._number_of_attempts >= 50
+        return self._number_of_solutions >= 10 or self._number_of_attempts >= 50
 
     
     #override:
@@ -80,7 +78,7 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
 
                 vocal_range = self._lines[line]
                 #choose a range interval between an octave and tenth that is within each voice range
-                range_size = randint(8, 10)
+                range_size = self._random.randint(8, 10)
                 leeway = 13 - range_size #this is the interval that we can add to the range_size interval to get the interval from the lowest to highest note available in the vocal range
                 
                 #if the Cantus Firmus is on top, we want to calculate our highest note in relation to the Cantus Firmus lowest note
@@ -93,7 +91,7 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
                     if tighter_leeway < 0:
                         self._attempt_parameters[line]["highest"] = high_vocal_highest if low_vocal_highest.get_tonal_interval(c_lowest) > 0 else low_vocal_highest
                     else:
-                        self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_highest, randint(1, tighter_leeway))
+                        self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_highest, self._random.randint(1, tighter_leeway))
                     self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["highest"], range_size * -1)
                 else:
                     low_vocal_lowest = self._mode_resolver.get_lowest_of_range(vocal_range)
@@ -104,7 +102,7 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
                     if tighter_leeway < 0:
                         self._attempt_parameters[line]["lowest"] = low_vocal_lowest if high_vocal_lowest.get_tonal_interval(c_highest) < 0 else high_vocal_lowest
                     else:
-                        self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, randint(1, tighter_leeway))
+                        self._attempt_parameters[line]["lowest"] = self._mode_resolver.get_default_pitch_from_interval(low_possible_lowest, self._random.randint(1, tighter_leeway))
                     self._attempt_parameters[line]["highest"] = self._mode_resolver.get_default_pitch_from_interval(self._attempt_parameters[line]["lowest"], range_size)
 
 
@@ -112,8 +110,8 @@ class TwoPartSecondSpeciesGenerator (SecondSpeciesCounterpointGenerator, TwoLine
                 self._attempt_parameters[line]["lowest"] = c_lowest
                 self._attempt_parameters[line]["highest"] = c_highest
             
-            self._attempt_parameters[line]["lowest_must_appear_by"] = randint(3, self._length - 1)
-            self._attempt_parameters[line]["highest_must_appear_by"] = randint(3, self._length - 1)
+            self._attempt_parameters[line]["lowest_must_appear_by"] = self._random.randint(3, self._length - 1)
+            self._attempt_parameters[line]["highest_must_appear_by"] = self._random.randint(3, self._length - 1)
 
 
 
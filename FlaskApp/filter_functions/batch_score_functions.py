@@ -0,0 +1,40 @@
+from functools import wraps
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
+
+#scoring a solution with the score functions means first mapping it onto the stack, rebuilding the dictionaries and sets
+#of every line, and then having each score function recompute the intervals between successive notes.  Score functions
+#that can be computed from the packed form of a solution below are written against it instead, taking the packed solution
+#as their second argument, and are declared with the decorator below, which turns them into ordinary score functions (that
+#pack the stack) and keeps the packed version as their packed_function, so that solutions can be scored without being
+#mapped onto the stack (see score_solutions).  Both share the one implementation, so they can't disagree
+def scored_from_packed_solution(packed_function: callable) -> callable:
+    @wraps(packed_function)
+    def score_function(self: object) -> int:
+        return packed_function(self, pack_solution(self._counterpoint_stacks))
+    score_function.packed_function = packed_function
+    return score_function
+
+#packs a solution into a list with a dictionary for each line, holding:
+#"is_pitch": whether each entity is a pitch
+#"intervals": the tonal interval from each entity to the next (0 if either is a rest), one fewer than the entities
+#"downbeats": the entities that begin on the downbeat of each bar, by bar
+def pack_solution(solution: list[list[RhythmicValue]]) -> list[dict]:
+    packed_solution = []
+    for line in solution:
+        is_pitch = [isinstance(entity, Pitch) for entity in line]
+        intervals = [line[i].get_tonal_interval(line[i + 1]) if is_pitch[i] and is_pitch[i + 1] else 0 for i in range(len(line) - 1)]
+        downbeats = {}
+        onset = 0
+        for entity in line:
+            if onset % 8 == 0:
+                downbeats[onset // 8] = entity
+            onset += entity.get_duration()
+        packed_solution.append({ "is_pitch": is_pitch, "intervals": intervals, "downbeats": downbeats })
+    return packed_solution
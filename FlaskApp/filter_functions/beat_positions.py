@@ -0,0 +1,31 @@
+#checks and filters that can only have an effect at certain positions in the measure (or in certain bars) declare
+#those positions with the decorator below.  At every other position the check always passes (or the filter returns
+#the durations unchanged), so the generators leave it out of the dispatch lists for those positions entirely.
+#Beats are given in the same units as the indices (0 - 3.5), and bars as bar numbers, where negative numbers are
+#counted back from the end of the piece (-1 is the last bar, -2 the penultimate bar and so on)
+def fires_at(beats: set[float] = None, bars: set[int] = None) -> callable:
+    def declare_positions(check: callable) -> callable:
+        check.beats = beats
+        check.bars = bars
+        return check
+    return declare_positions
+
+#determines whether a check or filter can have an effect at the specified index of a piece of the specified length
+def can_fire_at(check: callable, length: int, bar: int, beat: float) -> bool:
+    beats = getattr(check, "beats", None)
+    bars = getattr(check, "bars", None)
+    if beats is not None and beat not in beats:
+        return False
+    if bars is not None and bar not in [length + b if b < 0 else b for b in bars]:
+        return False
+    return True
+
+#builds a dispatch table that maps each index of a piece of the specified length onto the checks (in their original order)
+#that can have an effect there
+def build_dispatch_table(checks: list[callable], length: int) -> dict[tuple[int, float], list[callable]]:
+    dispatch_table = {}
+    for bar in range(length):
+        for half_beat in range(8):
+            beat = half_beat / 2
+            dispatch_table[(bar, beat)] = [check for check in checks if can_fire_at(check, length, bar, beat)]
+    return dispatch_table
@@ -0,0 +1,85 @@
+from filter_functions.beat_positions import can_fire_at
+
+#checks and filters that read other lines declare which bars of those lines they read with the decorator below, so
+#that when an index can't be filled, the generator can tell which earlier placements are responsible (see
+#use_backjumping).  Bars are given relative to the bar being filled (bars_before and bars_after), and further bars
+#can be given as bar numbers, where negative numbers are counted back from the end of the piece (as in beat_positions.py).
+#A check reads a bar if it looks at any entity sounding in that bar.
+#The melodic insertion checks, the rhythmic insertion filters and the index checks are assumed to read only the line
+#being filled unless they declare otherwise, while harmonic checks and filters that don't declare anything are assumed
+#to read every bar of the other lines
+def reads_other_lines(bars_before: int = 0, bars_after: int = 0, bars: set[int] = None) -> callable:
+    def declare_dependencies(check: callable) -> callable:
+        check.other_line_bars = (bars_before, bars_after, bars)
+        return check
+    return declare_dependencies
+
+#returns the bars of the other lines that a check or filter reads at the specified index of a piece of the specified length,
+#or None if it may read all of them
+def get_other_line_bars(check: callable, length: int, bar: int, reads_other_lines_by_default: bool) -> set[int]:
+    declaration = getattr(check, "other_line_bars", None)
+    if declaration is None:
+        return None if reads_other_lines_by_default else set()
+    (bars_before, bars_after, bars) = declaration
+    other_line_bars = set(range(max(bar - bars_before, 0), min(bar + bars_after, length - 1) + 1))
+    if bars is not None:
+        other_line_bars.update([length + b if b < 0 else b for b in bars])
+    return other_line_bars
+
+#builds a table that maps each index of a piece of the specified length onto the bars of the other lines that the checks
+#and filters that can have an effect there read (or None if they may read all of them)
+def build_dependency_table(own_line_checks: list[callable], other_line_checks: list[callable], length: int) -> dict[tuple[int, float], set[int]]:
+    dependency_table = {}
+    for bar in range(length):
+        for half_beat in range(8):
+            beat = half_beat / 2
+            other_line_bars = set()
+            for checks, reads_other_lines_by_default in [(own_line_checks, False), (other_line_checks, True)]:
+                for check in checks:
+                    if other_line_bars is not None and can_fire_at(check, length, bar, beat):
+                        check_bars = get_other_line_bars(check, length, bar, reads_other_lines_by_default)
+                        other_line_bars = None if check_bars is None else other_line_bars | check_bars
+            dependency_table[(bar, beat)] = other_line_bars
+    return dependency_table
+
+#builds a table that maps each index onto the bars of the other lines read at that index or at any later one (or None if they
+#may read all of them), from a table built by build_dependency_table.  These are the bars that the rest of a line, from the
+#index onwards, is written against
+def build_remaining_dependency_table(dependency_table: dict[tuple[int, float], set[int]]) -> dict[tuple[int, float], frozenset[int]]:
+    remaining_dependency_table = {}
+    other_line_bars = set()
+    for index in sorted(dependency_table, reverse=True):
+        if other_line_bars is not None:
+            other_line_bars = None if dependency_table[index] is None else other_line_bars | dependency_table[index]
+        remaining_dependency_table[index] = None if other_line_bars is None else frozenset(other_line_bars)
+    return remaining_dependency_table
+
+#checks and filters also declare how far back they read the line being filled with the decorator below, so that the nogood
+#table can tell which earlier placements a search state depends on (see use_nogood_table).  A check reads the last entities
+#entities on the line's stack (the node context covers the last two) and, if bars is given, the entities sounding from that 
+#many bars before the bar being filled up to the end of it.  A check that scans further back than that gives a summary of 
+#what it reads there: a function of the generator, the line and the number of entities at the beginning of the line that 
+#lie before the last entities, which returns a hashable value that, together with the entities after them, determines the 
+#outcome of the check at the current index and at every later one.  The final checks, which read every line, declare what 
+#they read of each line in the same way (without bars).  Checks and filters that don't declare anything may read the whole line
+def reads_line_back(entities: int = 0, bars: int = None, summary: callable = None) -> callable:
+    def declare_lookback(check: callable) -> callable:
+        check.line_lookback = (entities, bars, summary)
+        return check
+    return declare_lookback
+
+#combines the lookbacks declared by the specified checks and filters into one of the form (entities, bars, summaries), or 
+#returns None if any of them may read the whole line
+def get_line_lookback(checks: list[callable]) -> tuple[int, int, list[callable]]:
+    entities, bars, summaries = 0, None, []
+    for check in checks:
+        declaration = getattr(check, "line_lookback", None)
+        if declaration is None:
+            return None
+        (check_entities, check_bars, summary) = declaration
+        entities = max(entities, check_entities)
+        if check_bars is not None:
+            bars = check_bars if bars is None else max(bars, check_bars)
+        if summary is not None and summary not in summaries:
+            summaries.append(summary)
+    return (entities, bars, summaries)
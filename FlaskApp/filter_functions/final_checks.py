@@ -7,7 +7,21 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.dependencies import reads_line_back
+
+#what the check below reads before the window (see reads_line_back in dependencies.py): the pitch ids of the high notes of
+#the ascending leaps that begin there and haven't been filled in there
+def collect_unfilled_ascending_leaps_before_window(self: object, line: int, end: int) -> frozenset:
+    stack = self._counterpoint_stacks[line]
+    unfilled = set()
+    for i in range(min(end, len(stack) - 1)):
+        if isinstance(stack[i], Pitch) and stack[i].get_tonal_interval(stack[i + 1]) > 2:
+            if not any([stack[i + 1].get_tonal_interval(stack[j]) == -2 for j in range(i + 2, end)]):
+                unfilled.add(stack[i + 1].get_pitch_id())
+    return frozenset(unfilled)
+
 #makes sure that the note a step down from the high note of an ascending leap appears somewhere later in the melody
+@reads_line_back(2, summary=collect_unfilled_ascending_leaps_before_window)
 def ascending_intervals_are_filled_in(self: object) -> bool:
     for line in range(self._height):
         for i, entity in enumerate(self._counterpoint_stacks[line]):
@@ -7,10 +7,15 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.beat_positions import fires_at
+from filter_functions.dependencies import reads_other_lines, reads_line_back
+
 #in First Species through Fourth Species, we only need to worry about parallels leading into downbeats
+@reads_other_lines(bars_before=1)
+@reads_line_back(1)
 def prevents_parallel_fifths_and_octaves_simple(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if bar != 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        prev_note = self._counterpoint_stacks[line][-1]
+    if bar != 0 and self._node_context.previous_pitch is not None:
+        prev_note = self._node_context.previous_pitch
         for other_line in range(self._height):
             if other_line != line and (bar - 1, 0) in self._counterpoint_objects[other_line] and (bar, 0) in self._counterpoint_objects[other_line]:
                 prev_c_note, c_note = self._counterpoint_objects[other_line][(bar - 1, 0)], self._counterpoint_objects[other_line][(bar, 0)]
@@ -22,14 +27,17 @@ def prevents_parallel_fifths_and_octaves_simple(self: object, pitch: Pitch, line
             
 
 #blocks parallel motion leading to perfect intervals
+@reads_other_lines(bars_before=1)
+@reads_line_back(1)
 def prevents_hidden_fifths_and_octaves_two_part(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2
-    if (bar, beat) != (0, 0) and (bar, beat) in self._counterpoint_objects[other_line]:
-        c_note = self._counterpoint_objects[other_line][(bar, beat)]
+    context = self._node_context
+    other_line = context.other_line
+    if (bar, beat) != (0, 0):
+        c_note = context.simultaneous_c_note
         if c_note is not None and abs(c_note.get_chromatic_interval(pitch)) % 12 in [0,7]:
             prev_beat = beat - 0.5 if beat > 0 else 3.5
             prev_bar = bar if beat > 0 else bar - 1
-            prev_note = self._get_counterpoint_pitch(line, prev_bar, prev_beat)
+            prev_note = context.previous_pitch
             prev_c_note = self._get_counterpoint_pitch(other_line, prev_bar, prev_beat)
             if prev_note is not None and prev_c_note is not None:
                 interval, c_interval = prev_note.get_tonal_interval(pitch), prev_c_note.get_tonal_interval(c_note)
@@ -38,31 +46,36 @@ def prevents_hidden_fifths_and_octaves_two_part(self: object, pitch: Pitch, line
     return True
 
 #used in First Species through Fourth Species
+@fires_at(beats={ 0 })
+@reads_other_lines()
+@reads_line_back()
 def unison_not_allowed_on_downbeat_outside_first_and_last_measure(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2
     if beat == 0 and bar not in [0, self._length - 1]:
-        if (bar, beat) in self._counterpoint_objects[other_line]:
-            c_note = self._counterpoint_objects[other_line][(bar, beat)]
-            if c_note is not None and c_note.is_unison(pitch):
-                return False 
+        c_note = self._node_context.simultaneous_c_note
+        if c_note is not None and c_note.is_unison(pitch):
+            return False 
     return True 
 
 #used in all Two Part examples
+@fires_at(beats={ 0 })
+@reads_other_lines()
+@reads_line_back()
 def no_dissonant_onsets_on_downbeats(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2
-    if beat == 0 and (bar, beat) in self._counterpoint_objects[other_line]:
-        c_note = self._counterpoint_objects[other_line][(bar, beat)] if (bar, beat) in self._counterpoint_objects[other_line] else None
+    if beat == 0:
+        c_note = self._node_context.simultaneous_c_note
         if c_note is not None and isinstance(c_note, Pitch):
             if not self._is_consonant(c_note, pitch):
                 return False 
     return True
 
 #in Two Parts we must start and end on Unisons, Fifths or Octaves
+@reads_other_lines()
+@reads_line_back(1)
 def start_and_end_intervals_two_part(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2
+    other_line = self._node_context.other_line
     c_note = None 
-    if len(self._counterpoint_stacks[line]) == 0 or not isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+    if self._node_context.previous_pitch is None:
+        c_note = self._node_context.sounding_c_notes[other_line]
     if bar == self._length - 1:
         if (self._length - 1, 0) not in self._counterpoint_objects[other_line]:
             print(self._counterpoint_objects[other_line])
@@ -77,6 +90,8 @@ def start_and_end_intervals_two_part(self: object, pitch: Pitch, line: int, bar:
     return True
     
 #for use in First Species
+@reads_other_lines(bars_before=3)
+@reads_line_back(bars=3)
 def no_more_than_four_consecutive_repeated_vertical_intervals(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if bar >= 3:
         note_1 = self._counterpoint_objects[line][(bar - 3, 0)]
@@ -98,55 +113,71 @@ def no_more_than_four_consecutive_repeated_vertical_intervals(self: object, pitc
     return True
 
 #prevents adjacent voices from mobing further than a tenth from each other
+@reads_other_lines()
+@reads_line_back()
 def adjacent_voices_stay_within_tenth(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     for other_line in [line - 1, line + 1]:
         if other_line >= 0 and other_line < self._height:
-            c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+            c_note = self._node_context.sounding_c_notes[other_line]
             if c_note is not None and abs(c_note.get_tonal_interval(pitch)) > 10:
                 return False 
     return True
 
 #prevents adjacent voices from mobing further than a twelth from each other
+@reads_other_lines()
+@reads_line_back()
 def adjacent_voices_stay_within_twelth(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     for other_line in [line - 1, line + 1]:
         if other_line >= 0 and other_line < self._height:
-            c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+            c_note = self._node_context.sounding_c_notes[other_line]
             if c_note is not None and abs(c_note.get_tonal_interval(pitch)) > 12:
                 return False 
     return True
 
 #used in all multi-part examples
+@reads_other_lines()
+@reads_line_back()
 def sharp_notes_and_leading_tones_not_doubled(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if self._mode_resolver.is_sharp(pitch) or self._mode_resolver.is_leading_tone(pitch):
         for other_line in range(self._height):
             if other_line != line:
-                c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+                c_note = self._node_context.sounding_c_notes[other_line]
                 if c_note is not None and abs(c_note.get_chromatic_interval(pitch)) % 12 == 0:
                     return False 
     return True
 
 #in the Second Species, we only need to worry about placing the Passing Tones themselves against the Cantus Firmus
+@fires_at(beats={ 2 })
+@reads_other_lines()
+@reads_line_back(1)
 def forms_passing_tone_second_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if beat == 2 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
+    other_line = self._node_context.other_line    
+    if beat == 2 and self._node_context.previous_pitch is not None:
         c_note = self._counterpoint_objects[other_line][(bar, 0)]
         if not self._is_consonant(c_note, pitch):
-            if abs(self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)) != 2:
+            if abs(self._node_context.previous_pitch.get_tonal_interval(pitch)) != 2:
                 return False 
     return True 
 
+@fires_at(beats={ 0 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(2)
 def resolves_passing_tone_second_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if beat == 0 and len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
+    other_line = self._node_context.other_line    
+    context = self._node_context
+    if beat == 0 and context.second_previous_pitch is not None:
         c_note = self._counterpoint_objects[other_line][(bar - 1, 0)]
-        if not self._is_consonant(c_note, self._counterpoint_stacks[line][-1]):
-            if self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) != self._counterpoint_stacks[line][-1].get_tonal_interval(pitch):
+        if not self._is_consonant(c_note, context.previous_pitch):
+            if context.previous_interval != context.previous_pitch.get_tonal_interval(pitch):
                 return False 
     return True 
 
 #for use in Third and Fifth Species
+@fires_at(beats={ 1, 3 })
+@reads_other_lines()
+@reads_line_back(1, bars=0)
 def forms_weak_quarter_beat_dissonance(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2  
+    other_line = self._node_context.other_line  
     if beat % 2 == 1 and len(self._counterpoint_stacks[line]) == 0:
         print(line, bar, beat)
         self.print_counterpoint() 
@@ -158,34 +189,45 @@ def forms_weak_quarter_beat_dissonance(self: object, pitch: Pitch, line: int, ba
     return True  
 
 #resolves Passing Tones, Lower Neighbors and Cambiatas
+@fires_at(beats={ 0, 2 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(2)
 def resolves_weak_quarter_beat_dissonance_third_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if beat % 2 == 0 and len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
+    other_line = self._node_context.other_line    
+    context = self._node_context
+    if beat % 2 == 0 and context.second_previous_pitch is not None:
         c_note = self._get_counterpoint_pitch(other_line, bar if beat > 0 else bar - 1, 1 if beat > 0 else 3)
         if c_note is not None:
-            if not self._is_consonant(c_note, self._counterpoint_stacks[line][-1]):
-                first_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-                second_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+            if not self._is_consonant(c_note, context.previous_pitch):
+                first_interval = context.previous_interval
+                second_interval = context.previous_pitch.get_tonal_interval(pitch)
                 if (first_interval, second_interval) not in [(2, 2), (-2, -2), (-2, 2), (-2, -3)]:
                     return False 
     return True 
 
 #resolves Passing Tones, Upper and Lower Neighbors and Cambiatas
+@fires_at(beats={ 0, 2 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(2)
 def resolves_weak_quarter_beat_dissonance_fifth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if beat % 2 == 0 and len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
+    other_line = self._node_context.other_line    
+    context = self._node_context
+    if beat % 2 == 0 and context.second_previous_pitch is not None:
         c_note = self._get_counterpoint_pitch(other_line, bar if beat > 0 else bar - 1, 1 if beat > 0 else 3)
         if c_note is not None:
-            if not self._is_consonant(c_note, self._counterpoint_stacks[line][-1]):
-                first_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-                second_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+            if not self._is_consonant(c_note, context.previous_pitch):
+                first_interval = context.previous_interval
+                second_interval = context.previous_pitch.get_tonal_interval(pitch)
                 if (first_interval, second_interval) not in [(2, 2), (-2, -2), (-2, 2), (2, -2), (-2, -3)]:
                     return False 
     return True 
 
 #resolves fourth and potential fifth note of Cambiata, in both Third and Fifth Species
+@fires_at(beats={ 0, 1, 2, 3 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(1, bars=1)
 def resolves_cambiata_tail(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
+    other_line = self._node_context.other_line    
     camb_bar, cam_beat, res_bar, res_beat = None, None, None, None
     if beat in [1, 2]:
         (camb_bar, cam_beat) = (bar - 1, 3)
@@ -202,15 +244,18 @@ def resolves_cambiata_tail(self: object, pitch: Pitch, line: int, bar: int, beat
             c_note = self._get_counterpoint_pitch(other_line, camb_bar, cam_beat)
             if c_note is not None:
                 if not self._is_consonant(c_note, camb_note):
-                    if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != 2:
+                    if self._node_context.previous_entity.get_tonal_interval(pitch) != 2:
                         return False 
     return True
 
 #for use only in Third Species
+@fires_at(beats={ 0, 2 })
+@reads_other_lines()
+@reads_line_back()
 def strong_quarter_beats_are_consonant(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2   
+    other_line = self._node_context.other_line   
     if beat % 2 == 0:
-        c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+        c_note = self._node_context.sounding_c_notes[other_line]
         if c_note is not None:
             if not self._is_consonant(c_note, pitch):
                 return False 
@@ -221,16 +266,18 @@ def strong_quarter_beats_are_consonant(self: object, pitch: Pitch, line: int, ba
 
 #used in all Two-part examples
 #if both voices move in the same direction by a third or move, neither voice van move by a fifth or more
+@reads_other_lines(bars_before=1)
+@reads_line_back(1)
 def prevents_large_leaps_in_same_direction(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch) and (bar, beat) in self._counterpoint_objects[other_line]:
-        c_note = self._counterpoint_objects[other_line][(bar, beat)]
+    other_line = self._node_context.other_line    
+    if self._node_context.previous_pitch is not None:
+        c_note = self._node_context.simultaneous_c_note
         if c_note is not None and isinstance(c_note, Pitch):
             prev_beat = beat - 0.5 if beat > 0 else 3
             prev_bar = bar if beat > 0 else bar - 1
             prev_c_note = self._get_counterpoint_pitch(other_line, prev_bar, prev_beat)   
             if isinstance(prev_c_note, Pitch):
-                interval, c_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch), prev_c_note.get_tonal_interval(c_note)
+                interval, c_interval = self._node_context.previous_pitch.get_tonal_interval(pitch), prev_c_note.get_tonal_interval(c_note)
                 if (interval > 2 and c_interval > 2) or (interval < 2 and c_interval < 2):
                     if abs(interval) > 4 or abs(c_interval) > 4:
                         return False 
@@ -238,15 +285,17 @@ def prevents_large_leaps_in_same_direction(self: object, pitch: Pitch, line: int
 
 #used in all Two-part examples
 #a Note in one voice cannot immediately be followed by a Cross Relation of that Note in the other voice
+@reads_other_lines(bars_before=1)
+@reads_line_back(1)
 def prevents_diagonal_cross_relations(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2    
-    if (bar, beat) != (0, 0) and (bar, beat) in self._counterpoint_objects[other_line] and len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        c_note = self._counterpoint_objects[other_line][(bar, beat)]
+    other_line = self._node_context.other_line    
+    if (bar, beat) != (0, 0) and self._node_context.previous_pitch is not None:
+        c_note = self._node_context.simultaneous_c_note
         if c_note is not None:
             prev_beat = beat - 0.5 if beat > 0 else 3
             prev_bar = bar if beat > 0 else bar - 1
             prev_c_note = self._get_counterpoint_pitch(other_line, prev_bar, prev_beat)   
-            prev_note = self._counterpoint_stacks[line][-1]
+            prev_note = self._node_context.previous_pitch
             if prev_c_note is not None and prev_c_note.is_cross_relation(pitch):
                 return False 
             if isinstance(prev_note, Pitch) and prev_note.is_cross_relation(c_note):
@@ -255,23 +304,28 @@ def prevents_diagonal_cross_relations(self: object, pitch: Pitch, line: int, bar
 
 #used in all Two-part examples
 #the top voice of an Open Fifth cannot be approached by ascending Half Step
+@reads_other_lines(bars_before=1)
+@reads_line_back(1)
 def prevents_landini(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2     
-    if (bar, beat) in self._counterpoint_objects[other_line] and (bar, beat) != (0, 0):
-        c_note = self._counterpoint_objects[other_line][(bar, beat)]
+    other_line = self._node_context.other_line     
+    if (bar, beat) != (0, 0):
+        c_note = self._node_context.simultaneous_c_note
         if isinstance(c_note, Pitch) and abs(c_note.get_chromatic_interval(pitch)) % 12 == 7:
             if c_note.get_tonal_interval(pitch) < 0:
                 c_prev_note = self._get_counterpoint_pitch(other_line, bar if beat != 0 else bar - 1, beat - 0.5 if beat != 0 else 3)
                 if isinstance(c_prev_note, Pitch) and c_prev_note.get_chromatic_interval(c_note) == 1:
                     return False 
             else:
-                if isinstance(self._counterpoint_stacks[line][-1], Pitch) and self._counterpoint_stacks[line][-1].get_chromatic_interval(pitch) == 1:
+                if self._node_context.previous_pitch is not None and self._node_context.previous_pitch.get_chromatic_interval(pitch) == 1:
                     return False 
     return True 
 
 #used in all Two-part examples
+@fires_at(beats={ 1, 2 })
+@reads_other_lines()
+@reads_line_back(bars=0)
 def resolve_suspension(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2  
+    other_line = self._node_context.other_line  
     if beat in [1, 2] and (bar, 0) not in self._counterpoint_objects[line]:
         c_note, sus_note = self._get_counterpoint_pitch(other_line, bar, 0), self._get_counterpoint_pitch(line, bar, 0)
         if ( c_note is not None and c_note.get_tonal_interval(sus_note) in self._legal_intervals["resolvable_dissonance"] and 
@@ -280,13 +334,16 @@ def resolve_suspension(self: object, pitch: Pitch, line: int, bar: int, beat: fl
     return True
 
 #handles Passing Tones on middle beat of Measure
+@fires_at(beats={ 2 })
+@reads_other_lines()
+@reads_line_back(1)
 def handles_weak_half_note_dissonance_fifth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2 
+    other_line = self._node_context.other_line 
     if beat == 2:
-        c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+        c_note = self._node_context.sounding_c_notes[other_line]
         if c_note is not None:
             if not self._is_consonant(c_note, pitch):
-                prev = self._counterpoint_stacks[line][-1]
+                prev = self._node_context.previous_entity
                 if isinstance(prev, Pitch) and abs(prev.get_tonal_interval(pitch)) != 2:
                     return False 
                 if (bar, beat) in self._counterpoint_objects[other_line]:
@@ -294,21 +351,28 @@ def handles_weak_half_note_dissonance_fifth_species(self: object, pitch: Pitch,
     return True
 
 #must resolve by step in same direction as previous interval
+@fires_at(beats={ 0, 3 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(2)
 def resolves_weak_half_note_dissonance_fifth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2 
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if (beat == 3 and self._counterpoint_stacks[line][-1].get_duration() == 2) or (beat == 0 and self._counterpoint_stacks[line][-1].get_duration() == 4):
+    other_line = self._node_context.other_line 
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if (beat == 3 and context.previous_pitch.get_duration() == 2) or (beat == 0 and context.previous_pitch.get_duration() == 4):
             (prev_bar, prev_beat) = (bar - 1, 2) if beat == 0 else (bar, 2)
             c_note = self._get_counterpoint_pitch(other_line, prev_bar, prev_beat)
             if c_note is not None:
-                if not self._is_consonant(c_note, self._counterpoint_stacks[line][-1]):
-                    if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]):
+                if not self._is_consonant(c_note, context.previous_pitch):
+                    if context.previous_pitch.get_tonal_interval(pitch) != context.previous_interval:
                         return False 
     return True
 
 #ensures that all predetermined Suspensions are resolvable Dissonances
+@fires_at(beats={ 0, 1, 2 })
+@reads_other_lines(bars_before=1)
+@reads_line_back(bars=1)
 def resolves_predetermined_suspensions(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2 
+    other_line = self._node_context.other_line 
     if (beat == 1 or beat == 2) and bar in self._attempt_parameters[line]["suspension_bars"]:
         if self._counterpoint_objects[line][(bar - 1, 2)].get_tonal_interval(pitch) != -2:
             return False 
@@ -336,18 +400,21 @@ def resolves_predetermined_suspensions(self: object, pitch: Pitch, line: int, ba
                     return False
     return True
 
+@reads_other_lines()
+@reads_line_back()
 def prevents_cross_relation_on_simultaneous_onsets(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2 
-    if (bar, beat) in self._counterpoint_objects[other_line]:
-        c_note = self._counterpoint_objects[other_line][(bar, beat)]
-        if c_note is not None and isinstance(c_note, Pitch) and c_note.is_cross_relation(pitch):
-            return False 
+    c_note = self._node_context.simultaneous_c_note
+    if c_note is not None and isinstance(c_note, Pitch) and c_note.is_cross_relation(pitch):
+        return False 
     return True
 
+@fires_at(beats={ 0 })
+@reads_other_lines()
+@reads_line_back()
 def handle_downbeats_two_part_counterpoint(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    other_line = (line + 1) % 2 
+    other_line = self._node_context.other_line 
     if beat == 0:
-        c_note = self._get_counterpoint_pitch(other_line, bar, beat)
+        c_note = self._node_context.sounding_c_notes[other_line]
         if c_note is not None and isinstance(c_note, Pitch) and not self._is_consonant(c_note, pitch):
             if (bar, 0) in self._counterpoint_objects[other_line] or (bar, 2) not in self._counterpoint_objects[other_line]:
                 return False 
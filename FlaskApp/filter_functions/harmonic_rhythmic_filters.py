@@ -7,7 +7,13 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.beat_positions import fires_at
+from filter_functions.dependencies import reads_other_lines, reads_line_back
+
 #checks that Suspension Note is Consonant on onset and forms a Resolvable Dissonance on following Downbeat
+@fires_at(beats={ 2 })
+@reads_other_lines(bars_after=1)
+@reads_line_back()
 def form_suspension_fourth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat == 2 and (bar + 1, 0) in self._counterpoint_objects[other_line]:
@@ -24,6 +30,9 @@ def form_suspension_fourth_species(self: object, pitch: Pitch, line: int, bar: i
     return durations
 
 #also makes sure that the second Downbeat of a Breve is a Consonant
+@fires_at(beats={ 0, 2 })
+@reads_other_lines(bars_after=1)
+@reads_line_back()
 def prepares_suspensions_fifth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat % 2 == 0 and bar < self._length - 1:
@@ -40,6 +49,9 @@ def prepares_suspensions_fifth_species(self: object, pitch: Pitch, line: int, ba
     return durations
 
 #we must end on a cadence
+@fires_at(beats={ 0, 2 }, bars={ -3 })
+@reads_other_lines(bars_after=1)
+@reads_line_back()
 def handle_antipenultimate_bar_of_fifth_species_against_cantus_firmus(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if bar == self._length - 3:
@@ -57,6 +69,9 @@ def handle_antipenultimate_bar_of_fifth_species_against_cantus_firmus(self: obje
     return durations
 
 #used in Fifth Species
+@fires_at(beats={ 2 })
+@reads_other_lines()
+@reads_line_back(1)
 def only_quarter_or_half_on_weak_half_note_dissonance(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat == 2:
@@ -70,6 +85,9 @@ def only_quarter_or_half_on_weak_half_note_dissonance(self: object, pitch: Pitch
     return durations
 
 #used in Two-part polyphony 
+@fires_at(beats={ 0, 2 })
+@reads_other_lines(bars_after=1)
+@reads_line_back()
 def prevents_simultaneous_syncopation(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat == 0 and bar < self._length - 1 and (bar + 1, 0) not in self._counterpoint_objects[other_line]:
@@ -80,6 +98,9 @@ def prevents_simultaneous_syncopation(self: object, pitch: Pitch, line: int, bar
     return durations
 
 #ensure that the correct voices are forming Suspensions where specified in the Attempt Parameters
+@fires_at(beats={ 0, 2 })
+@reads_other_lines(bars_after=1)
+@reads_line_back()
 def handles_predetermined_suspensions(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat == 0 and bar + 1 in self._attempt_parameters[line]["suspension_bars"]:
@@ -96,6 +117,9 @@ def handles_predetermined_suspensions(self: object, pitch: Pitch, line: int, bar
         durations.discard(6)
     return durations
 
+@fires_at(beats={ 0 })
+@reads_other_lines(bars_after=2)
+@reads_line_back()
 def handles_weak_half_note_dissonance_in_other_line(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat == 0 and (bar, 2) in self._counterpoint_objects[other_line]:
@@ -150,6 +174,9 @@ def handles_weak_half_note_dissonance_in_other_line(self: object, pitch: Pitch,
 
 ############ helper functions ##############
 
+@fires_at(beats={ 0, 1, 2, 3 })
+@reads_other_lines(bars_after=2)
+@reads_line_back()
 def handles_weak_quarter_note_dissonance_in_other_line(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     other_line = (line + 1) % 2
     if beat % 1 == 0:
@@ -206,12 +233,7 @@ def is_dissonant(self: object, pitch: Pitch, index: tuple[int, int], line: int)
     c_note = self._get_counterpoint_pitch(line, index[0], index[1])
     if c_note is None: 
         return False 
-    (t_interval, c_interval) = c_note.get_intervals(pitch)
-    if ( abs(t_interval) % 7 not in self._legal_intervals["tonal_harmonic_consonant"] 
-        or abs(c_interval) % 12 not in self._legal_intervals["chromatic_harmonic_consonant"] 
-        or (abs(t_interval) % 7, abs(c_interval) % 12) in self._legal_intervals["forbidden_combinations"] ):
-        return True 
-    return False
+    return not self._interval_tables["harmonic_consonant"][c_note.get_pitch_id()][pitch.get_pitch_id()]
 
     
         
@@ -0,0 +1,78 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
+
+#score functions that can be broken down into the cost each note or rest adds as it is placed declare a function that
+#computes that cost with the decorator below, so that the generator can try the cheapest notes and rests first (see
+#use_score_guided_ordering).  Cost functions take the entity about to be placed at the end of the specified line and
+#return the amount it would add to the score (lower is better, as with the score functions)
+def incremental_cost(cost_function: callable) -> callable:
+    def declare_cost_function(score_function: callable) -> callable:
+        score_function.incremental_cost = cost_function
+        return score_function
+    return declare_cost_function
+
+#the last n entities of a line
+def _get_last_entities(self: object, line: int, n: int) -> list[RhythmicValue]:
+    return self._counterpoint_stacks[line][-n:] if len(self._counterpoint_stacks[line]) >= n else None
+
+#for prioritize_stepwise_motion: a step costs nothing, and any other interval costs about as much as it takes away from the
+#ratio of steps in a line of ten bars or so
+def stepwise_motion_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    if line == 0 and self._height > 2:
+        return 0
+    last_entities = _get_last_entities(self, line, 1)
+    if last_entities is None or not isinstance(last_entities[0], Pitch) or not isinstance(entity, Pitch):
+        return 0
+    return 0 if abs(last_entities[0].get_tonal_interval(entity)) == 2 else 3
+
+#for ascending_leaps_followed_by_descending_steps
+def leap_recovery_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    if line == 0 and self._height > 2:
+        return 0
+    last_entities = _get_last_entities(self, line, 2)
+    if last_entities is None or not all([isinstance(e, Pitch) for e in last_entities + [entity]]):
+        return 0
+    if last_entities[0].get_tonal_interval(last_entities[1]) > 2 and last_entities[1].get_tonal_interval(entity) != -2:
+        return 20
+    return 0
+
+#for penalize_frequent_change_of_direction
+def change_of_direction_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    last_entities = _get_last_entities(self, line, 2)
+    if last_entities is None or not isinstance(last_entities[1], Pitch) or not isinstance(entity, Pitch):
+        return 0
+    last_interval = last_entities[0].get_tonal_interval(last_entities[1]) if isinstance(last_entities[0], Pitch) else 0
+    interval = last_entities[1].get_tonal_interval(entity)
+    if (interval > 0 and last_interval < 0) or (interval < 0 and last_interval > 0):
+        return 10
+    return 0
+
+#for penalize_two_note_quarter_runs
+def two_note_quarter_run_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    last_entities = _get_last_entities(self, line, 3)
+    if last_entities is None or entity.get_duration() <= 2:
+        return 0
+    if ( isinstance(last_entities[0], Pitch) and last_entities[0].get_duration() > 2 and last_entities[1].get_duration() == 2
+        and last_entities[2].get_duration() == 2 ):
+        return 15
+    return 0
+
+#for penalize_perfect_intervals_on_downbeats.  The cost can only be known if the other line has already been written there
+def perfect_interval_on_downbeat_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    if beat != 0 or bar < 1 or bar >= self._length - 1 or not isinstance(entity, Pitch):
+        return 0
+    other_entity = self._counterpoint_objects[(line + 1) % 2].get((bar, 0))
+    if isinstance(other_entity, Pitch) and abs(other_entity.get_chromatic_interval(entity)) % 12 in [0, 7]:
+        return 12
+    return 0
+
+#for penalize_rests: every rest at the start of a line
+def leading_rest_cost(self: object, entity: RhythmicValue, line: int, bar: int, beat: float) -> int:
+    if isinstance(entity, Rest) and all([isinstance(e, Rest) for e in self._counterpoint_stacks[line]]):
+        return 10000
+    return 0
@@ -7,7 +7,10 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.dependencies import reads_line_back
 
+
+@reads_line_back()
 def ensure_lowest_and_highest_have_been_placed(self: object, line: int, bar: int, beat: float) -> bool:
     if not self._attempt_parameters[line]["lowest_has_been_placed"] and bar >= self._attempt_parameters[line]["lowest_must_appear_by"]:
         return False 
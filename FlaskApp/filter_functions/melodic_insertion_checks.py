@@ -7,37 +7,30 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
-############# added to CounterpointGenerator (base class) ################
+from filter_functions.beat_positions import fires_at
+from filter_functions.dependencies import reads_other_lines, reads_line_back
 
-#ensures that all adjacent notes move by melodically legal intervals
-def valid_melodic_interval(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        (t_interval, c_interval) = self._counterpoint_stacks[line][-1].get_intervals(pitch)
-        if t_interval not in self._legal_intervals["tonal_adjacent_melodic"]: return False 
-        if c_interval not in self._legal_intervals["chromatic_adjacent_melodic"]: return False
-        if (abs(t_interval) % 7, abs(c_interval) % 12) in self._legal_intervals["forbidden_combinations"]: return False
-        #in addition, leaps are not allowed between notes that are either sharp or leading tones
-        if abs(t_interval) > 2:
-            if ( (self._mode_resolver.is_sharp(self._counterpoint_stacks[line][-1]) or self._mode_resolver.is_leading_tone(self._counterpoint_stacks[line][-1])) 
-                and (self._mode_resolver.is_sharp(pitch) or self._mode_resolver.is_leading_tone(pitch)) ):
-                return False
-    return True 
+############# added to CounterpointGenerator (base class) ################
 
 #ensures that any melodic ascending leap of a minor sixth is followed by a descending half-step
+@reads_line_back(2)
 def ascending_minor_sixths_are_followed_by_descending_half_step(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if self._counterpoint_stacks[line][-2].get_chromatic_interval(self._counterpoint_stacks[line][-1]) == 8:
-            if self._counterpoint_stacks[line][-1].get_chromatic_interval(pitch) != -1:
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if context.second_previous_pitch.get_chromatic_interval(context.previous_pitch) == 8:
+            if context.previous_pitch.get_chromatic_interval(pitch) != -1:
                 return False
     return True 
 
 #ensures that the highest note appears only once 
+@reads_line_back()
 def prevent_highest_duplicates(self, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if self._attempt_parameters[line]["highest_has_been_placed"] and pitch.is_unison(self._attempt_parameters[line]["highest"]):
         return False 
     return True 
 
 #prevents the same two notes from being immediately repeated (regardless of rhythm).  e.g. D -> F -> D -> F
+@reads_line_back(3)
 def prevent_two_notes_from_immediately_repeating(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if len(self._counterpoint_stacks[line]) > 2 and isinstance(self._counterpoint_stacks[line][-3], Pitch):
         if ( self._counterpoint_stacks[line][-3].is_unison(self._counterpoint_stacks[line][-1]) and 
@@ -48,6 +41,7 @@ def prevent_two_notes_from_immediately_repeating(self: object, pitch: Pitch, lin
     return True 
 
 #same as above but with three notes
+@reads_line_back(5)
 def prevent_three_notes_from_immediately_repeating(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if len(self._counterpoint_stacks[line]) > 4 and isinstance(self._counterpoint_stacks[line][-5], Pitch):
         if ( self._counterpoint_stacks[line][-5].is_unison(self._counterpoint_stacks[line][-2]) and 
@@ -59,7 +53,13 @@ def prevent_three_notes_from_immediately_repeating(self: object, pitch: Pitch, l
 
 ################# added to subclasses that specify number of lines ####################
 
+#what the check below reads before the window (see reads_line_back in dependencies.py): the first entity of the line
+def get_first_entity(self: object, line: int, end: int) -> RhythmicValue:
+    return self._counterpoint_stacks[line][0] if end > 0 else None
+
 #in an unaccompanied melody, we must begin and end on the same note, which must be the mode final
+@fires_at(beats={ 0 }, bars={ 0, -1 })
+@reads_line_back(summary=get_first_entity)
 def begin_and_end_on_mode_final(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if (bar, beat) == (0, 0):
         return self._mode_resolver.is_final(pitch)
@@ -71,51 +71,83 @@ def begin_and_end_on_mode_final(self: object, pitch: Pitch, line: int, bar: int,
 
 #prevents highest note from occuring in the direct middle of a line with an odd number of measures
 #used in species 1 - 4
+@fires_at(beats={ 0 })
+@reads_line_back()
 def prevent_highest_note_from_being_in_middle(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if self._length % 2 == 1 and (bar, beat) == (self._length // 2, 0):
         if pitch.is_unison(self._attempt_parameters[line]["highest"]): 
             return False 
     return True 
 
+@reads_line_back(2)
 def prevent_cross_relations_on_notes_separated_by_one_other_note(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if self._counterpoint_stacks[line][-2].is_cross_relation(pitch): 
+    if self._node_context.second_previous_pitch is not None:
+        if self._node_context.second_previous_pitch.is_cross_relation(pitch): 
             return False 
     return True 
 
 #in ascending motion, successive "tonal intervals" must be the same or smaller.
 #in descending motion, succesive "tonal intervals" must be the same or larger 
+@reads_line_back(2)
 def enforce_interval_order_strict(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        prev_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        cur_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        prev_interval = context.previous_interval
+        cur_interval = context.previous_pitch.get_tonal_interval(pitch)
         if cur_interval > prev_interval and not (cur_interval > 0 and prev_interval < 0):
             return False 
     return True 
 
+#what the check below reads before the window: where the scan back for the beginning of an ascending or a descending segment
+#ends when it is continued from the edge of the window, and the pitches it collects there when it is continued while the
+#intervals are all leaps
+def summarize_outlines_before_window(self: object, line: int, end: int) -> tuple:
+    stack = self._counterpoint_stacks[line]
+    if end == 0 or end >= len(stack) or not isinstance(stack[end], Pitch):
+        return None
+    segment_start_pitches = []
+    for is_ascending in [True, False]:
+        segment_start_pitch, i = None, end - 1
+        while i >= 0 and isinstance(stack[i], Pitch):
+            prev_interval = stack[i].get_tonal_interval(stack[i + 1])
+            if ( (prev_interval < 0 and is_ascending) or (prev_interval > 0 and not is_ascending)
+                or i == 0 or not isinstance(stack[i - 1], Pitch)):
+                segment_start_pitch = stack[i + 1]
+                break
+            i -= 1
+        segment_start_pitches.append(segment_start_pitch)
+    pitches_to_check = []
+    i = end - 1
+    while i >= 0 and isinstance(stack[i], Pitch) and abs(stack[i].get_tonal_interval(stack[i + 1])) > 2:
+        pitches_to_check.append(stack[i])
+        i -= 1
+    return (tuple(segment_start_pitches), tuple(pitches_to_check))
+
 #a dissonance can be "outlined" in two ways: by two notes separated by intervals that are all either ascending or descending 
 #and that are followed / succeeded by intervals in the opposite direction (or are endpoints of the melody).
 #or between any two notes separated by intervals that are all leaps of a third or greater
+@reads_line_back(3, summary=summarize_outlines_before_window)
 def prevent_dissonances_from_being_outlined(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     #begin by checking whether or not the current note marks the end of a segment of ascending or 
     #descending motion -- either by moving in the contrary direction or by being the end of the piece
+    context = self._node_context
     segment_start_pitch, segment_end_pitch, i, is_ascending = None, None, None, None
     if bar == self._length - 1: 
-        prev_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        cur_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+        prev_interval = context.previous_interval
+        cur_interval = context.previous_pitch.get_tonal_interval(pitch)
         if (prev_interval > 0 and cur_interval > 0) or (prev_interval < 0 and cur_interval < 0):
             segment_end_pitch = pitch 
             is_ascending = cur_interval > 0
             i = len(self._counterpoint_stacks[line]) - 2
         else:
-            segment_end_pitch = self._counterpoint_stacks[line][-1]
+            segment_end_pitch = context.previous_pitch
             is_ascending = prev_interval > 0
             i = i = len(self._counterpoint_stacks[line]) - 3
-    elif len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        prev_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        cur_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+    elif context.second_previous_pitch is not None:
+        prev_interval = context.previous_interval
+        cur_interval = context.previous_pitch.get_tonal_interval(pitch)
         if (prev_interval > 0 and cur_interval < 0) or (prev_interval < 0 and cur_interval > 0):
-            segment_end_pitch = self._counterpoint_stacks[line][-1]
+            segment_end_pitch = context.previous_pitch
             is_ascending = prev_interval > 0
             i = i = len(self._counterpoint_stacks[line]) - 3
     if segment_end_pitch is not None:
@@ -131,7 +163,7 @@ def prevent_dissonances_from_being_outlined(self: object, pitch: Pitch, line: in
             (t_interval, c_interval) = segment_start_pitch.get_intervals(segment_end_pitch)
             if ( t_interval not in self._legal_intervals["tonal_outline_melodic"] or 
                 c_interval not in self._legal_intervals["chromatic_outline_melodic"] or 
-                (abs(t_interval) % 7, abs(c_interval) % 12) in self._legal_intervals["forbidden_combinations"] ):
+                self._interval_tables["forbidden_combinations"][segment_start_pitch.get_pitch_id()][segment_end_pitch.get_pitch_id()] ):
                 return False 
 
     #now determine how many pitches are connected to the current pitch by intervals that are all 
@@ -153,13 +185,23 @@ def prevent_dissonances_from_being_outlined(self: object, pitch: Pitch, line: in
             return False 
     return True 
 
+#what the check below reads before the window: the chains of three intervals that begin there
+def collect_interval_chains_before_window(self: object, line: int, end: int) -> frozenset:
+    stack = self._counterpoint_stacks[line]
+    interval_chains = set()
+    for i in range(min(end, len(stack) - 3)):
+        if all([isinstance(entity, Pitch) for entity in stack[i:i + 4]]):
+            interval_chains.add(tuple([stack[j].get_tonal_interval(stack[j + 1]) for j in range(i, i + 3)]))
+    return frozenset(interval_chains)
+
 #prevents any four note pattern from repeating (e.g. C -> E -> F -> D ... E -> G -> A -> F)
+@reads_line_back(5, summary=collect_interval_chains_before_window)
 def prevent_any_repetition_of_three_intervals(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if len(self._counterpoint_stacks[line]) > 2 and isinstance(self._counterpoint_stacks[line][-3], Pitch):
         interval_chain = [
             self._counterpoint_stacks[line][-3].get_tonal_interval(self._counterpoint_stacks[line][-2]),
-            self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]),
-            self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+            self._node_context.previous_interval,
+            self._node_context.previous_pitch.get_tonal_interval(pitch)
         ]
         for i in range(len(self._counterpoint_stacks[line]) - 5):
             if isinstance(self._counterpoint_stacks[line][i], Pitch):
@@ -173,9 +215,10 @@ def prevent_any_repetition_of_three_intervals(self: object, pitch: Pitch, line:
     return True 
 
 #prevents melody from sounding monotonous
+@reads_line_back(5)
 def pitch_cannot_appear_three_times_in_six_notes(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        pitches_to_check = [self._counterpoint_stacks[line][-1]]
+    if self._node_context.previous_pitch is not None:
+        pitches_to_check = [self._node_context.previous_pitch]
         i = len(self._counterpoint_stacks[line]) - 2
         #collect up to five of the most recent pitches
         while i >= max(len(self._counterpoint_stacks[line]) - 5, 0) and isinstance(self._counterpoint_stacks[line][i], Pitch):
@@ -190,12 +233,13 @@ def pitch_cannot_appear_three_times_in_six_notes(self: object, pitch: Pitch, lin
     return True
 
 #prevents  melody from sounding monotonous
+@reads_line_back(4)
 def melody_cannot_change_direction_three_times_in_a_row(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if len(self._counterpoint_stacks[line]) > 3 and isinstance(self._counterpoint_stacks[line][-4], Pitch):
         interval1 = self._counterpoint_stacks[line][-4].get_tonal_interval(self._counterpoint_stacks[line][-3])
         interval2 = self._counterpoint_stacks[line][-3].get_tonal_interval(self._counterpoint_stacks[line][-2])
-        interval3 = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        interval4 = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+        interval3 = self._node_context.previous_interval
+        interval4 = self._node_context.previous_pitch.get_tonal_interval(pitch)
         if interval1 > 0 and interval2 < 0 and interval3 > 0 and interval4 < 0:
             return False 
         if interval1 < 0 and interval2 > 0 and interval3 < 0 and interval4 > 0:
@@ -203,28 +247,75 @@ def melody_cannot_change_direction_three_times_in_a_row(self: object, pitch: Pit
     return True
 
 #in first species, a line must end either by step or in an ascending leap of a fourth or fifth
+@fires_at(bars={ -1 })
+@reads_line_back(1)
 def last_interval_of_first_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if bar != self._length - 1:
         return True 
-    if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) not in [-2, 2, 4, 5]:
+    if self._node_context.previous_pitch.get_tonal_interval(pitch) not in [-2, 2, 4, 5]:
         return False 
     return True
 
 #used in certain Cantus Firmus examples
+@fires_at(bars={ -1 })
+@reads_line_back(1)
 def last_interval_is_descending_step(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if not self._must_end_by_descending_step or bar != self._length - 1:
         return True 
-    if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != -2:
+    if self._node_context.previous_pitch.get_tonal_interval(pitch) != -2:
         return False 
     return True
 
+#what the check below reads before the window: whether each of its four scans back over the preceding segment fails when it
+#is continued from the edge of the window (the scans that follow steps for each value of segment_has_leap)
+def summarize_interval_order_before_window(self: object, line: int, end: int) -> tuple:
+    stack = self._counterpoint_stacks[line]
+    if end == 0 or end >= len(stack) or not isinstance(stack[end], Pitch):
+        return None
+    intervals = []
+    for i in range(end - 1, -1, -1):
+        if not isinstance(stack[i], Pitch): break
+        intervals.append((i, stack[i].get_tonal_interval(stack[i + 1])))
+    fails_after_ascending_leap = False
+    for (i, interval) in intervals:
+        if i <= 0 or interval < 0: break
+        if interval > 2:
+            fails_after_ascending_leap = True
+            break
+    fails_after_descending_leap = False
+    for (i, interval) in intervals:
+        if interval > 0: break
+        if interval < -2:
+            fails_after_descending_leap = True
+            break
+    fails_after_steps = []
+    for segment_has_leap in [False, True]:
+        fails_after_ascending_step, has_leap = False, segment_has_leap
+        for (i, interval) in intervals:
+            if interval < 0: break
+            if has_leap:
+                fails_after_ascending_step = True
+                break
+            has_leap = interval > 2
+        fails_after_descending_step, has_leap = False, segment_has_leap
+        for (i, interval) in intervals:
+            if interval > 0: break
+            if has_leap or interval == -8:
+                fails_after_descending_step = True
+                break
+            has_leap = interval < -2
+        fails_after_steps.append((fails_after_ascending_step, fails_after_descending_step))
+    return (fails_after_ascending_leap, fails_after_descending_leap, tuple(fails_after_steps))
+
 #interval order is handles more loosely in the Fifth Species, but the rules are accordingly more complex, as detailed in the logic below
+@reads_line_back(2, summary=summarize_interval_order_before_window)
 def handles_interval_order_loosest(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        potential_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        potential_interval = context.previous_pitch.get_tonal_interval(pitch)
         if potential_interval >= 3:
-            if self._counterpoint_stacks[line][-1].get_duration() == 2:
-                if self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) > 0:
+            if context.previous_pitch.get_duration() == 2:
+                if context.previous_interval > 0:
                     return False
             for i in range(len(self._counterpoint_stacks[line]) - 2, -1, -1):
                 if i <= 0 or not isinstance(self._counterpoint_stacks[line][i], Pitch): break
@@ -257,13 +348,15 @@ def handles_interval_order_loosest(self: object, pitch: Pitch, line: int, bar: i
 
 #handles nearby augmented and diminished intervals in cases not covered by outline dissonances   
 #the specific scenarios are outlined in the logic below 
+@reads_line_back(2)
 def handles_other_nearby_augs_and_dims(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if self._counterpoint_stacks[line][-2].is_cross_relation(pitch): 
+    second_previous_pitch = self._node_context.second_previous_pitch
+    if second_previous_pitch is not None:
+        if second_previous_pitch.is_cross_relation(pitch): 
             return False 
-        if self._counterpoint_stacks[line][-2].get_duration() != 2: 
+        if second_previous_pitch.get_duration() != 2: 
             return True 
-        (t_interval, c_interval) = self._counterpoint_stacks[line][-2].get_intervals(pitch)
+        (t_interval, c_interval) = second_previous_pitch.get_intervals(pitch)
         if (abs(t_interval) != 2 or abs(c_interval) != 3) and (abs(t_interval) != 3 or abs(c_interval) != 2):
             return True 
         else:
@@ -271,6 +364,8 @@ def handles_other_nearby_augs_and_dims(self: object, pitch: Pitch, line: int, ba
     return True 
     
 #makes sure that all sharp notes are resolved upwards by the first onset of the following measure at the latest
+@fires_at(beats={ 0, 2 })
+@reads_line_back(bars=1)
 def sharp_notes_resolve_upwards(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if beat == 0 or (beat == 2 and (bar, 0) not in self._counterpoint_objects[line]):
         indices_to_check = [(bar - 1, 0), (bar - 1, 1), (bar - 1, 2), (bar - 1, 3)]
@@ -289,52 +384,63 @@ def sharp_notes_resolve_upwards(self: object, pitch: Pitch, line: int, bar: int,
     return True 
 
 #in the Third and Fifth Species, ascending leaps cannot occur from accented to unaccented Quarter Note Beats
+@fires_at(beats={ 1, 3 })
+@reads_line_back(1)
 def prevents_ascending_leaps_to_weak_quarters(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if beat % 2 == 1 and len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) > 2:
+    if beat % 2 == 1 and self._node_context.previous_pitch is not None:
+        if self._node_context.previous_pitch.get_tonal_interval(pitch) > 2:
             return False 
     return True 
 
 #a descending Quarter Note leap should be followed either by a step up of by a leap up to a note within a step of the first pitch
+@reads_line_back(2)
 def handles_descending_quarter_leaps(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if ( self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) < -2 and 
-            self._counterpoint_stacks[line][-1].get_duration() == 2 and 
-            self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != 2 and 
-            abs(self._counterpoint_stacks[line][-2].get_tonal_interval(pitch)) > 2 ):
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if ( context.previous_interval < -2 and 
+            context.previous_pitch.get_duration() == 2 and 
+            context.previous_pitch.get_tonal_interval(pitch) != 2 and 
+            abs(context.second_previous_pitch.get_tonal_interval(pitch)) > 2 ):
             return False 
     return True 
 
 #repetition is only allowed after an Anticipation on beat "1"
+@reads_line_back(2)
 def handles_anticipation(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if self._counterpoint_stacks[line][-1].is_unison(pitch):
-            if ( beat != 2 or self._counterpoint_stacks[line][-1].get_duration() != 2 or 
-                self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) != -2 ):
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if context.previous_pitch.is_unison(pitch):
+            if ( beat != 2 or context.previous_pitch.get_duration() != 2 or 
+                context.previous_interval != -2 ):
                 return False 
     return True 
 
 #an Anticipation must resolve downwards by step
+@reads_line_back(2)
 def handles_resolution_of_anticipation(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if ( self._counterpoint_stacks[line][-2].is_unison(self._counterpoint_stacks[line][-1]) and 
-            self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != -2 ):
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if ( context.second_previous_pitch.is_unison(context.previous_pitch) and 
+            context.previous_pitch.get_tonal_interval(pitch) != -2 ):
             return False 
     return True
 
 #in the Fifth Species, we specify the number of melodic octaves permissible in a given line
+@reads_line_back(1)
 def enforce_max_melodic_octaves(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        if ( abs(self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)) == 8 and 
+    if self._node_context.previous_pitch is not None:
+        if ( abs(self._node_context.previous_pitch.get_tonal_interval(pitch)) == 8 and 
             self._attempt_parameters[line]["melodic_octaves_placed"] == self._attempt_parameters[line]["max_melodic_octaves"] ):
             return False 
     return True
 
 #places further restrictions on quarters between two leaps
+@reads_line_back(2)
 def handles_quarter_between_two_leaps(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch) and self._counterpoint_stacks[line][-1].get_duration() == 2:
-        prev_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        cur_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+    context = self._node_context
+    if context.second_previous_pitch is not None and context.previous_pitch.get_duration() == 2:
+        prev_interval = context.previous_interval
+        cur_interval = context.previous_pitch.get_tonal_interval(pitch)
         if prev_interval > 2 and cur_interval < -2:
             return False 
         if prev_interval == -8 and cur_interval == 8:
@@ -342,10 +448,12 @@ def handles_quarter_between_two_leaps(self: object, pitch: Pitch, line: int, bar
     return True
 
 #octaves should be preceded and followed by contrary motion
+@reads_line_back(2)
 def octaves_surrounded_by_contrary_motion(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        prev_interval = self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1])
-        cur_interval = self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        prev_interval = context.previous_interval
+        cur_interval = context.previous_pitch.get_tonal_interval(pitch)
         if prev_interval == 8 and cur_interval > 0: 
             return False
         if prev_interval == -8 and cur_interval < 0:
@@ -357,41 +465,51 @@ def octaves_surrounded_by_contrary_motion(self: object, pitch: Pitch, line: int,
     return True
 
 #ensures Eighth Notes are followed by stepwise motion
+@reads_line_back(1)
 def eighths_move_stepwise(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        if self._counterpoint_stacks[line][-1].get_duration() == 1 and abs(self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)) != 2:
+    previous_pitch = self._node_context.previous_pitch
+    if previous_pitch is not None:
+        if previous_pitch.get_duration() == 1 and abs(previous_pitch.get_tonal_interval(pitch)) != 2:
             return False 
     return True
 
 #further Eighth Notes restriction
+@fires_at(beats={ 0, 3.5 })
+@reads_line_back(1)
 def eighths_leading_to_downbeat_must_be_lower_neighbor(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        if beat == 0 and self._counterpoint_stacks[line][-1].get_duration() == 1 and self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != 2:
+    previous_pitch = self._node_context.previous_pitch
+    if previous_pitch is not None:
+        if beat == 0 and previous_pitch.get_duration() == 1 and previous_pitch.get_tonal_interval(pitch) != 2:
             return False 
-        elif beat == 3.5 and self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != -2:
+        elif beat == 3.5 and previous_pitch.get_tonal_interval(pitch) != -2:
             return False
     return True
 
 #further Eighth Notes restriction
+@reads_line_back(4)
 def eighths_in_same_direction_must_be_followed_by_motion_in_opposite_direction(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
+    context = self._node_context
     if len(self._counterpoint_stacks[line]) > 3 and isinstance(self._counterpoint_stacks[line][-4], Pitch):
         if self._counterpoint_stacks[line][-3].get_duration() == 1 and self._counterpoint_stacks[line][-2].get_duration() == 1:
             if ( self._counterpoint_stacks[line][-4].get_tonal_interval(self._counterpoint_stacks[line][-3]) == self._counterpoint_stacks[line][-3].get_tonal_interval(self._counterpoint_stacks[line][-2]) 
-                and self._counterpoint_stacks[line][-4].get_tonal_interval(self._counterpoint_stacks[line][-3]) == self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) ):
-                if ( (self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) > 0 and self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) > 0) or 
-                    (self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) < 0 and self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) < 0) ):
+                and self._counterpoint_stacks[line][-4].get_tonal_interval(self._counterpoint_stacks[line][-3]) == context.previous_interval ):
+                if ( (context.previous_interval > 0 and context.previous_pitch.get_tonal_interval(pitch) > 0) or 
+                    (context.previous_interval < 0 and context.previous_pitch.get_tonal_interval(pitch) < 0) ):
                     return False 
     return True 
 
 
 #for almost all case scenarios for highest voice
+@fires_at(bars={ -1 })
+@reads_line_back(1)
 def end_stepwise(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if bar == self._length - 1 and abs(self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)) != 2:
+    if bar == self._length - 1 and abs(self._node_context.previous_pitch.get_tonal_interval(pitch)) != 2:
         return False 
     return True 
 
 #does not include anticipations.  C -> D -> C -> B -> C is illegal but D -> C -> C -> B -> C is legal
 #for use in Fifth Species
+@reads_line_back(4)
 def prevent_note_from_repeating_three_times_in_five_notes(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if bar != self._length - 1:
         if len(self._counterpoint_stacks[line]) > 3 and isinstance(self._counterpoint_stacks[line][-4], Pitch):
@@ -400,15 +518,19 @@ def prevent_note_from_repeating_three_times_in_five_notes(self: object, pitch: P
     return True
 
 #prevents figures of the form F# -> E -> G
+@reads_line_back(2)
 def prevents_fifteenth_century_sharp_resolution(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
-        if ( self._mode_resolver.is_sharp(self._counterpoint_stacks[line][-2]) and 
-            self._counterpoint_stacks[line][-2].get_chromatic_interval(pitch) == 1 and 
-            self._counterpoint_stacks[line][-2].get_tonal_interval(self._counterpoint_stacks[line][-1]) == -2 ):
+    context = self._node_context
+    if context.second_previous_pitch is not None:
+        if ( self._mode_resolver.is_sharp(context.second_previous_pitch) and 
+            context.second_previous_pitch.get_chromatic_interval(pitch) == 1 and 
+            context.previous_interval == -2 ):
             return False 
     return True
 
 #in the Second Species, we need to check notes on successive downbeats
+@fires_at(beats={ 0 })
+@reads_line_back(bars=3)
 def prevents_repetition_second_species(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if beat == 0:
         if (bar - 1, 0) in self._counterpoint_objects[line] and isinstance(self._counterpoint_objects[line][(bar - 1, 0)], Pitch):
@@ -421,11 +543,13 @@ def prevents_repetition_second_species(self: object, pitch: Pitch, line: int, ba
     return True 
 
 #in Two-part polyphony, we want to end on a cadence
+@reads_other_lines(bars={ 0 })
+@reads_line_back(1)
 def begin_and_end_two_part_counterpoint(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     other_line = (line + 1) % 2
     if bar == self._length - 1:
         return self._mode_resolver.is_final(pitch)
-    if len(self._counterpoint_stacks[line]) == 0 or not isinstance(self._counterpoint_stacks[line][-1], Pitch):
+    if self._node_context.previous_pitch is None:
         c_note = self._counterpoint_objects[other_line][(0, 0)]
         if c_note is not None and isinstance(c_note, Pitch):
             return self._mode_resolver.is_final(pitch) or self._mode_resolver.is_final(self._mode_resolver.get_default_pitch_from_interval(pitch, 4))
@@ -434,6 +558,8 @@ def begin_and_end_two_part_counterpoint(self: object, pitch: Pitch, line: int, b
     return True
 
 #in Two-part polyphony, we want to end on a cadence (and this must be through contrary motion)
+@fires_at(beats={ 0 }, bars={ -2, -1 })
+@reads_line_back(1)
 def penultimate_bar_two_part_counterpoint(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if (bar, beat) == (self._length - 2, 0):
         if ( self._mode_resolver.is_final(self._mode_resolver.get_default_pitch_from_interval(pitch, -2)) 
@@ -441,15 +567,35 @@ def penultimate_bar_two_part_counterpoint(self: object, pitch: Pitch, line: int,
             self._mode != Mode.PHRYGIAN) ):
             return True
         return False 
-    if (bar, beat) == (self._length - 1, 0) and self._counterpoint_stacks[line][-1].get_duration() == 8:
-        if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) > 0:
+    if (bar, beat) == (self._length - 1, 0) and self._node_context.previous_entity.get_duration() == 8:
+        if self._node_context.previous_entity.get_tonal_interval(pitch) > 0:
             return False 
     return True
 
+#what the check below reads before the window: for each pitch, the number of times (up to two) that the scan back from the
+#edge of the window meets it before it meets a Rest or a higher note
+def count_appearances_before_window(self: object, line: int, end: int) -> frozenset:
+    stack = self._counterpoint_stacks[line]
+    appearances = {}
+    for pitch_to_check in stack[:end]:
+        if not isinstance(pitch_to_check, Pitch) or pitch_to_check.get_pitch_id() in appearances:
+            continue
+        num_unisons = 0
+        for i in range(end - 1, -1, -1):
+            if not isinstance(stack[i], Pitch) or pitch_to_check.get_tonal_interval(stack[i]) > 0:
+                break
+            if stack[i].is_unison(pitch_to_check):
+                num_unisons += 1
+                if num_unisons == 2:
+                    break
+        appearances[pitch_to_check.get_pitch_id()] = num_unisons
+    return frozenset([item for item in appearances.items() if item[1] > 0])
+
 #prevents melody from sounding "stuck"
+@reads_line_back(1, summary=count_appearances_before_window)
 def goes_up_after_third_appearance_of_note(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
-    if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
-        pitch_to_check = self._counterpoint_stacks[line][-1]
+    pitch_to_check = self._node_context.previous_pitch
+    if pitch_to_check is not None:
         if pitch_to_check.get_tonal_interval(pitch) < 0:
             num_unisons = 0
             for i in range(len(self._counterpoint_stacks[line]) - 2, -1, -1):
@@ -464,6 +610,8 @@ def goes_up_after_third_appearance_of_note(self: object, pitch: Pitch, line: int
     return True
 
 #for use in Imitative Themes
+@fires_at(beats={ 0 }, bars={ 0 })
+@reads_line_back()
 def start_with_outline_pitch(self: object, pitch: Pitch, line: int, bar: int, beat: float) -> bool:
     if (bar, beat) == (0, 0):
         if ( pitch.get_scale_degree() != self._attempt_parameters[line]["first_outline_pitch"]
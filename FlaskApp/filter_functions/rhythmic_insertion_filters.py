@@ -7,21 +7,28 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.beat_positions import fires_at
+from filter_functions.dependencies import reads_line_back
+
 
 #in an unaccompanied melody (as with two-part counterpoint), there are no circumstances under which we 
 #don't end on a breve 
+@fires_at(beats={ 0 }, bars={ -1 })
+@reads_line_back()
 def end_on_breve(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if (bar, beat) == (self._length - 1, 0):
         return { 16 }
     return durations
 
 #in the Fifth Species, we decide the max number of eighth notes that can be added
+@reads_line_back()
 def enforce_max_pairs_of_eighths(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if self._attempt_parameters[line]["pairs_of_eighths_placed"] == self._attempt_parameters[line]["max_pairs_of_eighths"]:
         durations.discard(1)
     return durations
 
 #in a Quarter Note Upper Neighbor (speaking purely melodically), two out of the three notes must be quarters
+@reads_line_back(2)
 def upper_neighbor_cannot_occur_between_two_longer_notes(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if ( len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch) and 
         self._counterpoint_stacks[line][-2].get_duration() != 2 and self._counterpoint_stacks[line][-1].get_duration() == 2
@@ -31,6 +38,8 @@ def upper_neighbor_cannot_occur_between_two_longer_notes(self: object, pitch: Pi
     return durations
 
 #prevents long notes for extending over final measure
+@fires_at(beats={ 0, 2 }, bars={ -2 })
+@reads_line_back()
 def handles_penultimate_bar(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if (bar, beat) == (self._length - 2, 0):
         durations.discard(16)
@@ -41,6 +50,7 @@ def handles_penultimate_bar(self: object, pitch: Pitch, line: int, bar: int, bea
     return durations
 
 #ensures Eighth Notes move by step
+@reads_line_back(1)
 def handles_first_eighth(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
         if abs(self._counterpoint_stacks[line][-1].get_tonal_interval(pitch)) != 2:
@@ -48,6 +58,8 @@ def handles_first_eighth(self: object, pitch: Pitch, line: int, bar: int, beat:
     return durations
 
 #further restriction on Eighth Note figures
+@fires_at(beats={ 2 })
+@reads_line_back(3)
 def eighths_on_beat_one_preceded_by_quarter_or_in_same_direction_are_followed_by_quarter(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 2 and isinstance(self._counterpoint_stacks[line][-3], Pitch):
         if beat == 2:
@@ -59,6 +71,8 @@ def eighths_on_beat_one_preceded_by_quarter_or_in_same_direction_are_followed_by
     return durations
 
 #enforces the rule that Eighth Notes on beat "3" must be Lower Neighbors
+@fires_at(beats={ 3 })
+@reads_line_back(1)
 def eighths_on_beat_three_must_be_a_step_down_from_previous_note(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
         if beat == 3 and self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) != -2:
@@ -67,6 +81,7 @@ def eighths_on_beat_three_must_be_a_step_down_from_previous_note(self: object, p
 
 
 #Anticipations must be followed by a Quarter Note, Half Note or Dotted Half Note
+@reads_line_back(1)
 def handles_second_note_of_anticipation(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
         if self._counterpoint_stacks[line][-1].is_unison(pitch):
@@ -76,15 +91,30 @@ def handles_second_note_of_anticipation(self: object, pitch: Pitch, line: int, b
     return durations
 
 #handles case in which second note of Anticipation is Quarter Note
+@reads_line_back(2)
 def anticipation_followed_by_quarter_must_be_followed_by_eighths(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 1 and isinstance(self._counterpoint_stacks[line][-2], Pitch):
         if self._counterpoint_stacks[line][-2].is_unison(self._counterpoint_stacks[line][-1]) and self._counterpoint_stacks[line][-1].get_duration() == 2:
             return { 1 } if 1 in durations else set()
     return durations
 
+#what the filter below reads before the window (see reads_line_back in dependencies.py): whether the scan back over the
+#Quarter Note run meets a leap when it is continued from the edge of the window
+def find_leap_in_quarter_run_before_window(self: object, line: int, end: int) -> bool:
+    stack = self._counterpoint_stacks[line]
+    if end == 0 or end >= len(stack) or not isinstance(stack[end], Pitch):
+        return None
+    for i in range(end - 1, -1, -1):
+        if not isinstance(stack[i], Pitch) or stack[i].get_duration() != 2:
+            return False
+        if abs(stack[i].get_tonal_interval(stack[i + 1])) > 2:
+            return True
+    return False
+
 #Quarter Note runs (including Eighths) cannot have more than one leap.
 #Quarter Note runs ending on beat "2" cannot be followed by a Half Note if the Half Note is approached
 #by ascending motion or if the length of the run is only two Quarter Notes
+@reads_line_back(3, summary=find_leap_in_quarter_run_before_window)
 def regulates_quarter_runs(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if ( len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch) and 
         self._counterpoint_stacks[line][-1].get_duration() == 2 ):
@@ -104,6 +134,7 @@ def regulates_quarter_runs(self: object, pitch: Pitch, line: int, bar: int, beat
     return durations
 
 #in Fifth Species, sharp notes cannot be longer than a Whole Note
+@reads_line_back()
 def handles_sharp_durations(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if self._mode_resolver.is_sharp(pitch):
         durations.discard(16)
@@ -111,6 +142,7 @@ def handles_sharp_durations(self: object, pitch: Pitch, line: int, bar: int, bea
     return durations
 
 #a Quarter Note followed by a descending leap should not be followed by a note longer than a Half Note
+@reads_line_back(1)
 def handles_rhythm_after_descending_quarter_leap(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
         if self._counterpoint_stacks[line][-1].get_tonal_interval(pitch) < -2 and self._counterpoint_stacks[line][-1].get_duration() == 2:
@@ -122,6 +154,7 @@ def handles_rhythm_after_descending_quarter_leap(self: object, pitch: Pitch, lin
 
 #Breves and Quarters may not follow each other and Dotted Whole Notes may not follow Quarters
 #In addition, Quarter Notes may not follow Whole Notes on downbeats
+@reads_line_back(1)
 def handles_slow_fast_juxtoposition(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if len(self._counterpoint_stacks[line]) > 0 and isinstance(self._counterpoint_stacks[line][-1], Pitch):
         if self._counterpoint_stacks[line][-1].get_duration() == 2:
@@ -134,6 +167,8 @@ def handles_slow_fast_juxtoposition(self: object, pitch: Pitch, line: int, bar:
     return durations 
 
 #if the melody doesn't begin with a Rest, it may not begin with a Quarter or Half Note (Dotted Half Notes are acceptable however)
+@fires_at(beats={ 0 }, bars={ 0 })
+@reads_line_back()
 def handles_beginning_of_fifth_species(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if (bar, beat) == (0, 0):
         durations.discard(4)
@@ -141,6 +176,8 @@ def handles_beginning_of_fifth_species(self: object, pitch: Pitch, line: int, ba
     return durations
 
 #Dotted Half Notes on consecutive Downbeats aren't permissible, nor are Whole Notes on the Downbeat following a Dotted Half Note
+@fires_at(beats={ 0 })
+@reads_line_back(bars=1)
 def handles_downbeat_after_dotted_half_note(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if beat == 0 and (bar - 1, 0) in self._counterpoint_objects[line]:
         if isinstance(self._counterpoint_objects[line][(bar - 1, 0)], Pitch) and self._counterpoint_objects[line][(bar - 1, 0)].get_duration() == 6:
@@ -149,6 +186,8 @@ def handles_downbeat_after_dotted_half_note(self: object, pitch: Pitch, line: in
     return durations
 
 #a melody in Fifth Species must end with a Whole Note or Half Note
+@fires_at(beats={ 0, 2 }, bars={ -2 })
+@reads_line_back()
 def handles_rhythm_of_penultimate_measure(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if bar == self._length - 2:
         if beat == 0:
@@ -158,6 +197,8 @@ def handles_rhythm_of_penultimate_measure(self: object, pitch: Pitch, line: int,
     return durations
 
 #makes melody less monotonous
+@fires_at(beats={ 0 })
+@reads_line_back(bars=3)
 def prevents_lack_of_syncopation(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if beat == 0 and all([(bar - i, 0) in self._counterpoint_objects[line] and isinstance(self._counterpoint_objects[line][(bar - i, 0)], Pitch) for i in range(1, 4)]):
         if all([self._counterpoint_objects[line][(bar - i, 0)].get_duration() >= 4 for i in range(1, 4)]):
@@ -167,6 +208,8 @@ def prevents_lack_of_syncopation(self: object, pitch: Pitch, line: int, bar: int
     return durations
 
 #the same syncopated pitch should not occur two measures in a row
+@fires_at(beats={ 2 })
+@reads_line_back(bars=1)
 def prevents_repeated_syncopated_pitches(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if ( beat == 2 and (bar, 0) not in self._counterpoint_objects[line] and (bar - 1, 2) in self._counterpoint_objects[line] and 
         self._counterpoint_objects[line][(bar - 1, 2)].is_unison(pitch) ):
@@ -175,6 +218,8 @@ def prevents_repeated_syncopated_pitches(self: object, pitch: Pitch, line: int,
     return durations
 
 #prevent more than the max number of downbeat long notes from being placed (not including the final measure)
+@fires_at(beats={ 0 })
+@reads_line_back()
 def enforce_max_long_notes_on_downbeats(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if ( bar != self._length - 1 and beat == 0 and 
         self._attempt_parameters[line]["downbeat_long_notes_placed"] == self._attempt_parameters[line]["max_downbeat_long_notes"] ):
@@ -184,6 +229,8 @@ def enforce_max_long_notes_on_downbeats(self: object, pitch: Pitch, line: int, b
     return durations
 
 #only in multi-part examples: prevents penultimate notes that are same Scale Degree as Leading Tone but not Leading Tone
+@fires_at(beats={ 0, 2 }, bars={ -2 })
+@reads_line_back()
 def pentultimate_note_is_leading_tone(self: object, pitch: Pitch, line: int, bar: int, beat: float, durations: set[int]) -> set[int]:
     if bar == self._length - 2:
         if pitch.get_scale_degree() == self._mode_resolver.get_mode_leading_tone() and not self._mode_resolver.is_leading_tone(pitch):
@@ -0,0 +1,51 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, current_dir)
+
+from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
+
+#every score function declares a lower bound on the score it will give a solution, computed from a partially written piece,
+#with the decorator below, so that the generator can prune branches that can't lead to a better solution than the best
+#found so far (see use_branch_and_bound).  The bound must never be higher than the score of any solution the partial piece
+#can be completed to.  Score functions that never decrease as entities are added can be their own bounds, which is
+#the default
+def lower_bound(bound_function: callable = None) -> callable:
+    def declare_bound_function(score_function: callable) -> callable:
+        score_function.lower_bound = bound_function or score_function
+        return score_function
+    return declare_bound_function
+
+#for score functions that never return less than zero
+def zero_lower_bound(self: object) -> int:
+    return 0
+
+#for prioritize_long_quarter_note_runs: a line of eighth notes from beginning to end would have the longest possible run
+def long_quarter_note_runs_lower_bound(self: object) -> int:
+    return -20 * (self._length * 8 - 4) * self._height
+
+#for penalize_rests: the rests already at the start of each line
+def leading_rests_lower_bound(self: object) -> int:
+    score_add_on = 0
+    for line in range(self._height):
+        for entity in self._counterpoint_stacks[line]:
+            if not isinstance(entity, Rest):
+                break
+            score_add_on += 10000
+    return score_add_on
+
+#for find_as_many_suspensions_as_possible: the bars that have already been written in both lines
+def suspensions_lower_bound(self: object) -> int:
+    score_add_on = 0
+    c_line = self._cantus_firmus_index
+    counterpoint_line = (c_line + 1) % 2
+    written_bars = [sum([entity.get_duration() for entity in self._counterpoint_stacks[line]]) / 8 for line in range(self._height)]
+    for bar in range(1, self._length - 1):
+        if bar >= written_bars[c_line] or bar >= written_bars[counterpoint_line]:
+            break
+        c_note = self._counterpoint_objects[c_line][(bar, 0)]
+        counterpoint_note = self._get_counterpoint_pitch(counterpoint_line, bar, 0)
+        if counterpoint_note is not None and c_note.get_tonal_interval(counterpoint_note) not in self._legal_intervals["resolvable_dissonance"]:
+            score_add_on += 1000
+    return score_add_on
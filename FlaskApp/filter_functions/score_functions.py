@@ -9,18 +9,24 @@ sys.path.insert(0, current_dir)
 from notation_system.notational_entities import Pitch, RhythmicValue, Rest, Note, Mode, Accidental, VocalRange
 from notation_system.mode_resolver import ModeResolver
 
+from filter_functions.incremental_costs import incremental_cost, stepwise_motion_cost, leap_recovery_cost, change_of_direction_cost
+from filter_functions.incremental_costs import two_note_quarter_run_cost, perfect_interval_on_downbeat_cost, leading_rest_cost
+from filter_functions.score_bounds import lower_bound, zero_lower_bound, long_quarter_note_runs_lower_bound, leading_rests_lower_bound
+from filter_functions.score_bounds import suspensions_lower_bound
+from filter_functions.batch_score_functions import scored_from_packed_solution
+
 #an ideal melody will have ~71% of its intervals as steps
 #note that we don't score the lowest voice in a three or more part example
-def prioritize_stepwise_motion(self: object) -> int:
+@incremental_cost(stepwise_motion_cost)
+@lower_bound(zero_lower_bound)
+@scored_from_packed_solution
+def prioritize_stepwise_motion(self: object, packed_solution: list[dict]) -> int:
     IDEAL_STEP_RATIO = .712
     score_add_on = 0
-    for line in range(0 if self._height <= 2 else 1, self._height):
-        num_steps, num_intervals = 0, 0
-        for i in range(len(self._counterpoint_stacks[line]) - 1):
-            if isinstance(self._counterpoint_stacks[line][i], Pitch):
-                num_intervals += 1
-                if abs(self._counterpoint_stacks[line][i].get_tonal_interval(self._counterpoint_stacks[line][i + 1])) == 2:
-                    num_steps += 1
+    for packed_line in packed_solution[0 if self._height <= 2 else 1:]:
+        is_pitch, intervals = packed_line["is_pitch"], packed_line["intervals"]
+        num_intervals = sum(is_pitch[:-1])
+        num_steps = sum([1 for i, interval in enumerate(intervals) if is_pitch[i] and abs(interval) == 2])
         #add a point for every percentage point below the ideal our ratio is
         if num_steps / num_intervals < IDEAL_STEP_RATIO:
             score_add_on += math.floor((IDEAL_STEP_RATIO - (num_steps / num_intervals)) * 100)
@@ -30,18 +36,20 @@ def prioritize_stepwise_motion(self: object) -> int:
     return score_add_on
 
 #we want is many ascending leaps as possible to be followed by a descending step
-def ascending_leaps_followed_by_descending_steps(self: object) -> int:
+@incremental_cost(leap_recovery_cost)
+@lower_bound()
+@scored_from_packed_solution
+def ascending_leaps_followed_by_descending_steps(self: object, packed_solution: list[dict]) -> int:
     score_add_on = 0
-    for line in range(0 if self._height <= 2 else 1, self._height):
-         for i, entity in enumerate(self._counterpoint_stacks[line]):
-            if isinstance(entity, Pitch) and i < len(self._counterpoint_stacks[line]) - 2:
-                first_interval = self._counterpoint_stacks[line][i].get_tonal_interval(self._counterpoint_stacks[line][i + 1])
-                second_interval = self._counterpoint_stacks[line][i + 1].get_tonal_interval(self._counterpoint_stacks[line][i + 2])
-                if first_interval > 2 and second_interval != -2:
-                    score_add_on += 20
+    for packed_line in packed_solution[0 if self._height <= 2 else 1:]:
+        is_pitch, intervals = packed_line["is_pitch"], packed_line["intervals"]
+        for i in range(len(intervals) - 1):
+            if is_pitch[i] and intervals[i] > 2 and intervals[i + 1] != -2:
+                score_add_on += 20
     return score_add_on 
 
 #favorably scores Fifth Species examples with long Quarter Note runs
+@lower_bound(long_quarter_note_runs_lower_bound)
 def prioritize_long_quarter_note_runs(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -62,6 +70,8 @@ def prioritize_long_quarter_note_runs(self: object) -> int:
     return score_add_on
 
 #favorably scores Fifth Species examples without Quarter Note runs of length 2
+@incremental_cost(two_note_quarter_run_cost)
+@lower_bound()
 def penalize_two_note_quarter_runs(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -73,6 +83,7 @@ def penalize_two_note_quarter_runs(self: object) -> int:
     return score_add_on
 
 #a good Fifth Species example should have the right number of syncopated Whole Notes and Dotted Half Notes           
+@lower_bound(zero_lower_bound)
 def select_ideal_ties(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -101,17 +112,21 @@ def select_ideal_ties(self: object) -> int:
     return score_add_on
 
 #for use in all Two Part examples
-def penalize_perfect_intervals_on_downbeats(self: object) -> int:   
+@incremental_cost(perfect_interval_on_downbeat_cost)
+@lower_bound()
+@scored_from_packed_solution
+def penalize_perfect_intervals_on_downbeats(self: object, packed_solution: list[dict]) -> int:   
     num_perfect_intervals = 0
+    lower_downbeats, upper_downbeats = packed_solution[0]["downbeats"], packed_solution[1]["downbeats"]
     for bar in range(1, self._length - 1): #note that we don't include the first and last bars   
-        if ( (bar, 0) in self._counterpoint_objects[0] and (bar, 0) in self._counterpoint_objects[1] 
-            and isinstance(self._counterpoint_objects[0][(bar, 0)], Pitch) and isinstance(self._counterpoint_objects[1][(bar, 0)], Pitch) ):
-            c_interval = self._counterpoint_objects[0][(bar, 0)].get_chromatic_interval(self._counterpoint_objects[1][(bar, 0)])
-            if abs(c_interval) % 12 in [0, 7]:
+        lower_entity, upper_entity = lower_downbeats.get(bar), upper_downbeats.get(bar)
+        if isinstance(lower_entity, Pitch) and isinstance(upper_entity, Pitch):
+            if abs(lower_entity.get_chromatic_interval(upper_entity)) % 12 in [0, 7]:
                 num_perfect_intervals += 1
     return 12 * (num_perfect_intervals - 1)
 
 #for use in Second and Third Species
+@lower_bound()
 def find_longest_sequence_of_steps(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -130,16 +145,20 @@ def find_longest_sequence_of_steps(self: object) -> int:
     return score_add_on
 
 #broadens melodic gestures
-def penalize_frequent_change_of_direction(self: object) -> int:
+@incremental_cost(change_of_direction_cost)
+@lower_bound()
+@scored_from_packed_solution
+def penalize_frequent_change_of_direction(self: object, packed_solution: list[dict]) -> int:
     score_add_on = 0
-    for line in range(self._height):
-        intervals = [self._counterpoint_stacks[line][i].get_tonal_interval(self._counterpoint_stacks[line][i + 1]) if isinstance(self._counterpoint_stacks[line][i], Pitch) else 0 for i in range(len(self._counterpoint_stacks[line]) - 1)]
+    for packed_line in packed_solution:
+        intervals = packed_line["intervals"]
         for i in range(1, len(intervals)):
             if (intervals[i] > 0 and intervals[i - 1] < 0) or (intervals[i] < 0 and intervals[i - 1] > 0):
                 score_add_on += 10
     return score_add_on
 
 #for use in Third Species
+@lower_bound(zero_lower_bound)
 def penalize_whole_note_in_penultimate_bar(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -151,6 +170,7 @@ def penalize_whole_note_in_penultimate_bar(self: object) -> int:
 
 #for use in Two-part Fourth Species
 #this is the most important criteria in the Fourth Species so the score is weighted heavily
+@lower_bound(suspensions_lower_bound)
 def find_as_many_suspensions_as_possible(self: object) -> int:
     score_add_on = 0
     c_line = self._cantus_firmus_index
@@ -163,6 +183,8 @@ def find_as_many_suspensions_as_possible(self: object) -> int:
     return score_add_on
 
 #the most important criteria in evaluating an imitative opening is to find the maximum overlap between the Theme in each voice
+@incremental_cost(leading_rest_cost)
+@lower_bound(leading_rests_lower_bound)
 def penalize_rests(self: object) -> int:
     score_add_on = 0
     for line in range(self._height):
@@ -0,0 +1,107 @@
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.notational_entities import Mode, Accidental, Pitch, NUMBER_OF_PITCH_IDS, LOWEST_OCTAVE, HIGHEST_OCTAVE, INTERVALS
+from notation_system.mode_resolver import ModeResolver
+
+
+#tables indexed by pairs of pitch IDs that answer the questions the filter functions ask most often
+#(is this interval forbidden?  is it consonant?) with a single lookup.  Since they depend on the mode and
+#on the generator's legal intervals, they are cached here by those values and shared between generators
+_interval_tables_cache = {}
+
+#returns the interval tables for the given mode and legal intervals.  The keys are:
+#"forbidden_combinations": True where the interval (reduced to within an octave) is in the forbidden combinations
+#"harmonic_consonant": True where the interval is a legal harmonic consonance (only if the legal intervals include harmonic consonances)
+#"consonant": as above, but also False where both pitches are sharps or leading tones
+def get_interval_tables(mode: Mode, legal_intervals: dict) -> dict[str, list[list[bool]]]:
+    forbidden_combinations = frozenset(legal_intervals["forbidden_combinations"])
+    tonal_harmonic_consonant = frozenset(legal_intervals.get("tonal_harmonic_consonant", set()))
+    chromatic_harmonic_consonant = frozenset(legal_intervals.get("chromatic_harmonic_consonant", set()))
+    key = (mode, forbidden_combinations, tonal_harmonic_consonant, chromatic_harmonic_consonant)
+    if key not in _interval_tables_cache:
+        _interval_tables_cache[key] = _build_interval_tables(mode, forbidden_combinations, tonal_harmonic_consonant, chromatic_harmonic_consonant)
+    return _interval_tables_cache[key]
+
+def _build_interval_tables(mode: Mode, forbidden_combinations: frozenset, tonal_harmonic_consonant: frozenset,
+    chromatic_harmonic_consonant: frozenset) -> dict[str, list[list[bool]]]:
+    mode_resolver = ModeResolver(mode)
+    sharp_or_leading_tone = [False] * NUMBER_OF_PITCH_IDS
+    for octave in range(LOWEST_OCTAVE, HIGHEST_OCTAVE + 1):
+        for scale_degree in range(1, 8):
+            for accidental in Accidental:
+                pitch = Pitch(scale_degree, octave, accidental)
+                sharp_or_leading_tone[pitch.get_pitch_id()] = mode_resolver.is_sharp(pitch) or mode_resolver.is_leading_tone(pitch)
+
+    forbidden = [[False] * NUMBER_OF_PITCH_IDS for pitch_id in range(NUMBER_OF_PITCH_IDS)]
+    harmonic_consonant = [[False] * NUMBER_OF_PITCH_IDS for pitch_id in range(NUMBER_OF_PITCH_IDS)]
+    consonant = [[False] * NUMBER_OF_PITCH_IDS for pitch_id in range(NUMBER_OF_PITCH_IDS)]
+    for first_id in range(NUMBER_OF_PITCH_IDS):
+        for second_id in range(NUMBER_OF_PITCH_IDS):
+            (t_interval, c_interval) = INTERVALS[first_id][second_id]
+            reduced = (abs(t_interval) % 7, abs(c_interval) % 12)
+            forbidden[first_id][second_id] = reduced in forbidden_combinations
+            harmonic_consonant[first_id][second_id] = ( reduced[0] in tonal_harmonic_consonant
+                and reduced[1] in chromatic_harmonic_consonant and reduced not in forbidden_combinations )
+            consonant[first_id][second_id] = ( harmonic_consonant[first_id][second_id]
+                and not (sharp_or_leading_tone[first_id] and sharp_or_leading_tone[second_id]) )
+    return {
+        "forbidden_combinations": forbidden,
+        "harmonic_consonant": harmonic_consonant,
+        "consonant": consonant
+    }
+
+
+#for each pitch, the list of available pitches that may follow it by a legal adjacent melodic interval: the tonal
+#and chromatic intervals must both be legal, the interval must not be a forbidden combination, and leaps are not
+#allowed between two notes that are each either sharp or a leading tone.  Successors are kept in the order of
+#the available pitches, and the list for each pitch is computed the first time it is requested
+class MelodicSuccessorGraph:
+
+    _available_pitches = None
+    _tonal_adjacent_melodic = None
+    _chromatic_adjacent_melodic = None
+    _forbidden_combinations = None
+    _mode_resolver = None
+
+    #maps pitch IDs onto lists of successors
+    _successors = None
+
+    def __init__(self, mode: Mode, available_pitches: list[Pitch], legal_intervals: dict):
+        self._available_pitches = available_pitches[:]
+        self._tonal_adjacent_melodic = frozenset(legal_intervals["tonal_adjacent_melodic"])
+        self._chromatic_adjacent_melodic = frozenset(legal_intervals["chromatic_adjacent_melodic"])
+        self._forbidden_combinations = frozenset(legal_intervals["forbidden_combinations"])
+        self._mode_resolver = ModeResolver(mode)
+        self._successors = {}
+
+    def get_successors(self, pitch: Pitch) -> list[Pitch]:
+        pitch_id = pitch.get_pitch_id()
+        if pitch_id not in self._successors:
+            self._successors[pitch_id] = [next_pitch for next_pitch in self._available_pitches if self._is_legal_move(pitch, next_pitch)]
+        return self._successors[pitch_id]
+
+    def _is_legal_move(self, pitch: Pitch, next_pitch: Pitch) -> bool:
+        (t_interval, c_interval) = INTERVALS[pitch.get_pitch_id()][next_pitch.get_pitch_id()]
+        if t_interval not in self._tonal_adjacent_melodic: return False 
+        if c_interval not in self._chromatic_adjacent_melodic: return False 
+        if (abs(t_interval) % 7, abs(c_interval) % 12) in self._forbidden_combinations: return False 
+        if abs(t_interval) > 2:
+            if ( (self._mode_resolver.is_sharp(pitch) or self._mode_resolver.is_leading_tone(pitch)) 
+                and (self._mode_resolver.is_sharp(next_pitch) or self._mode_resolver.is_leading_tone(next_pitch)) ):
+                return False 
+        return True 
+
+_melodic_successor_graph_cache = {}
+
+#returns the successor graph for the given mode, available pitches and legal intervals, shared between all 
+#generators (and attempts) that use the same ones
+def get_melodic_successor_graph(mode: Mode, available_pitches: list[Pitch], legal_intervals: dict) -> MelodicSuccessorGraph:
+    key = ( mode, tuple([pitch.get_pitch_id() for pitch in available_pitches]), 
+        frozenset(legal_intervals["tonal_adjacent_melodic"]), frozenset(legal_intervals["chromatic_adjacent_melodic"]),
+        frozenset(legal_intervals["forbidden_combinations"]) )
+    if key not in _melodic_successor_graph_cache:
+        _melodic_successor_graph_cache[key] = MelodicSuccessorGraph(mode, available_pitches, legal_intervals)
+    return _melodic_successor_graph_cache[key]
@@ -30,20 +30,89 @@ class Hexachord (Enum):
 class NotationalEntity:
     pass
 
-class Pitch:
+#every combination of Scale Degree, Octave and Accidental is mapped onto a small integer "pitch ID", so that 
+#intervals between two pitches can be looked up in tables indexed by pairs of pitch IDs rather than recomputed
+LOWEST_OCTAVE = 0
+HIGHEST_OCTAVE = 9
+NUMBER_OF_PITCH_IDS = (HIGHEST_OCTAVE - LOWEST_OCTAVE + 1) * 7 * 3
+
+_SCALE_DEGREE_PITCH_VALUES = [0, 2, 4, 5, 7, 9, 11]
+_ACCIDENTAL_ADJUSTMENTS = { Accidental.FLAT: -1, Accidental.NATURAL: 0, Accidental.SHARP: 1 }
+
+def get_pitch_id(scale_degree: int, octave: int, accidental: Accidental) -> int:
+    return ((octave - LOWEST_OCTAVE) * 7 + scale_degree - 1) * 3 + accidental.value - 1
+
+#the following tables are indexed by pitch ID (or by pairs of pitch IDs) and are computed once, when the module is loaded 
+PITCH_VALUES = [0] * NUMBER_OF_PITCH_IDS
+_DIATONIC_POSITIONS = [0] * NUMBER_OF_PITCH_IDS
+for _octave in range(LOWEST_OCTAVE, HIGHEST_OCTAVE + 1):
+    for _scale_degree in range(1, 8):
+        for _accidental in Accidental:
+            _pitch_id = get_pitch_id(_scale_degree, _octave, _accidental)
+            PITCH_VALUES[_pitch_id] = _octave * 12 + _SCALE_DEGREE_PITCH_VALUES[_scale_degree - 1] + _ACCIDENTAL_ADJUSTMENTS[_accidental]
+            _DIATONIC_POSITIONS[_pitch_id] = _octave * 7 + _scale_degree - 1
+
+#TONAL_INTERVALS[a][b] is the tonal interval from pitch ID a to pitch ID b (see Pitch.get_tonal_interval), 
+#CHROMATIC_INTERVALS[a][b] the chromatic interval, and INTERVALS[a][b] both as a tuple
+TONAL_INTERVALS = [[0] * NUMBER_OF_PITCH_IDS for _pitch_id in range(NUMBER_OF_PITCH_IDS)]
+CHROMATIC_INTERVALS = [[0] * NUMBER_OF_PITCH_IDS for _pitch_id in range(NUMBER_OF_PITCH_IDS)]
+INTERVALS = [[None] * NUMBER_OF_PITCH_IDS for _pitch_id in range(NUMBER_OF_PITCH_IDS)]
+for _first_id in range(NUMBER_OF_PITCH_IDS):
+    for _second_id in range(NUMBER_OF_PITCH_IDS):
+        _diff = _DIATONIC_POSITIONS[_second_id] - _DIATONIC_POSITIONS[_first_id]
+        TONAL_INTERVALS[_first_id][_second_id] = _diff + 1 if _diff >= 0 else _diff - 1
+        CHROMATIC_INTERVALS[_first_id][_second_id] = PITCH_VALUES[_second_id] - PITCH_VALUES[_first_id]
+        INTERVALS[_first_id][_second_id] = (TONAL_INTERVALS[_first_id][_second_id], CHROMATIC_INTERVALS[_first_id][_second_id])
+
+#Pitches, Rests and Notes are immutable and interned: constructing one returns the shared instance with the same 
+#values from the class's cache, so the generators can create them freely and solutions share the same objects
+class ImmutableEntity:
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise Exception("notational entities are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise Exception("notational entities are immutable")
+
+    #interned instances are their own copies, and are unpickled by constructing (and so looking up) them again
+    def __copy__(self) -> "ImmutableEntity": return self 
+
+    def __deepcopy__(self, memo: dict) -> "ImmutableEntity": return self 
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, self._get_constructor_arguments())
+
+class Pitch(ImmutableEntity):
 
     #Scale Degrees 1 - 7 are the notes of a C Major scale
     #Octave is standard Octave Number from Scientific Pitch Notation
-    _scale_degree = None
-    _octave = None
-    _accidental = None
+    #the Pitch ID is the index of the pitch in the interval tables above
+    __slots__ = ("_scale_degree", "_octave", "_accidental", "_pitch_id")
 
-    def __init__(self, scale_degree: int, octave: int, accidental: Accidental = Accidental.NATURAL):
+    _instances = {}
+
+    def __new__(cls, scale_degree: int, octave: int, accidental: Accidental = Accidental.NATURAL) -> "Pitch":
+        key = (scale_degree, octave, accidental)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            instance._set_pitch(scale_degree, octave, accidental)
+            cls._instances[key] = instance
+        return instance
+
+    def _set_pitch(self, scale_degree: int, octave: int, accidental: Accidental) -> None:
         if scale_degree < 1 or scale_degree > 7:
             raise Exception("invalid scale degree")
-        self._scale_degree = scale_degree
-        self._octave = octave 
-        self._accidental = accidental
+        if octave < LOWEST_OCTAVE or octave > HIGHEST_OCTAVE:
+            raise Exception("invalid octave")
+        object.__setattr__(self, "_scale_degree", scale_degree)
+        object.__setattr__(self, "_octave", octave)
+        object.__setattr__(self, "_accidental", accidental)
+        object.__setattr__(self, "_pitch_id", get_pitch_id(scale_degree, octave, accidental))
+
+    def _get_constructor_arguments(self) -> tuple:
+        return (self._scale_degree, self._octave, self._accidental)
 
     def __str__(self) -> str:
         name = ""
@@ -66,59 +135,44 @@ class Pitch:
 
     def get_accidental(self) -> Accidental: return self._accidental
 
+    def get_pitch_id(self) -> int: return self._pitch_id
+
     #returns chromatic pitch value (C Naturals are multiples of twelve) used by standard MIDI applications
     def get_pitch_value(self) -> int:
-        pitch_value = self._octave * 12
-
-        if self._scale_degree == 1: pitch_value += 0
-        elif self._scale_degree == 2: pitch_value += 2
-        elif self._scale_degree == 3: pitch_value += 4
-        elif self._scale_degree == 4: pitch_value += 5
-        elif self._scale_degree == 5: pitch_value += 7
-        elif self._scale_degree == 6: pitch_value += 9
-        elif self._scale_degree == 7: pitch_value += 11
-
-        if self._accidental == Accidental.FLAT: pitch_value -= 1
-        elif self._accidental == Accidental.SHARP: pitch_value += 1
-
-        return pitch_value
+        return PITCH_VALUES[self._pitch_id]
 
     #returns standard interval number.  Two notes separated by a Diminished Third, Minor Third, Major Third and 
     #Augmented Third will all return += 3.  Unison returns 1
     def get_tonal_interval(self, other_pitch: "Pitch") -> int:
-        octv_difference = (other_pitch.get_octave() - self._octave) * 7
-        sdg_difference = other_pitch.get_scale_degree() - self._scale_degree
-        diff = octv_difference + sdg_difference
-        return diff + 1 if diff >= 0 else diff - 1
+        return TONAL_INTERVALS[self._pitch_id][other_pitch._pitch_id]
 
     #returns number of Chromatic Notes (Half Steps) by which two notes are removed.  
     #Unison returns 0 and Octaves return 12 or negative 12
     def get_chromatic_interval(self, other_pitch: "Pitch") -> int:
-        return other_pitch.get_pitch_value() - self.get_pitch_value() 
+        return CHROMATIC_INTERVALS[self._pitch_id][other_pitch._pitch_id]
 
     #returns both of the above as a tuple
     def get_intervals(self, other_pitch: "Pitch") -> tuple[int, int]:
-        return (self.get_tonal_interval(other_pitch), self.get_chromatic_interval(other_pitch))
+        return INTERVALS[self._pitch_id][other_pitch._pitch_id]
 
     #determines if two pitches are unison (the same pitch and spelled the same -- enharmonic equivalents return False)
     def is_unison(self, other_pitch: "Pitch") -> bool:
-        return ( other_pitch.get_octave() == self._octave and 
-            other_pitch.get_scale_degree() == self._scale_degree and 
-            other_pitch.get_accidental() == self._accidental )
+        return other_pitch._pitch_id == self._pitch_id
 
     #determines if two pitches (not necessarily in the same octave) are cross relations (e.g. B Natural and B Flat)
     def is_cross_relation(self, other_pitch: "Pitch") -> bool:
         return other_pitch.get_scale_degree() == self._scale_degree and other_pitch.get_accidental() != self._accidental
 
-class RhythmicValue:
+class RhythmicValue(ImmutableEntity):
 
-    #durations are in number of Eighth Notes (NOT number of Beats)
-    _duration = None
+    #durations are in number of Eighth Notes (NOT number of Beats).  The duration slot is declared by the 
+    #subclasses, since Note also inherits the slots of Pitch
+    __slots__ = ()
 
-    def __init__(self, duration: int):
+    def _set_duration(self, duration: int) -> None:
         if duration < 0: 
             raise Exception("cannot have negative value")
-        self._duration = duration 
+        object.__setattr__(self, "_duration", duration)
 
     def get_duration(self) -> int: return self._duration 
 
@@ -136,19 +190,41 @@ class RhythmicValue:
         return name.ljust(18)
 
 class Rest(RhythmicValue):
+    __slots__ = ("_duration",)
+
+    _instances = {}
+
+    def __new__(cls, duration: int) -> "Rest":
+        instance = cls._instances.get(duration)
+        if instance is None:
+            instance = object.__new__(cls)
+            instance._set_duration(duration)
+            cls._instances[duration] = instance
+        return instance
 
-    def __init__(self, duration: int):
-        super().__init__(duration)
+    def _get_constructor_arguments(self) -> tuple:
+        return (self._duration,)
 
     def __str__(self):
         return "REST".ljust(15) + super().__str__()
 
 class Note(RhythmicValue, Pitch):
+    __slots__ = ("_duration",)
 
-    def __init__(self, duration: int, scale_degree: int, octave: int, accidental: Accidental = Accidental.NATURAL):
-        RhythmicValue.__init__(self, duration)
-        Pitch.__init__(self, scale_degree, octave, accidental)
+    _instances = {}
+
+    def __new__(cls, duration: int, scale_degree: int, octave: int, accidental: Accidental = Accidental.NATURAL) -> "Note":
+        key = (duration, scale_degree, octave, accidental)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            instance._set_duration(duration)
+            instance._set_pitch(scale_degree, octave, accidental)
+            cls._instances[key] = instance
+        return instance
+
+    def _get_constructor_arguments(self) -> tuple:
+        return (self._duration, self._scale_degree, self._octave, self._accidental)
 
     def __str__(self) -> str:
         return Pitch.__str__(self) + RhythmicValue.__str__(self)
-
@@ -0,0 +1,107 @@
+import sys
+from array import array
+from typing import BinaryIO, Iterator
+
+import os,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.notational_entities import Accidental, Pitch, Note, Rest, RhythmicValue, LOWEST_OCTAVE
+
+
+#a compact encoding of solutions (lists of lines, each a list of Notes and Rests), used to ship solutions between
+#processes and to store them in bulk.  Each Note or Rest is encoded as a single small integer, with the duration in the
+#lowest five bits and the pitch ID plus one in the bits above them (zero for Rests), so every entity fits in two bytes
+DURATION_BITS = 5
+MAX_DURATION = (1 << DURATION_BITS) - 1
+
+#entities are interned, so decoding looks each code up here once it has been seen
+_entities_by_code = {}
+
+#returns the code of a Note or Rest
+def encode_entity(entity: RhythmicValue) -> int:
+    if entity.get_duration() > MAX_DURATION:
+        raise Exception("cannot encode a duration longer than " + str(MAX_DURATION))
+    pitch_part = entity.get_pitch_id() + 1 if isinstance(entity, Pitch) else 0
+    return pitch_part << DURATION_BITS | entity.get_duration()
+
+#returns the Note or Rest with the given code
+def decode_entity(code: int) -> RhythmicValue:
+    entity = _entities_by_code.get(code)
+    if entity is None:
+        duration, pitch_part = code & MAX_DURATION, code >> DURATION_BITS
+        if pitch_part == 0:
+            entity = Rest(duration)
+        else:
+            pitch_id = pitch_part - 1
+            entity = Note(duration, pitch_id // 3 % 7 + 1, pitch_id // 21 + LOWEST_OCTAVE, Accidental(pitch_id % 3 + 1))
+        _entities_by_code[code] = entity
+    return entity
+
+#converts a solution to lists of codes, one per line, which can be written as JSON (e.g. one solution per line of a
+#JSON Lines file)
+def encode_solution(solution: list[list[RhythmicValue]]) -> list[list[int]]:
+    return [[encode_entity(entity) for entity in line] for line in solution]
+
+def decode_solution(encoded_solution: list[list[int]]) -> list[list[RhythmicValue]]:
+    return [[decode_entity(code) for code in line] for line in encoded_solution]
+
+#the binary form of a solution is a sequence of little-endian unsigned 16-bit integers: the number of lines, the number of
+#entities in each line and then the codes of the entities, line by line.  Since the header gives the length of the rest,
+#binary solutions can be concatenated into a stream and read back one by one
+def dumps(solution: list[list[RhythmicValue]]) -> bytes:
+    values = array("H", [len(solution)] + [len(line) for line in solution])
+    for line in solution:
+        values.extend([encode_entity(entity) for entity in line])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+#returns the solution encoded in the given bytes, which must hold exactly one solution.  Raises a ValueError if they don't
+def loads(data: bytes) -> list[list[RhythmicValue]]:
+    if len(data) < 2 or len(data) % 2 != 0:
+        raise ValueError("a solution must be encoded in an even number of bytes, and at least 2, not " + str(len(data)))
+    values = _read_values(data)
+    if len(values) < 1 + values[0] or len(values) != 1 + values[0] + sum(values[1:1 + values[0]]):
+        raise ValueError("the encoded solution doesn't match the line lengths in its header")
+    solution, position = [], 1 + values[0]
+    for line_length in values[1:position]:
+        solution.append([decode_entity(code) for code in values[position:position + line_length]])
+        position += line_length
+    return solution
+
+#writes a stream of solutions to a binary file
+def dump_solutions(solutions: list[list[list[RhythmicValue]]], file: BinaryIO) -> None:
+    for solution in solutions:
+        file.write(dumps(solution))
+
+#reads back, one at a time, the solutions written to a binary file by dump_solutions.  Stops cleanly at the end of the file,
+#and raises an EOFError if the file ends part of the way through a solution (e.g. if it was being written when the
+#process writing it crashed), after the complete solutions before it have been read
+def load_solutions(file: BinaryIO) -> Iterator[list[list[RhythmicValue]]]:
+    while True:
+        header = file.read(2)
+        if len(header) == 0:
+            return
+        _check_read(header, 2, "the number of lines")
+        number_of_lines = _read_values(header)[0]
+        line_lengths = _check_read(file.read(2 * number_of_lines), 2 * number_of_lines, "the line lengths")
+        number_of_entities = sum(_read_values(line_lengths))
+        entities = _check_read(file.read(2 * number_of_entities), 2 * number_of_entities, "the entities")
+        yield loads(header + line_lengths + entities)
+
+#returns data read from a stream of solutions if it has the expected length, and otherwise raises an EOFError describing 
+#what was being read
+def _check_read(data: bytes, expected_length: int, description: str) -> bytes:
+    if len(data) != expected_length:
+        raise EOFError("solution stream ended while reading " + description + ": expected " + str(expected_length) 
+            + " bytes, got " + str(len(data)))
+    return data
+
+def _read_values(data: bytes) -> array:
+    values = array("H")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
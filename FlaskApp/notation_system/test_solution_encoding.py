@@ -0,0 +1,70 @@
+import io
+import pytest
+
+import os,sys,inspect
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from notation_system.notational_entities import Accidental, Note, Rest, LOWEST_OCTAVE, HIGHEST_OCTAVE
+from notation_system.solution_encoding import MAX_DURATION, encode_entity, decode_entity, encode_solution, decode_solution
+from notation_system.solution_encoding import dumps, loads, dump_solutions, load_solutions
+
+SOLUTION = [
+    [Rest(8), Note(8, 2, 4), Note(4, 7, 4, Accidental.FLAT), Note(4, 1, 5), Note(16, 2, 5)],
+    [Note(8, 2, 5), Note(2, 4, 5, Accidental.SHARP), Rest(2), Note(4, 5, 5), Note(16, 6, 5)]
+]
+
+OTHER_SOLUTION = [[Note(8, 1, 4), Note(8, 2, 4)], [Note(16, 5, 4)]]
+
+#decoding returns the interned entities, so solutions can be compared by identity
+def test_entities_round_trip():
+    for entity in [Rest(1), Rest(MAX_DURATION), Note(1, 1, LOWEST_OCTAVE, Accidental.FLAT), 
+        Note(MAX_DURATION, 7, HIGHEST_OCTAVE, Accidental.SHARP)]:
+        assert decode_entity(encode_entity(entity)) is entity
+
+def test_codes_fit_in_sixteen_bits():
+    assert encode_entity(Note(MAX_DURATION, 7, HIGHEST_OCTAVE, Accidental.SHARP)) < 1 << 16
+
+def test_durations_that_do_not_fit_are_rejected():
+    with pytest.raises(Exception):
+        encode_entity(Rest(MAX_DURATION + 1))
+
+def test_solution_round_trips_as_codes():
+    assert decode_solution(encode_solution(SOLUTION)) == SOLUTION
+
+def test_solution_round_trips_as_bytes():
+    data = dumps(SOLUTION)
+    assert len(data) == 2 * (1 + len(SOLUTION) + sum([len(line) for line in SOLUTION]))
+    assert loads(data) == SOLUTION
+
+def test_lines_too_long_for_the_header_are_rejected():
+    with pytest.raises(OverflowError):
+        dumps([[Rest(1)] * (1 << 16)])
+
+def test_malformed_bytes_are_rejected():
+    data = dumps(SOLUTION)
+    with pytest.raises(ValueError):
+        loads(data[:-1])
+    with pytest.raises(ValueError):
+        loads(data[:-2])
+    with pytest.raises(ValueError):
+        loads(data + data)
+
+def test_solutions_round_trip_as_a_stream():
+    file = io.BytesIO()
+    dump_solutions([SOLUTION, OTHER_SOLUTION, SOLUTION], file)
+    file.seek(0)
+    assert list(load_solutions(file)) == [SOLUTION, OTHER_SOLUTION, SOLUTION]
+
+def test_empty_stream_has_no_solutions():
+    assert list(load_solutions(io.BytesIO())) == []
+
+#the complete solutions before a truncated one are still read
+def test_truncated_stream_raises_eof_error():
+    data = dumps(OTHER_SOLUTION) + dumps(SOLUTION)
+    for length in [len(dumps(OTHER_SOLUTION)) + 1, len(dumps(OTHER_SOLUTION)) + 4, len(data) - 1]:
+        solutions = load_solutions(io.BytesIO(data[:length]))
+        assert next(solutions) == OTHER_SOLUTION
+        with pytest.raises(EOFError):
+            next(solutions)